@@ -0,0 +1,128 @@
+"""Benchmark of the construction of capacity limitation events.
+
+Compares the construction time per 1,000 intervals of the validated construction path (every
+interval, interval period and payload validated by pydantic, as the BL did before) with the
+trusted construction path of the BL (intervals built without validation, the event validated once).
+
+Run from the root of the repository, with the configuration of the BL set in the environment:
+
+    python -m scripts.benchmark_event_construction --intervals 1000 --repeat 20
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+from openadr3_client.models.common.interval import Interval
+from openadr3_client.models.common.interval_period import IntervalPeriod
+from openadr3_client.models.event.event import NewEvent
+from openadr3_client.models.event.event_payload import EventPayload, EventPayloadType
+
+from src.application.generate_events import (
+    _capacity_limit,
+    _generate_capacity_limitation_event,
+    build_capacity_limitation_intervals,
+)
+from src.config import MAX_CAPACITY
+from src.models.predicted_load import PredictedGridAssetLoad
+
+
+def _mock_load(interval_id: int) -> float:
+    # Alternate between loads below and above the maximum capacity, so both capacity limits are constructed.
+    return MAX_CAPACITY * (0.5 if interval_id % 2 == 0 else 1.5)
+
+
+def _validated_intervals(
+    interval_count: int, start: datetime, duration: timedelta
+) -> tuple[Interval[EventPayload], ...]:
+    return tuple(
+        Interval(
+            id=interval_id,
+            interval_period=IntervalPeriod(
+                start=start + interval_id * duration, duration=duration
+            ),
+            payloads=(
+                EventPayload(
+                    type=EventPayloadType.IMPORT_CAPACITY_LIMIT,
+                    values=(_capacity_limit(_mock_load(interval_id), MAX_CAPACITY),),
+                ),
+            ),
+        )
+        for interval_id in range(interval_count)
+    )
+
+
+def _trusted_intervals(
+    interval_count: int, start: datetime, duration: timedelta
+) -> tuple[Interval[EventPayload], ...]:
+    interval_ids = range(interval_count)
+    return build_capacity_limitation_intervals(
+        interval_ids=interval_ids,
+        starts=[start + i * duration for i in interval_ids],
+        durations=[duration] * interval_count,
+        limits=[_capacity_limit(_mock_load(i), MAX_CAPACITY) for i in interval_ids],
+    )
+
+
+def _validated_event(
+    interval_count: int, start: datetime, duration: timedelta
+) -> NewEvent:
+    event = _generate_capacity_limitation_event(
+        [PredictedGridAssetLoad(time=start, load=0.0)], MAX_CAPACITY
+    )
+    return NewEvent(
+        programID=event.program_id,
+        event_name=event.event_name,
+        payload_descriptors=event.payload_descriptors,
+        intervals=_validated_intervals(interval_count, start, duration),
+        targets=event.targets,
+    )
+
+
+def _best_of(repeat: int, construct: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        construct()
+        timings.append(time.perf_counter() - started_at)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--intervals", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    start = datetime(2025, 1, 1, 12, tzinfo=UTC)
+    duration = timedelta(minutes=5)
+    # The event construction expands the 15 minute loads into 5 minute intervals.
+    loads = [
+        PredictedGridAssetLoad(time=start + i * timedelta(minutes=15), load=50.0)
+        for i in range(-(-args.intervals // 3))
+    ]
+
+    per_thousand = 1000 / args.intervals
+    results = {
+        "validated intervals": _best_of(
+            args.repeat, lambda: _validated_intervals(args.intervals, start, duration)
+        ),
+        "trusted intervals": _best_of(
+            args.repeat, lambda: _trusted_intervals(args.intervals, start, duration)
+        ),
+        "event (validated intervals, validated event)": _best_of(
+            args.repeat, lambda: _validated_event(args.intervals, start, duration)
+        ),
+        "event (trusted intervals, validated event)": _best_of(
+            args.repeat,
+            lambda: _generate_capacity_limitation_event(loads, MAX_CAPACITY),
+        ),
+    }
+
+    for name, seconds in results.items():
+        print(f"{name:<45} {seconds * per_thousand * 1000:8.2f} ms per 1,000 intervals")
+
+
+if __name__ == "__main__":
+    main()
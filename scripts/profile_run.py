@@ -0,0 +1,230 @@
+"""Run a full cycle of the BL outside of the function host, optionally profiling it.
+
+The cycle is the run of the daily timer (main), or with --fan-out a fanned out run over an
+in-memory queue. Predictions are made by the real InfluxDB backends, or with --backend stub by
+the prediction stub. Events are published to an in-memory dry-run VTN unless --vtn real is given.
+
+Profiling modes (--profile, repeatable):
+
+- cprofile: deterministic profile of the event loop thread, written to cprofile.prof
+  (for snakeviz, or flameprof to render a flame graph).
+- sample: statistical sampling of the stacks of all threads, written in the collapsed stack
+  format to samples.folded (for flamegraph.pl or speedscope).
+- stages: wall and CPU time and peak memory per pipeline stage.
+- alloc: the top allocation sites of the run (tracemalloc).
+
+Work offloaded to the process pool (CPU_POOL_WORKERS) is not profiled, only the waiting for it.
+Run from the root of the repository, with the configuration of the BL set in the environment:
+
+    python -m scripts.profile_run --backend stub --profile stages --profile sample
+"""
+
+import argparse
+import asyncio
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Callable, Coroutine, Iterator
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+PROFILE_MODES = ("cprofile", "sample", "stages", "alloc")
+
+
+class _StackSampler(threading.Thread):
+    """Thread sampling the stacks of all other threads, counting the collapsed stacks."""
+
+    def __init__(self, interval_seconds: float) -> None:
+        super().__init__(name="stack-sampler", daemon=True)
+        self._interval_seconds = interval_seconds
+        self._stopped = threading.Event()
+        self.stacks: Counter[str] = Counter()
+
+    @staticmethod
+    def _collapse(thread_name: str, frame: FrameType | None) -> str:
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(
+                f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            )
+            frame = frame.f_back
+        return ";".join([thread_name, *reversed(names)])
+
+    def run(self) -> None:
+        while not self._stopped.wait(self._interval_seconds):
+            thread_names = {
+                thread.ident: thread.name for thread in threading.enumerate()
+            }
+            for ident, frame in sys._current_frames().items():
+                if ident != self.ident:
+                    self.stacks[
+                        self._collapse(thread_names.get(ident, str(ident)), frame)
+                    ] += 1
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join()
+
+
+@contextmanager
+def _cprofile(output_dir: Path, top: int) -> Iterator[None]:
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(output_dir / "cprofile.prof")
+        print(f"\ncProfile written to {output_dir / 'cprofile.prof'}")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(top)
+
+
+@contextmanager
+def _sample(output_dir: Path, interval_seconds: float) -> Iterator[None]:
+    sampler = _StackSampler(interval_seconds)
+    sampler.start()
+    try:
+        yield
+    finally:
+        sampler.stop()
+        with open(output_dir / "samples.folded", "w") as folded:
+            for stack, count in sampler.stacks.most_common():
+                folded.write(f"{stack} {count}\n")
+        print(
+            f"\n{sampler.stacks.total()} stack samples written to {output_dir / 'samples.folded'}"
+        )
+
+
+@contextmanager
+def _stages() -> Iterator[None]:
+    from src.infrastructure._memory import collect_stage_metrics
+
+    with collect_stage_metrics() as stage_metrics:
+        yield
+
+    print(f"\n{'stage':<12} {'wall s':>8} {'cpu s':>8} {'rss peak MiB':>13}")
+    for metrics in stage_metrics:
+        print(
+            f"{metrics.stage:<12} {metrics.seconds:8.3f} {metrics.cpu_seconds:8.3f} "
+            f"{metrics.rss_peak_mb:13.1f}"
+        )
+
+
+@contextmanager
+def _alloc(top: int) -> Iterator[None]:
+    tracemalloc.start(25)
+    try:
+        yield
+    finally:
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(
+            f"\nTraced peak: {peak / 1024 / 1024:.1f} MiB, top {top} allocation sites:"
+        )
+        for statistic in snapshot.statistics("lineno")[:top]:
+            print(statistic)
+
+
+def _prepare_cycle(
+    args: argparse.Namespace,
+) -> Callable[[], Coroutine[Any, Any, None]]:
+    """Import and set up the BL, so the imports are not part of the profiled cycle."""
+    from src.application.generate_events import PredictionActionsBase
+    from src.infrastructure.dry_run_vtn import (
+        DryRunEventsInterface,
+        create_dry_run_bl_client,
+    )
+    from src.infrastructure.influxdb._client import create_db_client
+    from src.infrastructure.local_store.run_ledger import RunLedgerEntry
+    from src.infrastructure.prediction_actions_impl import PredictionActionsInfluxDB
+    from src.infrastructure.predictions_actions_stub_impl import PredictionActionsStub
+    from src.main import _initialize_bl_client, main, run_fan_out_locally
+
+    client = create_db_client() if args.backend == "real" else None
+
+    def create_actions(
+        asset_id: str, ledger_entry: RunLedgerEntry | None
+    ) -> PredictionActionsBase:
+        if client is None:
+            return PredictionActionsStub()
+        return PredictionActionsInfluxDB(
+            client=client, ledger_entry=ledger_entry, asset_id=asset_id
+        )
+
+    bl_client = (
+        create_dry_run_bl_client() if args.vtn == "dry-run" else _initialize_bl_client()
+    )
+
+    async def run_cycle() -> None:
+        if args.fan_out:
+            failed = await run_fan_out_locally(
+                bl_client, create_actions, concurrency=args.concurrency
+            )
+            print(f"Failed assets per run: {failed}")
+        else:
+            await main(create_actions=create_actions, bl_client=bl_client)
+
+        if isinstance(bl_client.events, DryRunEventsInterface):
+            print(f"Dry-run VTN holds {len(bl_client.events.events)} events")
+
+    return run_cycle
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=("real", "stub"), default="real")
+    parser.add_argument("--vtn", choices=("dry-run", "real"), default="dry-run")
+    parser.add_argument("--fan-out", action="store_true")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--ledger",
+        action="store_true",
+        help="Checkpoint the run in the run ledger (resuming earlier runs of today)",
+    )
+    parser.add_argument("--profile", action="append", choices=PROFILE_MODES, default=[])
+    parser.add_argument("--output-dir", type=Path, default=Path("profiles"))
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--sample-interval-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    # The configuration is read when the BL is imported, so it is overridden before importing it.
+    os.environ["RUN_LEDGER_ENABLED"] = str(args.ledger)
+    if "stages" in args.profile and os.environ.get("MEMORY_TRACKING") == "off":
+        os.environ["MEMORY_TRACKING"] = "rss"
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    run_cycle = _prepare_cycle(args)
+
+    with ExitStack() as profilers:
+        if "stages" in args.profile:
+            profilers.enter_context(_stages())
+        if "alloc" in args.profile:
+            profilers.enter_context(_alloc(args.top))
+        if "sample" in args.profile:
+            profilers.enter_context(
+                _sample(args.output_dir, args.sample_interval_ms / 1000)
+            )
+        if "cprofile" in args.profile:
+            profilers.enter_context(_cprofile(args.output_dir, args.top))
+
+        started_at = time.perf_counter()
+        cpu_started_at = time.process_time()
+        asyncio.run(run_cycle())
+        print(
+            f"\nCycle took {time.perf_counter() - started_at:.3f} s wall, "
+            f"{time.process_time() - cpu_started_at:.3f} s CPU"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Module containing the fan-out of the per-asset work of a run over queued jobs.
+
+A coordinator plans a job per batch of assets and enqueues them. Workers (possibly on other
+instances of the function app) pick up the jobs and run the per-asset pipeline. A job tracker
+records the state of every asset of a run, so assets which were enqueued but never finished
+(stragglers) can be reported.
+"""
+
+import json
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass(frozen=True)
+class AssetJob:
+    """A job to generate the capacity limitation events of a batch of assets."""
+
+    run_id: str
+    """The identifier of the run the job belongs to."""
+
+    asset_ids: tuple[str, ...]
+    """The EAN numbers of the assets to process."""
+
+    from_date: datetime
+    """The start time (inclusive) of the horizon to generate events for."""
+
+    to_date: datetime
+    """The end time (exclusive) of the horizon to generate events for."""
+
+    def to_message(self) -> str:
+        """Serialize the job into a queue message.
+
+        Returns:
+            str: The queue message.
+        """
+        return json.dumps(
+            {
+                "run_id": self.run_id,
+                "asset_ids": list(self.asset_ids),
+                "from_date": self.from_date.isoformat(),
+                "to_date": self.to_date.isoformat(),
+            }
+        )
+
+    @classmethod
+    def from_message(cls, message: str) -> "AssetJob":
+        """Deserialize a job from a queue message.
+
+        Args:
+            message (str): The queue message.
+
+        Returns:
+            AssetJob: The job.
+        """
+        body = json.loads(message)
+        return cls(
+            run_id=body["run_id"],
+            asset_ids=tuple(body["asset_ids"]),
+            from_date=datetime.fromisoformat(body["from_date"]),
+            to_date=datetime.fromisoformat(body["to_date"]),
+        )
+
+
+def plan_asset_jobs(
+    run_id: str,
+    asset_ids: list[str],
+    from_date: datetime,
+    to_date: datetime,
+    batch_size: int = 1,
+) -> list[AssetJob]:
+    """Plan the jobs of a run, a job per batch of assets.
+
+    Args:
+        run_id (str): The identifier of the run.
+        asset_ids (list[str]): The EAN numbers of the assets of the run.
+        from_date (datetime): The start time (inclusive) of the horizon.
+        to_date (datetime): The end time (exclusive) of the horizon.
+        batch_size (int): The number of assets per job. Defaults to 1.
+
+    Returns:
+        list[AssetJob]: The jobs of the run.
+    """
+    if batch_size < 1:
+        msg = f"The batch size of the asset jobs must be positive, got {batch_size}"
+        raise ValueError(msg)
+
+    return [
+        AssetJob(
+            run_id=run_id,
+            asset_ids=tuple(asset_ids[i : i + batch_size]),
+            from_date=from_date,
+            to_date=to_date,
+        )
+        for i in range(0, len(asset_ids), batch_size)
+    ]
+
+
+class JobTrackerBase(ABC):
+    """Abstract tracker of the state of the assets of the runs which were fanned out."""
+
+    @abstractmethod
+    async def record_enqueued(self, jobs: list[AssetJob]) -> None:
+        """Record that the assets of the given jobs were enqueued.
+
+        Args:
+            jobs (list[AssetJob]): The enqueued jobs.
+        """
+
+    @abstractmethod
+    async def record_finished(
+        self, run_id: str, asset_id: str, succeeded: bool
+    ) -> None:
+        """Record that an asset of a run finished.
+
+        Args:
+            run_id (str): The identifier of the run.
+            asset_id (str): The EAN number of the asset.
+            succeeded (bool): Whether the events of the asset were published.
+        """
+
+    @abstractmethod
+    async def get_stragglers(
+        self, enqueued_after: datetime, enqueued_before: datetime
+    ) -> dict[str, list[str]]:
+        """Retrieve the assets which were enqueued in the given period, but did not finish successfully.
+
+        Args:
+            enqueued_after (datetime): The start (inclusive) of the period the assets were enqueued in.
+            enqueued_before (datetime): The end (exclusive) of the period the assets were enqueued in.
+
+        Returns:
+            dict[str, list[str]]: The EAN numbers of the unfinished or failed assets per run.
+        """
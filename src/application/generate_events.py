@@ -1,6 +1,13 @@
+import copyreg
+import math
 from abc import ABC, abstractmethod
-from datetime import datetime, timedelta
-from openadr3_client.models.event.event import NewEvent
+from collections.abc import Callable, Sequence
+from datetime import UTC, datetime, timedelta, tzinfo
+from typing import Any
+
+import numpy as np
+from pydantic import BaseModel
+from openadr3_client.models.event.event import Event, EventUpdate, NewEvent
 from openadr3_client.models.common.interval import Interval
 from openadr3_client.models.common.interval_period import IntervalPeriod
 from openadr3_client.models.event.event_payload import (
@@ -11,6 +18,8 @@ from openadr3_client.models.event.event_payload import (
 from openadr3_client.models.common.unit import Unit
 from openadr3_client.models.common.target import Target
 
+from src.application.run_checkpoints import RunCheckpointsBase
+from src.cpu_pool import run_cpu_bound
 from src.logger import logger
 from src.config import MAX_CAPACITY, MOCK_EAN_NUMBER, PROGRAM_ID, VEN_NAMES
 from src.models.predicted_load import PredictedGridAssetLoad
@@ -46,20 +55,153 @@ class PredictionActionsBase[ReadOnlySession, WriteSession](ABC):
             list[PredictedGridAssetLoad]: The list of predicted grid asset loads.
         """
 
+    @abstractmethod
+    async def get_remaining_predicted_grid_asset_load(
+        self,
+        query_api: ReadOnlySession,
+        horizon_start: datetime,
+        horizon_end: datetime,
+        from_date: datetime,
+    ) -> list[PredictedGridAssetLoad]:
+        """Retrieve predicted grid asset load for the remaining part of an already forecasted horizon.
+
+        Implementations can reuse the work done when the full horizon was forecasted.
+
+        Args:
+            query_api (ReadOnlySession): The read-only connection to the database.
+            horizon_start (datetime): The start time (inclusive) of the forecasted horizon.
+            horizon_end (datetime): The end time (exclusive) of the forecasted horizon.
+            from_date (datetime): The start time (inclusive) of the remaining part of the horizon.
+
+        Returns:
+            list[PredictedGridAssetLoad]: The list of predicted grid asset loads.
+        """
+
     @abstractmethod
     async def audit_predicted_grid_asset_loads(
         self,
         write_api: WriteSession,
         predicted_grid_asset_loads: list[PredictedGridAssetLoad],
+        reforecast: bool = False,
     ) -> None:
         """Audit predicted grid asset loads by storing them in the database.
 
         Args:
             write_api (WriteSession): The write connection to the database.
             predicted_grid_asset_loads (list[PredictedGridAssetLoad]): The list of predicted grid asset loads to audit.
+            reforecast (bool): Whether the loads are an intraday re-forecast of an active event, which is audited
+                separately from the day-ahead forecast. Defaults to False.
         """
 
 
+def _capacity_limit(load: float, max_capacity: float) -> int:
+    """Calculate the capacity limit of an interval from its predicted load.
+
+    Args:
+        load (float): The predicted load of the interval.
+        max_capacity (float): The maximum capacity allowed for the grid asset.
+
+    Returns:
+        int: The capacity limit in kW, restricted if the predicted load exceeds the maximum capacity.
+    """
+    return 20 if load > max_capacity else 100
+
+
+def build_capacity_limitation_intervals(
+    interval_ids: Sequence[int],
+    starts: Sequence[datetime],
+    durations: Sequence[timedelta],
+    limits: Sequence[float],
+) -> tuple[Interval[EventPayload], ...]:
+    """Build capacity limitation intervals from aligned arrays, without validating every interval.
+
+    The intervals are produced by the BL itself from trusted data, so they are constructed
+    without running the pydantic validation of each interval, interval period and payload. The
+    event the intervals are assigned to is validated once, including the GAC compliance rules,
+    when it is constructed.
+
+    Args:
+        interval_ids (Sequence[int]): The ID of every interval.
+        starts (Sequence[datetime]): The (timezone-aware) start of every interval.
+        durations (Sequence[timedelta]): The duration of every interval.
+        limits (Sequence[float]): The capacity limit of every interval.
+
+    Returns:
+        tuple[Interval[EventPayload], ...]: The capacity limitation intervals.
+    """
+    interval_type = Interval[EventPayload]
+    # The models are immutable, so intervals with the same limit can share their payloads.
+    payloads: dict[float, tuple[EventPayload, ...]] = {}
+
+    for limit in limits:
+        if limit not in payloads:
+            payloads[limit] = (
+                EventPayload.model_construct(
+                    type=EventPayloadType.IMPORT_CAPACITY_LIMIT, values=(limit,)
+                ),
+            )
+
+    return tuple(
+        interval_type.model_construct(
+            id=interval_id,
+            interval_period=IntervalPeriod.model_construct(
+                start=start, duration=duration
+            ),
+            payloads=payloads[limit],
+        )
+        for interval_id, start, duration, limit in zip(
+            interval_ids, starts, durations, limits, strict=True
+        )
+    )
+
+
+# Models constructed in the process pool are pickled as their fields and reconstructed without validating
+# them again. By default they cannot be pickled: parametrized generic models cannot be pickled by reference
+# and the creation guard of events holds a lock.
+_POOL_RETURNED_MODELS: dict[str, type[BaseModel]] = {
+    "interval": Interval[EventPayload],
+    "new_event": NewEvent,
+}
+
+
+def _construct_model(name: str, fields: dict[str, Any]) -> BaseModel:
+    """Reconstruct an unpickled model returned by the process pool, without validating it again.
+
+    Args:
+        name (str): The name of the model in _POOL_RETURNED_MODELS.
+        fields (dict[str, Any]): The fields of the model.
+
+    Returns:
+        BaseModel: The model.
+    """
+    return _POOL_RETURNED_MODELS[name].model_construct(**fields)
+
+
+def _reduce_model(
+    model: BaseModel,
+) -> tuple[Callable[[str, dict[str, Any]], BaseModel], tuple[str, dict[str, Any]]]:
+    """Reduce a model returned by the process pool to its name and fields, to pickle it.
+
+    Args:
+        model (BaseModel): The model, of one of the types in _POOL_RETURNED_MODELS.
+
+    Returns:
+        tuple[Callable[[str, dict[str, Any]], BaseModel], tuple[str, dict[str, Any]]]: The function
+            which reconstructs the model and its arguments.
+    """
+    name = next(
+        name
+        for name, model_type in _POOL_RETURNED_MODELS.items()
+        if type(model) is model_type
+    )
+    fields = {field: getattr(model, field) for field in type(model).model_fields}
+    return _construct_model, (name, fields)
+
+
+for _model_type in _POOL_RETURNED_MODELS.values():
+    copyreg.pickle(_model_type, _reduce_model)
+
+
 def _generate_capacity_limitation_intervals(
     interval_id: int,
     predicted_grid_asset_loads: PredictedGridAssetLoad,
@@ -75,36 +217,27 @@ def _generate_capacity_limitation_intervals(
     Returns:
         Interval[EventPayload]: The capacity limitation interval.
     """
-
-    return Interval(
-        id=interval_id,
-        interval_period=IntervalPeriod(
-            start=predicted_grid_asset_loads.time,
-            duration=predicted_grid_asset_loads.duration,
-        ),
-        payloads=(
-            EventPayload(
-                type=EventPayloadType.IMPORT_CAPACITY_LIMIT,
-                values=(100 if interval_id % 2 == 0 else 20,),
-            ),
-        ),
-    )
+    return build_capacity_limitation_intervals(
+        interval_ids=(interval_id,),
+        starts=(predicted_grid_asset_loads.time,),
+        durations=(predicted_grid_asset_loads.duration,),
+        limits=(_capacity_limit(predicted_grid_asset_loads.load, max_capacity),),
+    )[0]
 
 
-def _generate_capacity_limitation_event(
-    predicted_grid_asset_loads: list[PredictedGridAssetLoad], max_capacity: float
-) -> NewEvent:
-    """Generate a capacity limitation event for the given predicted grid asset load.
+def _expand_to_sub_intervals(
+    predicted_grid_asset_loads: list[PredictedGridAssetLoad],
+) -> list[PredictedGridAssetLoad]:
+    """Expand the predicted grid asset loads into loads of the sub interval duration of the events.
 
     Args:
         predicted_grid_asset_loads (list[PredictedGridAssetLoad]): The predicted grid asset loads.
-        max_capacity (float): The maximum capacity allowed for the grid asset.
 
     Returns:
-        Event: The capacity limitation event.
+        list[PredictedGridAssetLoad]: The predicted grid asset loads per sub interval.
     """
     sub_interval_duration = timedelta(minutes=5)
-    expanded_loads = [
+    return [
         PredictedGridAssetLoad(
             time=load.time + i * sub_interval_duration,
             load=load.load,
@@ -114,31 +247,211 @@ def _generate_capacity_limitation_event(
         for i in range(int(load.duration / sub_interval_duration))
     ]
 
-    intervals = [
-        _generate_capacity_limitation_intervals(
-            interval_id=interval_id,
-            predicted_grid_asset_loads=expanded_load,
-            max_capacity=max_capacity,
-        )
-        for interval_id, expanded_load in enumerate(expanded_loads)
-    ]
+
+def _build_event_intervals(
+    predicted_grid_asset_loads: list[PredictedGridAssetLoad], max_capacity: float
+) -> tuple[Interval[EventPayload], ...]:
+    """Build the capacity limitation intervals of an event for the given predicted grid asset loads.
+
+    Args:
+        predicted_grid_asset_loads (list[PredictedGridAssetLoad]): The predicted grid asset loads of the event.
+        max_capacity (float): The maximum capacity allowed for the grid asset.
+
+    Returns:
+        tuple[Interval[EventPayload], ...]: The capacity limitation intervals, one per sub interval.
+    """
+    expanded_loads = _expand_to_sub_intervals(predicted_grid_asset_loads)
+
+    return build_capacity_limitation_intervals(
+        interval_ids=range(len(expanded_loads)),
+        starts=[load.time for load in expanded_loads],
+        durations=[load.duration for load in expanded_loads],
+        limits=[_capacity_limit(load.load, max_capacity) for load in expanded_loads],
+    )
+
+
+def _generate_capacity_limitation_event(
+    predicted_grid_asset_loads: list[PredictedGridAssetLoad],
+    max_capacity: float,
+    event_name: str | None = None,
+    asset_id: str = MOCK_EAN_NUMBER,
+) -> NewEvent:
+    """Generate a capacity limitation event for the given predicted grid asset load.
+
+    Args:
+        predicted_grid_asset_loads (list[PredictedGridAssetLoad]): The predicted grid asset loads.
+        max_capacity (float): The maximum capacity allowed for the grid asset.
+        event_name (str | None): The name of the event. If None, the name is based on the current date.
+        asset_id (str): The EAN number of the grid asset the event targets. Defaults to MOCK_EAN_NUMBER.
+
+    Returns:
+        Event: The capacity limitation event.
+    """
+    intervals = _build_event_intervals(predicted_grid_asset_loads, max_capacity)
 
     return NewEvent(
         programID=PROGRAM_ID,
-        event_name=f"bl-generated-event-{datetime.now().strftime('%d-%m-%Y')}",
+        event_name=event_name
+        or f"bl-generated-event-{datetime.now().strftime('%d-%m-%Y')}",
         payload_descriptors=(
             EventPayloadDescriptor(
                 payload_type=EventPayloadType.IMPORT_CAPACITY_LIMIT, units=Unit.KW
             ),
         ),
-        intervals=tuple(intervals),
+        intervals=intervals,
         targets=(
             Target(type="VEN_NAME", values=tuple(VEN_NAMES.split(","))),
-            Target(type="POWER_SERVICE_LOCATION", values=(MOCK_EAN_NUMBER,)),
+            Target(type="POWER_SERVICE_LOCATION", values=(asset_id,)),
         ),
     )
 
 
+def _generate_capacity_limitation_event_from_arrays(
+    loads: dict[str, np.ndarray],
+    timezone: tzinfo,
+    max_capacity: float,
+    event_name: str | None,
+    asset_id: str,
+) -> NewEvent:
+    """Generate a capacity limitation event for predicted grid asset loads passed as arrays.
+
+    CPU-bound, runs in the process pool if it is enabled.
+
+    Args:
+        loads (dict[str, np.ndarray]): The "times" and "durations" (int64 nanoseconds, times since the epoch)
+            and "loads" of the predicted grid asset loads.
+        timezone (tzinfo): The timezone of the times of the predicted grid asset loads.
+        max_capacity (float): The maximum capacity allowed for the grid asset.
+        event_name (str | None): The name of the event. If None, the name is based on the current date.
+        asset_id (str): The EAN number of the grid asset the event targets.
+
+    Returns:
+        Event: The capacity limitation event.
+    """
+    epoch = datetime(1970, 1, 1, tzinfo=UTC)
+    predicted_grid_asset_loads = [
+        PredictedGridAssetLoad(
+            time=(epoch + timedelta(microseconds=time // 1000)).astimezone(timezone),
+            load=load,
+            duration=timedelta(microseconds=duration // 1000),
+        )
+        for time, duration, load in zip(
+            loads["times"].tolist(),
+            loads["durations"].tolist(),
+            loads["loads"].tolist(),
+            strict=True,
+        )
+    ]
+
+    return _generate_capacity_limitation_event(
+        predicted_grid_asset_loads, max_capacity, event_name, asset_id
+    )
+
+
+async def _build_capacity_limitation_event(
+    predicted_grid_asset_loads: list[PredictedGridAssetLoad],
+    max_capacity: float,
+    event_name: str | None,
+    asset_id: str,
+) -> NewEvent:
+    """Generate a capacity limitation event, off the event loop if the process pool is enabled.
+
+    Args:
+        predicted_grid_asset_loads (list[PredictedGridAssetLoad]): The predicted grid asset loads.
+        max_capacity (float): The maximum capacity allowed for the grid asset.
+        event_name (str | None): The name of the event. If None, the name is based on the current date.
+        asset_id (str): The EAN number of the grid asset the event targets.
+
+    Returns:
+        Event: The capacity limitation event.
+    """
+    epoch = datetime(1970, 1, 1, tzinfo=UTC)
+    loads = {
+        "times": np.array(
+            [
+                (load.time - epoch) // timedelta(microseconds=1) * 1000
+                for load in predicted_grid_asset_loads
+            ],
+            dtype=np.int64,
+        ),
+        "durations": np.array(
+            [
+                load.duration // timedelta(microseconds=1) * 1000
+                for load in predicted_grid_asset_loads
+            ],
+            dtype=np.int64,
+        ),
+        "loads": np.array(
+            [load.load for load in predicted_grid_asset_loads], dtype=np.float64
+        ),
+    }
+
+    return await run_cpu_bound(
+        _generate_capacity_limitation_event_from_arrays,
+        loads,
+        predicted_grid_asset_loads[0].time.tzinfo or UTC,
+        max_capacity,
+        event_name,
+        asset_id,
+    )
+
+
+def _made_by_model(predicted_grid_asset_loads: list[PredictedGridAssetLoad]) -> bool:
+    """Check whether the predicted grid asset loads were all made by the prediction model.
+
+    Predictions of the baseline forecaster, made while the prediction model was unavailable, are
+    not checkpointed, so a retried run calls the prediction model again.
+
+    Args:
+        predicted_grid_asset_loads (list[PredictedGridAssetLoad]): The predicted grid asset loads.
+
+    Returns:
+        bool: Whether all predicted grid asset loads were made by the prediction model.
+    """
+    return all(load.forecaster == "model" for load in predicted_grid_asset_loads)
+
+
+def _split_into_events(
+    predicted_grid_asset_loads: list[PredictedGridAssetLoad],
+    from_date: datetime,
+    to_date: datetime,
+    event_duration: timedelta,
+) -> list[tuple[datetime, datetime, list[PredictedGridAssetLoad]]]:
+    """Split the predicted grid asset loads of a horizon into the loads of every event.
+
+    Args:
+        predicted_grid_asset_loads (list[PredictedGridAssetLoad]): The predicted grid asset loads of the horizon.
+        from_date (datetime): The start time (inclusive) of the horizon.
+        to_date (datetime): The end time (exclusive) of the horizon.
+        event_duration (timedelta): The duration of a single event.
+
+    Returns:
+        list[tuple[datetime, datetime, list[PredictedGridAssetLoad]]]: The start (inclusive), end (exclusive)
+            and predicted grid asset loads of every event, in chronological order.
+    """
+    event_count = math.ceil((to_date - from_date) / event_duration)
+    events = []
+
+    for event_index in range(event_count):
+        # Adding the duration to the (timezone-aware) start keeps the wall clock time of the
+        # event boundaries the same over daylight saving time transitions.
+        event_start = from_date + event_index * event_duration
+        event_end = min(event_start + event_duration, to_date)
+        events.append(
+            (
+                event_start,
+                event_end,
+                [
+                    load
+                    for load in predicted_grid_asset_loads
+                    if event_start <= load.time < event_end
+                ],
+            )
+        )
+
+    return events
+
+
 async def get_capacity_limitation_event(
     actions: PredictionActionsBase, from_date: datetime, to_date: datetime
 ) -> NewEvent | None:
@@ -152,21 +465,233 @@ async def get_capacity_limitation_event(
     Returns:
         Event | None: The OpenADR3 capacity limitation event. None if no data to base the event on could be retrieved.
     """
+    events = await get_capacity_limitation_events(
+        actions,
+        from_date=from_date,
+        to_date=to_date,
+        event_duration=to_date - from_date,
+    )
+    return events[0] if events else None
+
+
+async def get_capacity_limitation_events(
+    actions: PredictionActionsBase,
+    from_date: datetime,
+    to_date: datetime,
+    event_duration: timedelta = timedelta(days=1),
+    asset_id: str = MOCK_EAN_NUMBER,
+    checkpoints: RunCheckpointsBase | None = None,
+) -> list[NewEvent]:
+    """Retrieve OpenADR3 capacity limitation events for a horizon of one or more days.
+
+    The grid asset load of the whole horizon is predicted in a single pass, after which the
+    predictions are split into an event per event duration. With checkpoints, the predictions
+    and audit of a previous attempt of the run are reused, unless they were made by the baseline
+    forecaster.
+
+    Args:
+        actions (PredictionActionsBase): The actions to use.
+        from_date (datetime): The start time (inclusive) of the horizon.
+        to_date (datetime): The end time (exclusive) of the horizon.
+        event_duration (timedelta): The duration of a single event. Defaults to one day.
+        asset_id (str): The EAN number of the grid asset the events target. Defaults to MOCK_EAN_NUMBER.
+        checkpoints (RunCheckpointsBase | None): The checkpoints of the run. If None, all stages are run.
+
+    Returns:
+        list[NewEvent]: The OpenADR3 capacity limitation events, in chronological order. Empty if
+            no data to base the events on could be retrieved.
+    """
+    predicted_grid_asset_loads = checkpoints.get_predictions() if checkpoints else None
+
+    if predicted_grid_asset_loads is None:
+        query_api = actions.get_query_api()
+        predicted_grid_asset_loads = await actions.get_predicted_grid_asset_load(
+            query_api, from_date, to_date
+        )
+        if (
+            predicted_grid_asset_loads
+            and checkpoints
+            and _made_by_model(predicted_grid_asset_loads)
+        ):
+            checkpoints.put_predictions(predicted_grid_asset_loads)
+
+    # If no predictions could be retrieved, return no events.
+    if not predicted_grid_asset_loads:
+        logger.warning(
+            "get_capacity_limitation_events: No predictions could be retrieved, returning no events."
+        )
+        return []
+
+    # The audit is written once per run, a retried run would otherwise write duplicate audit points.
+    if not (checkpoints and checkpoints.is_audited()):
+        write_api = actions.get_write_api()
+        await actions.audit_predicted_grid_asset_loads(
+            write_api, predicted_grid_asset_loads
+        )
+        if checkpoints and _made_by_model(predicted_grid_asset_loads):
+            checkpoints.mark_audited()
+
+    event_loads_per_event = _split_into_events(
+        predicted_grid_asset_loads, from_date, to_date, event_duration
+    )
+    event_count = len(event_loads_per_event)
+    events: list[NewEvent] = []
+
+    for event_index, (event_start, event_end, event_loads) in enumerate(
+        event_loads_per_event
+    ):
+        if not event_loads:
+            logger.warning(
+                "get_capacity_limitation_events: No predictions between %s and %s, skipping event.",
+                event_start,
+                event_end,
+            )
+            continue
+
+        event_name = (
+            f"bl-generated-event-{datetime.now().strftime('%d-%m-%Y')}-{event_index + 1}"
+            if event_count > 1
+            else None
+        )
+        events.append(
+            await _build_capacity_limitation_event(
+                event_loads, MAX_CAPACITY, event_name, asset_id
+            )
+        )
+
+    return events
+
+
+async def get_capacity_limitation_preview(
+    actions: PredictionActionsBase,
+    from_date: datetime,
+    to_date: datetime,
+    event_duration: timedelta = timedelta(days=1),
+    checkpoints: RunCheckpointsBase | None = None,
+) -> tuple[list[PredictedGridAssetLoad], list[Interval[EventPayload]]]:
+    """Preview the predicted grid asset loads and capacity limitation intervals of a horizon.
+
+    The intervals are computed like get_capacity_limitation_events does, but nothing is audited,
+    checkpointed or published. With checkpoints, the predictions of the run are reused.
+
+    Args:
+        actions (PredictionActionsBase): The actions to use.
+        from_date (datetime): The start time (inclusive) of the horizon.
+        to_date (datetime): The end time (exclusive) of the horizon.
+        event_duration (timedelta): The duration of a single event. Defaults to one day.
+        checkpoints (RunCheckpointsBase | None): The checkpoints of the run of the horizon, only read from.
+
+    Returns:
+        tuple[list[PredictedGridAssetLoad], list[Interval[EventPayload]]]: The predicted grid asset loads
+            and the capacity limitation intervals of all events, in chronological order.
+    """
+    predicted_grid_asset_loads = checkpoints.get_predictions() if checkpoints else None
+
+    if predicted_grid_asset_loads is None:
+        predicted_grid_asset_loads = await actions.get_predicted_grid_asset_load(
+            actions.get_query_api(), from_date, to_date
+        )
+
+    intervals: list[Interval[EventPayload]] = []
+    for _, _, event_loads in _split_into_events(
+        predicted_grid_asset_loads, from_date, to_date, event_duration
+    ):
+        if event_loads:
+            intervals.extend(_build_event_intervals(event_loads, MAX_CAPACITY))
+
+    return predicted_grid_asset_loads, intervals
+
+
+def get_event_horizon(event: Event) -> tuple[datetime, datetime] | None:
+    """Retrieve the time span covered by the intervals of the given event.
+
+    Args:
+        event (Event): The event.
+
+    Returns:
+        tuple[datetime, datetime] | None: The start (inclusive) and end (exclusive) of the event.
+            None if the intervals of the event do not have an interval period.
+    """
+    periods = [i.interval_period for i in event.intervals if i.interval_period]
+
+    if not periods:
+        return None
+
+    return (
+        min(p.start for p in periods),
+        max(p.start + p.duration for p in periods),
+    )
+
+
+async def get_capacity_limitation_event_update(
+    actions: PredictionActionsBase, active_event: Event, from_date: datetime
+) -> tuple[EventUpdate, list[PredictedGridAssetLoad]] | None:
+    """Re-forecast the remaining part of an active capacity limitation event.
+
+    Only the intervals starting at or after from_date are recomputed. Intervals whose capacity
+    limit did not change keep their current definition, so the update only changes intervals
+    for which a different limit was computed. The re-forecast is not audited, the caller audits
+    it once the update is published.
+
+    Args:
+        actions (PredictionActionsBase): The actions to use.
+        active_event (Event): The capacity limitation event that is currently active in the VTN.
+        from_date (datetime): The start time (inclusive) from which to re-forecast the event.
+
+    Returns:
+        tuple[EventUpdate, list[PredictedGridAssetLoad]] | None: The update to apply to the active event
+            and the re-forecasted grid asset loads it is based on. None if no limits changed or no
+            predictions could be retrieved.
+    """
+    horizon = get_event_horizon(active_event)
+
+    if horizon is None or from_date >= horizon[1]:
+        logger.info(
+            "get_capacity_limitation_event_update: Nothing left to re-forecast in the active event."
+        )
+        return None
+
+    horizon_start, horizon_end = horizon
+
     query_api = actions.get_query_api()
-    predicted_grid_asset_loads = await actions.get_predicted_grid_asset_load(
-        query_api, from_date, to_date
+    predicted_grid_asset_loads = await actions.get_remaining_predicted_grid_asset_load(
+        query_api, horizon_start, horizon_end, from_date
     )
 
-    # If no predictions could be retrieved, return None.
     if not predicted_grid_asset_loads:
         logger.warning(
-            "get_capacity_limitation_event: No predictions could be retrieved, returning None."
+            "get_capacity_limitation_event_update: No predictions could be retrieved, returning None."
         )
         return None
 
-    write_api = actions.get_write_api()
-    await actions.audit_predicted_grid_asset_loads(
-        write_api, predicted_grid_asset_loads
+    active_intervals = {
+        i.interval_period.start: i for i in active_event.intervals if i.interval_period
+    }
+    updated_intervals: dict[int, Interval[EventPayload]] = {}
+
+    for expanded_load in _expand_to_sub_intervals(predicted_grid_asset_loads):
+        active_interval = active_intervals.get(expanded_load.time)
+        if active_interval is None:
+            continue
+
+        # Keep the interval id of the active event, so the interval ids stay strictly increasing.
+        interval = _generate_capacity_limitation_intervals(
+            interval_id=active_interval.id,
+            predicted_grid_asset_loads=expanded_load,
+            max_capacity=MAX_CAPACITY,
+        )
+        if interval.payloads[0].values != active_interval.payloads[0].values:
+            updated_intervals[interval.id] = interval
+
+    logger.info(
+        "get_capacity_limitation_event_update: Capacity limit changed for %d intervals.",
+        len(updated_intervals),
     )
 
-    return _generate_capacity_limitation_event(predicted_grid_asset_loads, MAX_CAPACITY)
+    if not updated_intervals:
+        return None
+
+    event_update = EventUpdate(
+        intervals=tuple(updated_intervals.get(i.id, i) for i in active_event.intervals)
+    )
+    return event_update, predicted_grid_asset_loads
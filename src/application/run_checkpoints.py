@@ -0,0 +1,61 @@
+"""Module containing the checkpoints of the stages of a run for a single asset and target day.
+
+A run which fails halfway (for example while publishing the events) is retried from the first
+stage it did not complete, reusing the output of the completed stages. This prevents duplicate
+audit points and events in the VTN.
+"""
+
+from abc import ABC, abstractmethod
+
+from src.models.predicted_load import PredictedGridAssetLoad
+
+
+class RunCheckpointsBase(ABC):
+    """Abstract store of the stage outputs of a run for a single asset and target day."""
+
+    @abstractmethod
+    def get_predictions(self) -> list[PredictedGridAssetLoad] | None:
+        """Retrieve the checkpointed predictions of the run.
+
+        Returns:
+            list[PredictedGridAssetLoad] | None: The predictions. None if the predictions were not checkpointed.
+        """
+
+    @abstractmethod
+    def put_predictions(
+        self, predicted_grid_asset_loads: list[PredictedGridAssetLoad]
+    ) -> None:
+        """Checkpoint the predictions of the run.
+
+        Args:
+            predicted_grid_asset_loads (list[PredictedGridAssetLoad]): The predictions.
+        """
+
+    @abstractmethod
+    def is_audited(self) -> bool:
+        """Check whether the predictions of the run were audited.
+
+        Returns:
+            bool: Whether the predictions were audited.
+        """
+
+    @abstractmethod
+    def mark_audited(self) -> None:
+        """Checkpoint that the predictions of the run were audited."""
+
+    @abstractmethod
+    def get_published_events(self) -> dict[str, str]:
+        """Retrieve the events of the run which were published to the VTN.
+
+        Returns:
+            dict[str, str]: The id in the VTN of every published event, by the start of the event (ISO format).
+        """
+
+    @abstractmethod
+    def mark_published(self, event_start: str, event_id: str) -> None:
+        """Checkpoint that an event of the run was published to the VTN.
+
+        Args:
+            event_start (str): The start of the event (ISO format).
+            event_id (str): The id of the event in the VTN.
+        """
@@ -1,3 +1,6 @@
+import os
+import tempfile
+
 from decouple import config
 
 # The base URL of the VTN.
@@ -14,6 +17,9 @@ PROGRAM_ID = config("PROGRAM_ID", cast=str)
 # The maximum capacity of the grid asset. This is used to calculate the flex capacity required based on the predicted load.
 MAX_CAPACITY = config("MAX_CAPACITY", cast=float)
 
+# The number of days (starting at 12:00 today) to generate capacity limitation events for, one event per day.
+FORECAST_HORIZON_DAYS = config("FORECAST_HORIZON_DAYS", default=1, cast=int)
+
 # INFLUXDB parameters
 INFLUXDB_ORG = config("INFLUXDB_ORG")
 INFLUXDB_BUCKET = config("INFLUXDB_BUCKET")
@@ -32,15 +38,142 @@ DALIDATA_BUCKET_NAME = config(
     "DALIDATA_BUCKET_NAME", default="ditm-dali-data-processed"
 )
 
+# Semicolon-delimited list of the comma-delimited 'category:weight' pairs used to scale the standard profiles to
+# each grid asset, keyed by its EAN number, for example "871...001=E1A:120,E1B:35;871...002=E1A:80". Pairs without
+# EAN number apply to the assets without pairs of their own, for example "E1A:120,E1B:35" for all assets. If an
+# asset has no pairs, its scaled standard profile feature is not used (set to 0).
+STANDARD_PROFILE_WEIGHTS = config("STANDARD_PROFILE_WEIGHTS", default="", cast=str)
+
+# Directory in which the BL keeps its local state (feature store, caches). The local state is opt-in, the
+# features below are disabled by default.
+LOCAL_STORE_DIR = config(
+    "LOCAL_STORE_DIR", default=os.path.join(tempfile.gettempdir(), "ditm-bl")
+)
+# Whether the assembled features are stored locally, and reused while their upstream sources are unchanged.
+FEATURE_STORE_ENABLED = config("FEATURE_STORE_ENABLED", default=False, cast=bool)
+# Whether the stages of the daily runs are checkpointed, so a failed or retried run resumes from the first
+# incomplete stage. Checkpoints of past target days are kept for the given number of days.
+RUN_LEDGER_ENABLED = config("RUN_LEDGER_ENABLED", default=False, cast=bool)
+RUN_LEDGER_RETENTION_DAYS = config("RUN_LEDGER_RETENTION_DAYS", default=7, cast=int)
+# Whether the hourly and daily rollups of the dalidata are maintained locally, covering the given number of days.
+# Long-lookback features read the rollups, so only the dalidata of the days around the lags is retrieved raw.
+DALI_ROLLUPS_ENABLED = config("DALI_ROLLUPS_ENABLED", default=False, cast=bool)
+DALI_ROLLUP_HISTORY_DAYS = config("DALI_ROLLUP_HISTORY_DAYS", default=400, cast=int)
+
 # External services URLs
 WEATHER_FORECAST_API_URL = config("WEATHER_FORECAST_API_URL")
 
+# How the fetched weather forecasts are archived in the local store, keyed by grid cell, model run and window:
+# - "off": forecasts are not archived.
+# - "record": every fetched forecast is archived. Retried runs within the same (hourly) model run read the
+#   archived forecast instead of calling the weather forecast API.
+# - "replay": forecasts are only read from the archive, from the latest model run at or before
+#   WEATHER_REPLAY_AS_OF (ISO format, if set). The weather forecast API is never called.
+WEATHER_ARCHIVE_MODE = config("WEATHER_ARCHIVE_MODE", default="off", cast=str)
+WEATHER_REPLAY_AS_OF = config("WEATHER_REPLAY_AS_OF", default="", cast=str)
+# The number of days the archived forecasts are kept, counted from the (UTC) day their window starts.
+WEATHER_ARCHIVE_RETENTION_DAYS = config(
+    "WEATHER_ARCHIVE_RETENTION_DAYS", default=30, cast=int
+)
+# Whether newly archived forecasts are mirrored to the audit bucket in InfluxDB.
+WEATHER_ARCHIVE_INFLUX_MIRROR = config(
+    "WEATHER_ARCHIVE_INFLUX_MIRROR", default=False, cast=bool
+)
+
 # Authentication to Azure ML managed endpoint for prediction model
 DITM_MODEL_API_URL = config("DITM_MODEL_API_URL")
 DITM_MODEL_API_CLIENT_ID = config("DITM_MODEL_API_CLIENT_ID")
 DITM_MODEL_API_CLIENT_SECRET = config("DITM_MODEL_API_CLIENT_SECRET")
 DITM_MODEL_API_TOKEN_URL = config("DITM_MODEL_API_TOKEN_URL")
 
+# The backend used to make predictions, either "azureml" to call the managed endpoint of the prediction model,
+# or "local" to score the exported model artifact at LOCAL_MODEL_PATH (.onnx, or a pickled model) in-process.
+INFERENCE_BACKEND = config("INFERENCE_BACKEND", default="azureml", cast=str)
+LOCAL_MODEL_PATH = config("LOCAL_MODEL_PATH", default="model/ditm_model.onnx", cast=str)
+# The number of CPU threads used by the local model. 0 to let the model runtime decide.
+LOCAL_MODEL_THREADS = config("LOCAL_MODEL_THREADS", default=0, cast=int)
+
+# Tail-latency controls of the calls to the prediction model endpoint. A duplicate (hedged) request is sent when
+# a request is slower than the given percentile of the observed latencies (or the hedge delay while too few
+# latencies were observed). The circuit breaker opens after the given number of consecutive failed calls.
+DITM_MODEL_API_TIMEOUT_SECONDS = config(
+    "DITM_MODEL_API_TIMEOUT_SECONDS", default=60.0, cast=float
+)
+DITM_MODEL_API_HEDGE_PERCENTILE = config(
+    "DITM_MODEL_API_HEDGE_PERCENTILE", default=95.0, cast=float
+)
+DITM_MODEL_API_HEDGE_DELAY_SECONDS = config(
+    "DITM_MODEL_API_HEDGE_DELAY_SECONDS", default=10.0, cast=float
+)
+DITM_MODEL_API_BREAKER_FAILURES = config(
+    "DITM_MODEL_API_BREAKER_FAILURES", default=3, cast=int
+)
+DITM_MODEL_API_BREAKER_COOLDOWN_SECONDS = config(
+    "DITM_MODEL_API_BREAKER_COOLDOWN_SECONDS", default=300.0, cast=float
+)
+
+# The mode of the in-process baseline forecaster:
+# - "primary": predictions are made by the baseline forecaster only, the prediction model is not called.
+# - "fallback": the baseline forecaster is used when the prediction model is unavailable.
+# - "shadow": as fallback, additionally the baseline forecast is made for every run, compared with the
+#   prediction model and stored for auditing.
+BASELINE_FORECASTER_MODE = config(
+    "BASELINE_FORECASTER_MODE", default="fallback", cast=str
+)
+# Comma-delimited list of 'lag feature:weight' pairs blended by the baseline forecaster,
+# for example "lag_7_days:0.7,lag_1_year:0.3". If empty, the default weights are used.
+BASELINE_FORECAST_WEIGHTS = config("BASELINE_FORECAST_WEIGHTS", default="", cast=str)
+
+# How the memory usage of the pipeline stages is tracked: "off", "rss" (sampling the resident set size of the
+# worker) or "tracemalloc" (additionally tracing the peak of the python allocations, slower).
+MEMORY_TRACKING = config("MEMORY_TRACKING", default="rss", cast=str)
+# The memory budget of the worker in MiB, 0 to disable. Horizons whose memory usage, estimated from the memory
+# used per quarter-hour by the previous horizon, would exceed the budget are processed in chunks of
+# MEMORY_CHUNK_HOURS hours.
+MEMORY_BUDGET_MB = config("MEMORY_BUDGET_MB", default=0.0, cast=float)
+MEMORY_CHUNK_HOURS = config("MEMORY_CHUNK_HOURS", default=6, cast=int)
+# The conservative estimate of the memory used per quarter-hour in MiB, until a horizon has been processed.
+MEMORY_MB_PER_SLOT_ESTIMATE = config(
+    "MEMORY_MB_PER_SLOT_ESTIMATE", default=0.5, cast=float
+)
+
+# The maximum duration of a single run of the BL, propagated as deadline to the calls made during the run.
+RUN_DEADLINE_SECONDS = config("RUN_DEADLINE_SECONDS", default=240.0, cast=float)
+
+# The version of the deployed prediction model, part of the key under which its predictions are cached.
+DITM_MODEL_VERSION = config("DITM_MODEL_VERSION", default="latest", cast=str)
+
+# Either "infer" to make predictions using the prediction model (served from the inference cache when the
+# features were scored before), or "stored" to serve the predictions already stored in the predictions bucket.
+PREDICTION_MODE = config("PREDICTION_MODE", default="infer", cast=str)
+# The number of past days the forecast accuracy monitor summarizes when it has not summarized them yet.
+ACCURACY_BACKFILL_DAYS = config("ACCURACY_BACKFILL_DAYS", default=7, cast=int)
+
+# Comma-delimited list of the EAN numbers of the grid assets the BL generates events for.
+ASSET_EANS = config("ASSET_EANS", default=MOCK_EAN_NUMBER, cast=str)
+# Whether the daily run is fanned out over queued jobs of ASSET_JOB_BATCH_SIZE assets, which are processed by
+# the queue-triggered workers of all instances, instead of processing all assets in the timer invocation.
+FAN_OUT_ENABLED = config("FAN_OUT_ENABLED", default=False, cast=bool)
+ASSET_JOB_BATCH_SIZE = config("ASSET_JOB_BATCH_SIZE", default=1, cast=int)
+# The storage queue of the asset jobs, and the app setting holding the connection string of its storage account.
+ASSET_JOBS_QUEUE_NAME = config(
+    "ASSET_JOBS_QUEUE_NAME", default="bl-asset-jobs", cast=str
+)
+ASSET_JOBS_QUEUE_CONNECTION = "AzureWebJobsStorage"
+# The time after which an enqueued asset which did not finish is reported as a straggler.
+ASSET_JOB_STRAGGLER_MINUTES = config(
+    "ASSET_JOB_STRAGGLER_MINUTES", default=30, cast=int
+)
+
+# The number of worker processes the CPU-bound stages (feature assembly, event construction) are offloaded to.
+# 0 to run these stages on the event loop thread.
+CPU_POOL_WORKERS = config("CPU_POOL_WORKERS", default=0, cast=int)
+
+# The number of seconds a preview of the computed capacity limits is cached by the preview endpoint, and the
+# longest window (in days) a preview may be requested for.
+PREVIEW_CACHE_SECONDS = config("PREVIEW_CACHE_SECONDS", default=300, cast=int)
+PREVIEW_MAX_DAYS = config("PREVIEW_MAX_DAYS", default=7, cast=int)
+
 OAUTH_CLIENT_ID = config("OAUTH_CLIENT_ID")
 OAUTH_CLIENT_SECRET = config("OAUTH_CLIENT_SECRET")
 OAUTH_TOKEN_ENDPOINT = config("OAUTH_TOKEN_ENDPOINT")
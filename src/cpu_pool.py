@@ -0,0 +1,208 @@
+"""Process pool to which the CPU-bound stages of the BL are offloaded.
+
+Feature assembly and event construction hold the GIL. Run on the event loop thread, the stages
+of concurrently processed assets serialize behind each other and starve the I/O of the other
+assets. When CPU_POOL_WORKERS is set, these stages run in a pool of worker processes instead,
+so concurrently processed assets use all cores of the host.
+
+Stages receive their (large) numeric inputs as a dict of numpy arrays. When the stage runs in
+the pool, arrays larger than a threshold are passed through a single shared memory block instead
+of being pickled; the worker maps the block and reads the arrays in place.
+"""
+
+import asyncio
+import importlib
+import multiprocessing
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing.shared_memory import SharedMemory
+from threading import Lock
+from typing import Any
+
+import numpy as np
+
+from src.config import CPU_POOL_WORKERS
+from src.logger import logger
+
+# Inputs smaller than this are cheaper to pickle than to pass through shared memory.
+_SHARED_MEMORY_MIN_BYTES = 64 * 1024
+
+# Offsets of the arrays in the shared memory block are aligned to this number of bytes.
+_ALIGNMENT = 64
+
+# The name, dtype, shape and offset of every array in a shared memory block.
+type _ArrayLayout = list[tuple[str, str, tuple[int, ...], int]]
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = Lock()
+_pool_warmed_up = False
+
+
+def _get_pool() -> ProcessPoolExecutor | None:
+    """Retrieve the process pool, started on first use.
+
+    Returns:
+        ProcessPoolExecutor | None: The process pool. None if the stages run on the event loop thread.
+    """
+    global _pool
+
+    if CPU_POOL_WORKERS <= 0:
+        return None
+
+    with _pool_lock:
+        if _pool is None:
+            # Worker processes are spawned, forking the (multi-threaded) function host process is unsafe.
+            _pool = ProcessPoolExecutor(
+                max_workers=CPU_POOL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info("cpu_pool: Started a pool of %d processes", CPU_POOL_WORKERS)
+
+    return _pool
+
+
+def _copy_to_shared_memory(
+    arrays: dict[str, np.ndarray],
+) -> tuple[SharedMemory, _ArrayLayout]:
+    """Copy the arrays into a new shared memory block.
+
+    Args:
+        arrays (dict[str, np.ndarray]): The arrays to copy.
+
+    Returns:
+        tuple[SharedMemory, _ArrayLayout]: The shared memory block and the layout of the arrays in it.
+    """
+    layout: _ArrayLayout = []
+    size = 0
+    for name, array in arrays.items():
+        layout.append((name, array.dtype.str, array.shape, size))
+        size += -(-array.nbytes // _ALIGNMENT) * _ALIGNMENT
+
+    block = SharedMemory(create=True, size=max(size, 1))
+    for (name, dtype, shape, offset), array in zip(
+        layout, arrays.values(), strict=True
+    ):
+        np.ndarray(shape, dtype=dtype, buffer=block.buf, offset=offset)[...] = array
+
+    return block, layout
+
+
+@contextmanager
+def _attach_shared_memory(
+    block_name: str, layout: _ArrayLayout
+) -> Iterator[dict[str, np.ndarray]]:
+    """Map the arrays of a shared memory block, without copying them.
+
+    Args:
+        block_name (str): The name of the shared memory block.
+        layout (_ArrayLayout): The layout of the arrays in the block.
+
+    Returns:
+        Iterator[dict[str, np.ndarray]]: The (read-only) arrays, valid until the context exits.
+    """
+    block = SharedMemory(name=block_name)
+    arrays = {}
+    for name, dtype, shape, offset in layout:
+        array = np.ndarray(shape, dtype=dtype, buffer=block.buf, offset=offset)
+        array.flags.writeable = False
+        arrays[name] = array
+
+    try:
+        yield arrays
+    finally:
+        arrays.clear()
+        try:
+            block.close()
+        except BufferError:
+            # A stage kept a view of the block, it is unmapped once that view is garbage collected.
+            pass
+
+
+def _run_with_shared_memory[T](
+    func: Callable[..., T], block_name: str, layout: _ArrayLayout, args: tuple
+) -> T:
+    """Run a stage in a worker process on arrays passed through shared memory.
+
+    Args:
+        func (Callable[..., T]): The stage, called with the arrays followed by the arguments.
+        block_name (str): The name of the shared memory block.
+        layout (_ArrayLayout): The layout of the arrays in the block.
+        args (tuple): The other arguments of the stage.
+
+    Returns:
+        T: The result of the stage.
+    """
+    with _attach_shared_memory(block_name, layout) as arrays:
+        return func(arrays, *args)
+
+
+async def run_cpu_bound[T](
+    func: Callable[..., T], arrays: dict[str, np.ndarray], *args: Any
+) -> T:
+    """Run a CPU-bound stage, in the process pool if it is enabled.
+
+    The stage is called as func(arrays, *args). In the pool, func, the arguments and the result
+    are pickled, so they must be defined at module level. The arrays must not be modified by the stage.
+
+    Args:
+        func (Callable[..., T]): The stage.
+        arrays (dict[str, np.ndarray]): The numeric inputs of the stage.
+        *args (Any): The other arguments of the stage.
+
+    Returns:
+        T: The result of the stage.
+    """
+    pool = _get_pool()
+    if pool is None:
+        return func(arrays, *args)
+
+    loop = asyncio.get_running_loop()
+    if sum(array.nbytes for array in arrays.values()) < _SHARED_MEMORY_MIN_BYTES:
+        return await loop.run_in_executor(pool, func, arrays, *args)
+
+    block, layout = _copy_to_shared_memory(arrays)
+    try:
+        return await loop.run_in_executor(
+            pool, _run_with_shared_memory, func, block.name, layout, args
+        )
+    finally:
+        block.close()
+        block.unlink()
+
+
+def _import_modules(module_names: tuple[str, ...]) -> None:
+    """Import the given modules in a worker process.
+
+    Args:
+        module_names (tuple[str, ...]): The names of the modules to import.
+    """
+    for module_name in module_names:
+        importlib.import_module(module_name)
+
+
+async def warm_up_pool(module_names: tuple[str, ...]) -> None:
+    """Start the worker processes of the pool and import the modules of the stages in them.
+
+    Spawned workers start from a fresh interpreter, so without warming up, the first stages run
+    in the pool pay for starting the workers and importing the modules. Does nothing if the pool
+    is disabled or was warmed up before.
+
+    Args:
+        module_names (tuple[str, ...]): The names of the modules of the stages run in the pool.
+    """
+    global _pool_warmed_up
+
+    pool = _get_pool()
+    if pool is None or _pool_warmed_up:
+        return
+
+    # One task per worker, submitted at once, so the pool starts all of its workers.
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(
+        *(
+            loop.run_in_executor(pool, _import_modules, module_names)
+            for _ in range(CPU_POOL_WORKERS)
+        )
+    )
+    _pool_warmed_up = True
@@ -53,4 +53,5 @@ class _BearerAuthenticatedSession(Session):
                     audience=None,
                 )
             )
+        self.token_manager = token_manager
         self.auth = _BearerAuth(token_manager)
@@ -0,0 +1,46 @@
+"""Module containing the deadline of the current run, propagated from the function invocation."""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_run_deadline: ContextVar[float | None] = ContextVar("run_deadline", default=None)
+
+
+@contextmanager
+def run_deadline(seconds: float) -> Iterator[None]:
+    """Set the deadline of the run for the duration of the context.
+
+    The deadline is stored in a context variable, so it is visible to all (async) calls made
+    within the context. Nested deadlines can only shorten the deadline of the run.
+
+    Args:
+        seconds (float): The number of seconds from now in which the run must be done.
+    """
+    deadline = time.monotonic() + seconds
+    current_deadline = _run_deadline.get()
+    if current_deadline is not None:
+        deadline = min(deadline, current_deadline)
+
+    token = _run_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _run_deadline.reset(token)
+
+
+def remaining_seconds(default: float) -> float:
+    """Retrieve the number of seconds left until the deadline of the run.
+
+    Args:
+        default (float): The number of seconds to return when no deadline is set.
+
+    Returns:
+        float: The seconds left until the deadline, at most the default. Zero if the deadline passed.
+    """
+    deadline = _run_deadline.get()
+    if deadline is None:
+        return default
+
+    return max(0.0, min(default, deadline - time.monotonic()))
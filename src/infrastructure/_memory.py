@@ -0,0 +1,214 @@
+"""Module containing the memory tracking of the pipeline stages and the memory budget of the BL.
+
+Every stage (feature generation, inference, audit, publish) is tracked by sampling the resident
+set size (RSS) of the worker process while the stage runs. Optionally, the peak of the memory
+allocated by python is traced with tracemalloc as well, which is more precise but slows down
+the stage.
+"""
+
+import os
+import resource
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from threading import Lock
+
+from src.config import MEMORY_BUDGET_MB, MEMORY_MB_PER_SLOT_ESTIMATE, MEMORY_TRACKING
+from src.logger import logger
+
+_MB = 1024 * 1024
+
+
+def _current_rss_bytes() -> int:
+    """Retrieve the current resident set size of the worker process.
+
+    Returns:
+        int: The resident set size in bytes.
+    """
+    try:
+        with open("/proc/self/statm", "rb") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # No procfs available, fall back to the peak resident set size of the process (in KiB on Linux).
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+@dataclass
+class StageMetrics:
+    """Duration and memory usage of a single pipeline stage."""
+
+    stage: str
+    seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    rss_start_mb: float = 0.0
+    rss_peak_mb: float = 0.0
+    traced_peak_mb: float | None = None
+
+
+class _RssSampler(threading.Thread):
+    """Thread sampling the peak resident set size of the process until it is stopped."""
+
+    def __init__(self, interval_seconds: float) -> None:
+        super().__init__(name="rss-sampler", daemon=True)
+        self._interval_seconds = interval_seconds
+        self._stopped = threading.Event()
+        self.peak_bytes = _current_rss_bytes()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self._interval_seconds):
+            self.peak_bytes = max(self.peak_bytes, _current_rss_bytes())
+
+    def stop(self) -> int:
+        self._stopped.set()
+        self.join()
+        self.peak_bytes = max(self.peak_bytes, _current_rss_bytes())
+        return self.peak_bytes
+
+
+class MemoryBudget:
+    """The memory budget of the worker process.
+
+    Before a horizon is processed, its memory usage is estimated from the memory used per
+    quarter-hour slot by the previously processed horizon, or from a conservative estimate until
+    a horizon has been processed. Horizons whose estimate exceeds the budget are processed in
+    chunks to lower the peak memory usage of the BL.
+    """
+
+    def __init__(self, limit_mb: float, mb_per_slot_estimate: float) -> None:
+        """Initializes the memory budget.
+
+        Args:
+            limit_mb (float): The memory budget in MiB. 0 to disable the budget.
+            mb_per_slot_estimate (float): The estimated memory usage per quarter-hour slot in MiB, until a
+                horizon has been recorded.
+        """
+        self.limit_mb = limit_mb
+        self._lock = Lock()
+        self._mb_per_slot = mb_per_slot_estimate
+
+    def record(self, metrics: StageMetrics) -> None:
+        """Record the memory usage of a stage.
+
+        Args:
+            metrics (StageMetrics): The metrics of the stage.
+        """
+        if not self.limit_mb or metrics.rss_peak_mb <= self.limit_mb:
+            return
+
+        logger.warning(
+            "MemoryBudget: Stage %s peaked at %.1f MiB, exceeding the budget of %.1f MiB.",
+            metrics.stage,
+            metrics.rss_peak_mb,
+            self.limit_mb,
+        )
+
+    def record_horizon(self, slot_count: int, stages: list[StageMetrics]) -> None:
+        """Record the memory used by the stages which processed a horizon, to estimate the next horizons.
+
+        Args:
+            slot_count (int): The number of quarter-hour slots of the horizon.
+            stages (list[StageMetrics]): The metrics of the stages which processed the horizon.
+        """
+        used_mb = max((m.rss_peak_mb - m.rss_start_mb for m in stages), default=0.0)
+
+        if slot_count and used_mb > 0:
+            with self._lock:
+                self._mb_per_slot = used_mb / slot_count
+
+    def fits(self, slot_count: int) -> bool:
+        """Estimate whether a horizon can be processed at once within the memory budget.
+
+        Args:
+            slot_count (int): The number of quarter-hour slots of the horizon.
+
+        Returns:
+            bool: Whether the current memory usage plus the estimated memory usage of the horizon stays within
+                the budget. Always True if the budget is disabled.
+        """
+        if not self.limit_mb:
+            return True
+
+        with self._lock:
+            estimated_mb = self._mb_per_slot * slot_count
+
+        return _current_rss_bytes() / _MB + estimated_mb <= self.limit_mb
+
+
+memory_budget = MemoryBudget(
+    limit_mb=MEMORY_BUDGET_MB, mb_per_slot_estimate=MEMORY_MB_PER_SLOT_ESTIMATE
+)
+
+# Callbacks receiving the metrics of every stage which finishes, see collect_stage_metrics.
+_stage_listeners: list[Callable[[StageMetrics], None]] = []
+
+
+@contextmanager
+def collect_stage_metrics() -> Iterator[list[StageMetrics]]:
+    """Collect the metrics of the stages which finish while the context is active.
+
+    Returns:
+        Iterator[list[StageMetrics]]: The metrics of the finished stages, in the order the stages finished.
+    """
+    collected: list[StageMetrics] = []
+    _stage_listeners.append(collected.append)
+
+    try:
+        yield collected
+    finally:
+        _stage_listeners.remove(collected.append)
+
+
+@contextmanager
+def track_stage(
+    stage: str, sample_interval_seconds: float = 0.02
+) -> Iterator[StageMetrics]:
+    """Track the duration, CPU time and (peak) memory usage of a pipeline stage.
+
+    The CPU time is the CPU time of the whole process, so it includes the CPU time of stages which run
+    concurrently (for example the stages of other assets). The metrics are logged and recorded against the memory budget when the stage finishes.
+
+    Args:
+        stage (str): The name of the stage.
+        sample_interval_seconds (float): The interval at which the resident set size is sampled. Defaults to 20 ms.
+
+    Returns:
+        Iterator[StageMetrics]: The metrics of the stage, filled in when the stage finishes.
+    """
+    metrics = StageMetrics(stage=stage)
+
+    if MEMORY_TRACKING == "off":
+        yield metrics
+        return
+
+    trace = MEMORY_TRACKING == "tracemalloc"
+    started_tracing = trace and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    elif trace:
+        tracemalloc.reset_peak()
+
+    sampler = _RssSampler(sample_interval_seconds)
+    metrics.rss_start_mb = sampler.peak_bytes / _MB
+    sampler.start()
+    started_at = time.perf_counter()
+    cpu_started_at = time.process_time()
+
+    try:
+        yield metrics
+    finally:
+        metrics.seconds = time.perf_counter() - started_at
+        metrics.cpu_seconds = time.process_time() - cpu_started_at
+        metrics.rss_peak_mb = sampler.stop() / _MB
+
+        if trace:
+            metrics.traced_peak_mb = tracemalloc.get_traced_memory()[1] / _MB
+            if started_tracing:
+                tracemalloc.stop()
+
+        logger.info("Stage metrics: %s", asdict(metrics))
+        memory_budget.record(metrics)
+        for listener in _stage_listeners:
+            listener(metrics)
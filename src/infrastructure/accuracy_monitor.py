@@ -0,0 +1,163 @@
+"""Module containing the monitor of the accuracy of the audited predictions against the measured load.
+
+Every run summarizes the days which completed since the last summarized day into a single point
+per day and forecaster (MAE, MAPE, peak error and capacity violations), so the accuracy over any
+period is a cheap query over the summaries instead of a scan of the full prediction history.
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from influxdb_client.client.influxdb_client_async import InfluxDBClientAsync
+
+from src.config import ACCURACY_BACKFILL_DAYS, MAX_CAPACITY
+from src.infrastructure.influxdb.dalidata.query_dali_data import (
+    retrieve_dali_daily_aggregates_between,
+)
+from src.infrastructure.influxdb.forecast_accuracy import (
+    retrieve_last_accuracy_day,
+    retrieve_predicted_and_measured_load,
+    store_forecast_accuracy,
+)
+from src.logger import logger
+
+# The measurements the predictions are audited in, by the forecaster which made them.
+AUDITED_FORECASTERS = {"model": "predictions", "baseline": "baseline_predictions"}
+
+_ONE_DAY = pd.Timedelta(days=1)
+_QUARTER_HOURS_PER_DAY = 96
+
+
+def compute_forecast_accuracy(
+    predicted_loads: np.ndarray, measured_loads: np.ndarray, max_capacity: float
+) -> dict[str, float]:
+    """Compute the accuracy of the predicted loads against the measured loads of the same quarter-hours.
+
+    Args:
+        predicted_loads (np.ndarray): The predicted loads.
+        measured_loads (np.ndarray): The measured loads, aligned with the predicted loads.
+        max_capacity (float): The maximum capacity allowed for the grid asset.
+
+    Returns:
+        dict[str, float]: The number of compared quarter-hours ("count"), the mean absolute error ("mae_kw"),
+            the mean absolute percentage error over the quarter-hours with a non-zero measured load
+            ("mape_pct", left out if there are none), the error of the predicted daily peak ("peak_error_kw")
+            and the number of quarter-hours the measured load exceeded the maximum capacity ("violations"),
+            of which the predicted load did not ("missed_violations"), and the number of quarter-hours only the
+            predicted load exceeded it ("false_alarms").
+    """
+    errors = predicted_loads - measured_loads
+    predicted_violations = predicted_loads > max_capacity
+    measured_violations = measured_loads > max_capacity
+
+    accuracy = {
+        "count": len(errors),
+        "mae_kw": float(np.abs(errors).mean()),
+        "peak_error_kw": float(predicted_loads.max() - measured_loads.max()),
+        "violations": int(measured_violations.sum()),
+        "missed_violations": int((measured_violations & ~predicted_violations).sum()),
+        "false_alarms": int((predicted_violations & ~measured_violations).sum()),
+    }
+
+    non_zero = measured_loads != 0
+    if non_zero.any():
+        accuracy["mape_pct"] = float(
+            np.abs(errors[non_zero] / measured_loads[non_zero]).mean() * 100
+        )
+
+    return accuracy
+
+
+async def monitor_forecast_accuracy(
+    client: InfluxDBClientAsync, asset_id: str, until: datetime
+) -> int:
+    """Summarize the accuracy of the audited predictions of the days completed since the last summarized day.
+
+    At most the last ACCURACY_BACKFILL_DAYS days are summarized. Days without audited predictions are summarized
+    with a count of 0, so later runs do not retrieve them again. The summarizing stops at the first day of which the dalidata is incomplete, which is summarized by a later
+    run once its dalidata arrived.
+
+    Args:
+        client (InfluxDBClientAsync): The influx DB client.
+        asset_id (str): The EAN number of the asset the predictions were made for.
+        until (datetime): The time up to which (complete, UTC) days are summarized.
+
+    Returns:
+        int: The number of days which were summarized.
+    """
+    query_api = client.query_api()
+    last_day = pd.Timestamp(until).tz_convert("UTC").floor("D")
+    first_day = last_day - ACCURACY_BACKFILL_DAYS * _ONE_DAY
+
+    last_summarized_day = await retrieve_last_accuracy_day(
+        query_api, asset_id, since=first_day.to_pydatetime()
+    )
+    if last_summarized_day is not None:
+        first_day = max(first_day, pd.Timestamp(last_summarized_day) + _ONE_DAY)
+
+    if first_day >= last_day:
+        return 0
+
+    # Only the (server-side aggregated) number of measurements per day is retrieved to find the days with
+    # complete dalidata. The aggregates are timestamped with the end of their day.
+    aggregates = await retrieve_dali_daily_aggregates_between(
+        query_api=query_api,
+        start_date_inclusive=first_day.to_pydatetime(),
+        end_date_inclusive=last_day.to_pydatetime(),
+    )
+    measured_days = pd.Series(
+        aggregates.values["count"],
+        index=pd.to_datetime(aggregates.timestamps, unit="ns", utc=True) - _ONE_DAY,
+    )
+
+    write_api = client.write_api()
+    summarized_days = 0
+
+    for day_start in pd.date_range(first_day, last_day, freq="1D", inclusive="left"):
+        # A day is complete once all its quarter-hours were measured, or the dalidata of a later day arrived.
+        if not (
+            measured_days.get(day_start, 0) >= _QUARTER_HOURS_PER_DAY
+            or (measured_days.index > day_start).any()
+        ):
+            break
+
+        day_accuracies: dict[str, dict[str, float]] = {}
+
+        for forecaster, measurement_name in AUDITED_FORECASTERS.items():
+            loads = await retrieve_predicted_and_measured_load(
+                query_api,
+                measurement_name,
+                from_date=day_start.to_pydatetime(),
+                to_date=(day_start + _ONE_DAY).to_pydatetime(),
+            )
+            if len(loads):
+                day_accuracies[forecaster] = compute_forecast_accuracy(
+                    loads.values["_value_predicted"],
+                    loads.values["_value_measured"],
+                    MAX_CAPACITY,
+                )
+
+        if not day_accuracies:
+            logger.info(
+                "Accuracy monitor: No audited predictions on %s, storing an empty summary.",
+                day_start.date(),
+            )
+            day_accuracies = {
+                forecaster: {"count": 0} for forecaster in AUDITED_FORECASTERS
+            }
+
+        for forecaster, accuracy in day_accuracies.items():
+            await store_forecast_accuracy(
+                write_api, asset_id, forecaster, day_start.to_pydatetime(), accuracy
+            )
+            logger.info(
+                "Accuracy monitor: %s forecast of %s on %s: %s",
+                forecaster,
+                asset_id,
+                day_start.date(),
+                accuracy,
+            )
+        summarized_days += 1
+
+    return summarized_days
@@ -0,0 +1,78 @@
+"""Module which implements the tracking of the asset jobs of fanned out runs."""
+
+from datetime import UTC, datetime
+
+from influxdb_client.client.influxdb_client_async import InfluxDBClientAsync
+
+from src.application.fan_out import AssetJob, JobTrackerBase
+from src.infrastructure.influxdb.asset_job_states import (
+    AssetJobState,
+    retrieve_unfinished_assets,
+    store_asset_job_states,
+)
+
+
+class AssetJobTrackerInfluxDB(JobTrackerBase):
+    """Implementation of the job tracker using influxDB.
+
+    The state of every asset is written to the audit bucket, so workers on every instance of the
+    function app record the state of their assets in the same place.
+    """
+
+    def __init__(self, client: InfluxDBClientAsync) -> None:
+        """Initializes the AssetJobTrackerInfluxDB.
+
+        Args:
+            client (InfluxDBClient): The influx DB client to use for the tracking.
+        """
+        self.client = client
+
+    async def record_enqueued(self, jobs: list[AssetJob]) -> None:
+        """Record that the assets of the given jobs were enqueued.
+
+        Args:
+            jobs (list[AssetJob]): The enqueued jobs.
+        """
+        enqueued_at = datetime.now(tz=UTC)
+        for job in jobs:
+            await store_asset_job_states(
+                self.client.write_api(),
+                run_id=job.run_id,
+                asset_ids=list(job.asset_ids),
+                state=AssetJobState.ENQUEUED,
+                time=enqueued_at,
+            )
+
+    async def record_finished(
+        self, run_id: str, asset_id: str, succeeded: bool
+    ) -> None:
+        """Record that an asset of a run finished.
+
+        Args:
+            run_id (str): The identifier of the run.
+            asset_id (str): The EAN number of the asset.
+            succeeded (bool): Whether the events of the asset were published.
+        """
+        await store_asset_job_states(
+            self.client.write_api(),
+            run_id=run_id,
+            asset_ids=[asset_id],
+            state=AssetJobState.SUCCEEDED if succeeded else AssetJobState.FAILED,
+            time=datetime.now(tz=UTC),
+        )
+
+    async def get_stragglers(
+        self, enqueued_after: datetime, enqueued_before: datetime
+    ) -> dict[str, list[str]]:
+        """Retrieve the assets which were enqueued in the given period, but did not finish successfully.
+
+        Args:
+            enqueued_after (datetime): The start (inclusive) of the period the assets were enqueued in.
+            enqueued_before (datetime): The end (exclusive) of the period the assets were enqueued in.
+
+        Returns:
+            dict[str, list[str]]: The EAN numbers of the unfinished or failed assets per run.
+        """
+        return await retrieve_unfinished_assets(
+            self.client.query_api(), enqueued_after, enqueued_before
+        )
@@ -0,0 +1,127 @@
+"""Module containing an in-process baseline forecaster based on the lag features.
+
+The baseline predicts the load of a quarter-hour as a weighted blend of the loads at the same
+quarter-hour on the previous days and the previous year. Lags which are not available (for
+example lags falling inside the forecast horizon) are left out of the blend, the weights of the
+available lags are renormalized per row.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.config import BASELINE_FORECAST_WEIGHTS
+from src.infrastructure.azureml.predictions import _to_predicted_grid_asset_loads
+from src.logger import logger
+from src.models.predicted_load import PredictedGridAssetLoad
+
+_DEFAULT_LAG_WEIGHTS = {
+    "lag_1_days": 0.15,
+    "lag_2_days": 0.05,
+    "lag_3_days": 0.05,
+    "lag_4_days": 0.05,
+    "lag_5_days": 0.05,
+    "lag_6_days": 0.05,
+    "lag_7_days": 0.45,
+    "lag_1_year": 0.15,
+}
+
+
+def _parse_lag_weights(weights: str) -> dict[str, float]:
+    """Parse the configured lag weights of the baseline forecaster.
+
+    Args:
+        weights (str): Comma-delimited list of 'lag feature:weight' pairs. If empty, the default weights are used.
+
+    Returns:
+        dict[str, float]: The weight of each lag feature.
+    """
+    if not weights.strip():
+        return _DEFAULT_LAG_WEIGHTS
+
+    parsed_weights: dict[str, float] = {}
+    for pair in weights.split(","):
+        feature, _, weight = pair.partition(":")
+        if not feature.strip() or not weight.strip():
+            msg = f"Invalid baseline forecast weight '{pair}', expected 'lag feature:weight'"
+            raise ValueError(msg)
+        parsed_weights[feature.strip()] = float(weight)
+
+    return parsed_weights
+
+
+_lag_weights = _parse_lag_weights(BASELINE_FORECAST_WEIGHTS)
+
+
+def blend_lag_features(
+    features: pd.DataFrame, lag_weights: dict[str, float] | None = None
+) -> np.ndarray:
+    """Calculate the weighted blend of the lag features of every row.
+
+    Args:
+        features (pd.DataFrame): The features to make prediction(s) for.
+        lag_weights (dict[str, float] | None): The weight of each lag feature. If None, the configured weights are used.
+
+    Returns:
+        np.ndarray: The blended load of every row. Zero where none of the lags is available.
+    """
+    lag_weights = lag_weights or _lag_weights
+    lags = features[list(lag_weights)].to_numpy(dtype=np.float64)
+    weights = np.fromiter(lag_weights.values(), dtype=np.float64)
+
+    available_weights = np.where(np.isnan(lags), 0.0, weights)
+    total_weights = available_weights.sum(axis=1)
+
+    return np.divide(
+        (np.nan_to_num(lags) * available_weights).sum(axis=1),
+        total_weights,
+        out=np.zeros(len(lags)),
+        where=total_weights > 0,
+    )
+
+
+def get_baseline_predictions_for_features(
+    features: pd.DataFrame,
+) -> list[PredictedGridAssetLoad]:
+    """Get baseline transformer load predictions for the features, without calling the prediction model.
+
+    Args:
+        features (pd.DataFrame): The features to make prediction(s) for.
+
+    Returns:
+        list[TransformerLoad]: The list of transformer load predictions
+    """
+    return _to_predicted_grid_asset_loads(
+        features, blend_lag_features(features).tolist(), forecaster="baseline"
+    )
+
+
+def log_forecast_comparison(
+    model_loads: list[PredictedGridAssetLoad],
+    model_seconds: float,
+    baseline_loads: list[PredictedGridAssetLoad],
+    baseline_seconds: float,
+) -> dict[str, float]:
+    """Compare the forecast of the prediction model with the baseline forecast and log the comparison.
+
+    Args:
+        model_loads (list[PredictedGridAssetLoad]): The predictions of the prediction model.
+        model_seconds (float): The number of seconds the prediction model took.
+        baseline_loads (list[PredictedGridAssetLoad]): The predictions of the baseline forecaster.
+        baseline_seconds (float): The number of seconds the baseline forecaster took.
+
+    Returns:
+        dict[str, float]: The comparison metrics.
+    """
+    model = np.fromiter((load.load for load in model_loads), dtype=np.float64)
+    baseline = np.fromiter((load.load for load in baseline_loads), dtype=np.float64)
+    absolute_difference = np.abs(model - baseline) if len(model) else np.zeros(1)
+
+    comparison = {
+        "mean_absolute_difference": float(absolute_difference.mean()),
+        "max_absolute_difference": float(absolute_difference.max()),
+        "mean_difference": float((model - baseline).mean()) if len(model) else 0.0,
+        "model_seconds": model_seconds,
+        "baseline_seconds": baseline_seconds,
+    }
+    logger.info("Baseline forecaster: Comparison with prediction model %s", comparison)
+    return comparison
@@ -0,0 +1,280 @@
+"""Module containing the tail-latency controls of calls to the prediction model endpoint.
+
+Calls are bounded by the deadline of the run, hedged with a duplicate request when the first
+request is slower than the usual latency of the endpoint, and guarded by a circuit breaker which
+fails fast while the endpoint is unhealthy.
+"""
+
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import asdict, dataclass
+from enum import StrEnum
+from threading import Lock
+
+import numpy as np
+
+from src.infrastructure._deadline import remaining_seconds
+from src.logger import logger
+
+
+class ModelEndpointUnavailableError(Exception):
+    """Raised when the prediction model endpoint could not produce predictions in time."""
+
+
+class CircuitState(StrEnum):
+    """The states of the circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass
+class EndpointMetrics:
+    """Counters of the calls to the prediction model endpoint."""
+
+    calls: int = 0
+    requests: int = 0
+    hedges_fired: int = 0
+    hedges_won: int = 0
+    timeouts: int = 0
+    failures: int = 0
+    short_circuited: int = 0
+    breaker_opened: int = 0
+    breaker_state: str = CircuitState.CLOSED.value
+
+
+class CircuitBreaker:
+    """Circuit breaker which opens after consecutive failed calls.
+
+    While open, calls fail fast. After the cooldown a single trial call is let through
+    (half-open), which closes the breaker on success and re-opens it on failure.
+    """
+
+    def __init__(self, failure_threshold: int, cooldown_seconds: float) -> None:
+        """Initializes the circuit breaker.
+
+        Args:
+            failure_threshold (int): The number of consecutive failed calls after which the breaker opens.
+            cooldown_seconds (float): The number of seconds the breaker stays open.
+        """
+        self._failure_threshold = failure_threshold
+        self._cooldown_seconds = cooldown_seconds
+        self._lock = Lock()
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+
+    @property
+    def state(self) -> CircuitState:
+        """The current state of the circuit breaker."""
+        return self._state
+
+    def allow_call(self) -> bool:
+        """Check whether a call may be made.
+
+        Returns:
+            bool: Whether the call may be made.
+        """
+        with self._lock:
+            if self._state == CircuitState.CLOSED:
+                return True
+
+            if (
+                self._state == CircuitState.OPEN
+                and time.monotonic() - self._opened_at >= self._cooldown_seconds
+            ):
+                self._state = CircuitState.HALF_OPEN
+                return True
+
+            # Open, or half-open with the trial call still in flight.
+            return False
+
+    def record_success(self) -> None:
+        """Record a successful call."""
+        with self._lock:
+            self._state = CircuitState.CLOSED
+            self._consecutive_failures = 0
+
+    def record_failure(self) -> bool:
+        """Record a failed call.
+
+        Returns:
+            bool: Whether the breaker opened because of this failure.
+        """
+        with self._lock:
+            self._consecutive_failures += 1
+
+            if self._state == CircuitState.HALF_OPEN or (
+                self._state == CircuitState.CLOSED
+                and self._consecutive_failures >= self._failure_threshold
+            ):
+                self._state = CircuitState.OPEN
+                self._opened_at = time.monotonic()
+                return True
+
+            return False
+
+
+class HedgedEndpointCaller:
+    """Caller of the prediction model endpoint with deadlines, hedged requests and a circuit breaker."""
+
+    def __init__(
+        self,
+        request_timeout_seconds: float,
+        hedge_percentile: float,
+        hedge_delay_seconds: float,
+        breaker: CircuitBreaker,
+        min_latency_samples: int = 20,
+        max_latency_samples: int = 200,
+    ) -> None:
+        """Initializes the hedged endpoint caller.
+
+        Args:
+            request_timeout_seconds (float): The maximum duration of a single call, shortened to the deadline of the run.
+            hedge_percentile (float): The latency percentile after which a duplicate request is sent.
+            hedge_delay_seconds (float): The delay after which a duplicate request is sent while too few
+                latencies were observed to calculate the percentile.
+            breaker (CircuitBreaker): The circuit breaker guarding the endpoint.
+            min_latency_samples (int): The number of latencies needed to calculate the percentile. Defaults to 20.
+            max_latency_samples (int): The number of most recent latencies to keep. Defaults to 200.
+        """
+        self._request_timeout_seconds = request_timeout_seconds
+        self._hedge_percentile = hedge_percentile
+        self._hedge_delay_seconds = hedge_delay_seconds
+        self._breaker = breaker
+        self._min_latency_samples = min_latency_samples
+        self._lock = Lock()
+        self._latencies: deque[float] = deque(maxlen=max_latency_samples)
+        self._metrics = EndpointMetrics()
+        # Losing requests are not awaited, so the executor is shared between calls.
+        self._executor = ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="model-endpoint"
+        )
+
+    def metrics(self) -> EndpointMetrics:
+        """Retrieve a snapshot of the metrics of the endpoint calls.
+
+        Returns:
+            EndpointMetrics: The metrics.
+        """
+        with self._lock:
+            return EndpointMetrics(
+                **(asdict(self._metrics) | {"breaker_state": self._breaker.state.value})
+            )
+
+    def _count(self, metric: str) -> None:
+        with self._lock:
+            setattr(self._metrics, metric, getattr(self._metrics, metric) + 1)
+
+    def _hedge_delay(self) -> float:
+        with self._lock:
+            if len(self._latencies) < self._min_latency_samples:
+                return self._hedge_delay_seconds
+            return float(np.percentile(self._latencies, self._hedge_percentile))
+
+    def _timed_request[T](
+        self, request: Callable[[float], T], timeout: float
+    ) -> tuple[T, float]:
+        started_at = time.monotonic()
+        result = request(timeout)
+        return result, time.monotonic() - started_at
+
+    def call[T](self, request: Callable[[float], T]) -> T:
+        """Call the endpoint, hedging the request when it is slower than usual.
+
+        Args:
+            request (Callable[[float], T]): Function making a single request to the endpoint with
+                the given timeout in seconds.
+
+        Returns:
+            T: The result of the first request which succeeded.
+        """
+        self._count("calls")
+
+        # The deadline is checked before the breaker, so a half-open breaker only lets a trial call through
+        # which is actually made. The exhausted deadline of the run is not a failure of the endpoint.
+        timeout = remaining_seconds(default=self._request_timeout_seconds)
+        if timeout <= 0:
+            self._count("timeouts")
+            msg = (
+                "The deadline of the run passed before the prediction model was called"
+            )
+            raise ModelEndpointUnavailableError(msg)
+
+        if not self._breaker.allow_call():
+            self._count("short_circuited")
+            msg = "The circuit breaker of the prediction model endpoint is open"
+            raise ModelEndpointUnavailableError(msg)
+
+        deadline = time.monotonic() + timeout
+
+        try:
+            result = self._call_hedged(request, timeout, deadline)
+        except Exception as exc:
+            self._count("failures")
+            if self._breaker.record_failure():
+                self._count("breaker_opened")
+                logger.warning(
+                    "HedgedEndpointCaller: Circuit breaker opened after failed call."
+                )
+            raise ModelEndpointUnavailableError(str(exc)) from exc
+        else:
+            self._breaker.record_success()
+            return result
+        finally:
+            logger.info("HedgedEndpointCaller: Metrics %s", asdict(self.metrics()))
+
+    def _call_hedged[T](
+        self, request: Callable[[float], T], timeout: float, deadline: float
+    ) -> T:
+        self._count("requests")
+        primary = self._executor.submit(self._timed_request, request, timeout)
+        pending: set[Future] = {primary}
+        errors: list[BaseException] = []
+
+        done, _ = wait(pending, timeout=min(self._hedge_delay(), timeout))
+        if not done:
+            hedge_timeout = deadline - time.monotonic()
+            if hedge_timeout > 0:
+                self._count("hedges_fired")
+                self._count("requests")
+                pending.add(
+                    self._executor.submit(self._timed_request, request, hedge_timeout)
+                )
+
+        while pending:
+            done, pending = wait(
+                pending,
+                timeout=max(0.0, deadline - time.monotonic()),
+                return_when=FIRST_COMPLETED,
+            )
+            if not done:
+                break
+
+            for future in done:
+                error = future.exception()
+                if error is not None:
+                    errors.append(error)
+                    continue
+
+                result, latency = future.result()
+                with self._lock:
+                    self._latencies.append(latency)
+                if future is not primary:
+                    self._count("hedges_won")
+                return result
+
+        if errors and not pending:
+            raise errors[-1]
+
+        self._count("timeouts")
+        msg = f"The prediction model endpoint did not respond within {timeout:.1f} seconds"
+        raise TimeoutError(msg)
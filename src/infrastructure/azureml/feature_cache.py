@@ -0,0 +1,86 @@
+"""Module containing an in-process cache for the features of a forecast horizon."""
+
+from datetime import datetime
+from threading import Lock
+
+import pandas as pd
+
+
+class HorizonFeatureCache:
+    """In-process cache of the model features computed for a forecast horizon.
+
+    The worker process of the function app is reused between invocations, so the features
+    computed by the day-ahead run can be reused by the intraday runs over the same horizon.
+    """
+
+    def __init__(self, max_horizons: int = 2) -> None:
+        """Initializes the horizon feature cache.
+
+        Args:
+            max_horizons (int): The maximum number of horizons to keep in the cache. Defaults to 2.
+        """
+        self._max_horizons = max_horizons
+        self._lock = Lock()
+        self._features: dict[tuple[str, datetime, datetime], pd.DataFrame] = {}
+
+    def get(
+        self, asset_id: str, horizon_start: datetime, horizon_end: datetime
+    ) -> pd.DataFrame | None:
+        """Retrieve the cached features of the given asset and horizon.
+
+        If the horizon itself is not cached, the features are served from a cached horizon which
+        covers it, limited to the slots of the given horizon. The day-ahead run caches the features
+        of all days of its horizon at once, while the intraday runs look up the horizon of a single
+        event.
+
+        Args:
+            asset_id (str): The EAN number of the grid asset.
+            horizon_start (datetime): The start of the horizon (inclusive).
+            horizon_end (datetime): The end of the horizon (exclusive).
+
+        Returns:
+            pd.DataFrame | None: The cached features. None if no cached horizon of the asset covers the horizon.
+        """
+        with self._lock:
+            features = self._features.get((asset_id, horizon_start, horizon_end))
+            if features is not None:
+                return features
+
+            for (
+                cached_asset_id,
+                cached_start,
+                cached_end,
+            ), cached_features in self._features.items():
+                if (
+                    cached_asset_id == asset_id
+                    and cached_start <= horizon_start
+                    and horizon_end <= cached_end
+                ):
+                    in_horizon = (cached_features["datetime"] >= horizon_start) & (
+                        cached_features["datetime"] < horizon_end
+                    )
+                    return cached_features[in_horizon].reset_index(drop=True)
+
+        return None
+
+    def put(
+        self,
+        asset_id: str,
+        horizon_start: datetime,
+        horizon_end: datetime,
+        features: pd.DataFrame,
+    ) -> None:
+        """Store the features of the given asset and horizon, evicting the oldest horizon if the cache is full.
+
+        Args:
+            asset_id (str): The EAN number of the grid asset.
+            horizon_start (datetime): The start of the horizon (inclusive).
+            horizon_end (datetime): The end of the horizon (exclusive).
+            features (pd.DataFrame): The features of the horizon.
+        """
+        key = (asset_id, horizon_start, horizon_end)
+        with self._lock:
+            self._features.pop(key, None)
+            while len(self._features) >= self._max_horizons:
+                del self._features[next(iter(self._features))]
+            self._features[key] = features
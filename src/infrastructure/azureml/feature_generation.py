@@ -1,21 +1,63 @@
-from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
+import hashlib
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from functools import cache
 
 import holidays
+import numpy as np
 import pandas as pd
 
 from influxdb_client.client.query_api_async import QueryApiAsync
+from src.config import (
+    DALI_ROLLUPS_ENABLED,
+    FEATURE_STORE_ENABLED,
+    MOCK_EAN_NUMBER,
+    STANDARD_PROFILE_WEIGHTS,
+    WEATHER_ARCHIVE_INFLUX_MIRROR,
+)
+from src.cpu_pool import run_cpu_bound
+from src.infrastructure.azureml.feature_cache import HorizonFeatureCache
+from src.infrastructure.azureml.forecast_grid import ForecastGrid
+from src.infrastructure.influxdb._client import get_db_client
+from src.infrastructure.influxdb._streaming import TimeSeriesColumns
 from src.infrastructure.influxdb.dalidata.query_dali_data import (
+    retrieve_dali_daily_aggregates_between,
     retrieve_dali_data_between,
 )
+from src.infrastructure.local_store._columnar import frame_content_hash
+from src.infrastructure.local_store.dali_rollups import dali_rollup_store
+from src.infrastructure.local_store.feature_store import feature_store
+from src.infrastructure.influxdb.weather_forecast_snapshots import (
+    store_weather_forecast_snapshot,
+)
+from src.infrastructure.local_store.profile_store import standard_profile_store
 from src.infrastructure.weather_data.weather_forecast import WeatherForecastData
+from src.logger import logger
+
+# Version of the feature assembly logic. Bump this whenever the assembled features change,
+# so features stored by a previous version are no longer served from the feature store.
+FEATURE_VERSION = "4"
+
+# The lag features and how far back they look from the predicted datetime.
+_LAG_OFFSETS = {
+    "lag_1_year": pd.DateOffset(years=1),
+    **{f"lag_{days}_days": pd.DateOffset(days=days) for days in range(1, 8)},
+}
 
+# The lags whose missing measurements are filled with the hourly mean load of the dalidata rollups.
+_ROLLUP_FALLBACK_LAGS = ("lag_1_year",)
 
-def _get_weather_features_for_dates(
+# Features of the most recently computed horizons, reused by the intraday runs.
+horizon_feature_cache = HorizonFeatureCache()
+
+
+async def _get_weather_features_for_dates(
     start_date_inclusive: datetime, end_date_inclusive: datetime
 ) -> pd.DataFrame:
     """Get weather features for each date between the given datetime range.
 
+    Newly archived forecasts are mirrored to InfluxDB if WEATHER_ARCHIVE_INFLUX_MIRROR is enabled.
+
     Args:
         start_date_inclusive (datetime): The start date (inclusive)
         end_date_inclusive (datetime): The end date (inclusive)
@@ -27,62 +69,141 @@ def _get_weather_features_for_dates(
     weather_forecasts = weather_forecast.etl_weather_forecast_data(
         start_date_inclusive, end_date_inclusive
     )
+
+    if WEATHER_ARCHIVE_INFLUX_MIRROR and weather_forecast.archived_model_run:
+        try:
+            await store_weather_forecast_snapshot(
+                get_db_client().write_api(),
+                weather_forecast.grid_cell,
+                weather_forecast.archived_model_run,
+                weather_forecasts,
+            )
+        except Exception as exc:
+            logger.warning(
+                "Failed to mirror the weather forecast to InfluxDB", exc_info=exc
+            )
+
     return weather_forecasts.rename(columns={"date_time": "datetime"})
 
 
-def _get_time_features_for_dates(
+@cache
+def get_nl_holidays(year: int) -> frozenset[date]:
+    """Retrieve the Dutch public holidays of a year, built once per year.
+
+    Args:
+        year (int): The year.
+
+    Returns:
+        frozenset[date]: The dates of the public holidays.
+    """
+    return frozenset(holidays.country_holidays(country="NL", years=year))
+
+
+def _write_time_features(grid: ForecastGrid) -> None:
+    """Write the calendar features of the slots into the grid.
+
+    Args:
+        grid (ForecastGrid): The forecast grid to write the features into.
+    """
+    slots = grid.slots
+
+    grid.write("year", slots.year.to_numpy())
+    grid.write("month", slots.month.to_numpy())
+    grid.write("day", slots.day.to_numpy())
+    grid.write("hour", slots.hour.to_numpy())
+    grid.write("minute", slots.minute.to_numpy())
+    grid.write("dayofyear", slots.dayofyear.to_numpy())
+    grid.write("dayofweek", slots.dayofweek.to_numpy())
+    grid.write("weekofyear", slots.isocalendar().week.to_numpy(dtype=np.int8))
+
+    weekend_cutoff = 5
+    grid.write("is_weekend", slots.dayofweek >= weekend_cutoff)
+
+    nl_holidays = set().union(*(get_nl_holidays(year) for year in set(slots.year)))
+    grid.write("is_holiday", pd.Index(slots.date).isin(list(nl_holidays)))
+
+
+def _limit_to_measured(
+    lag_datetimes: pd.Series, last_measured: pd.Timestamp
+) -> pd.Series:
+    """Move lag datetimes which fall after the last measurement back to the latest measured day.
+
+    When forecasting more than a day ahead, short lags of the later days fall inside the forecast
+    horizon, where no load was measured yet. Those lags are replaced by the load at the same time
+    of day on the latest day for which the load was measured.
+
+    Args:
+        lag_datetimes (pd.Series): The (timezone-aware) datetimes of the lag.
+        last_measured (pd.Timestamp): The datetime of the last measurement.
+
+    Returns:
+        pd.Series: The datetimes of the lag, at or before the last measurement.
+    """
+    timezone = lag_datetimes.dt.tz
+    wall_clock = lag_datetimes.dt.tz_localize(None)
+    last_measured_wall_clock = last_measured.tz_convert(timezone).tz_localize(None)
+
+    days_after_measured = np.maximum(
+        np.ceil((wall_clock - last_measured_wall_clock) / pd.Timedelta(days=1)), 0
+    )
+    shifted = (
+        wall_clock - pd.to_timedelta(days_after_measured, unit="D")
+    ).dt.tz_localize(timezone, ambiguous="NaT", nonexistent="NaT")
+
+    return lag_datetimes.where(days_after_measured == 0, shifted)
+
+
+def _get_lag_windows(
     start_date_inclusive: datetime, end_date_inclusive: datetime
-) -> pd.DataFrame:
-    """Get time features for each date between the given datetime range.
+) -> list[tuple[datetime, datetime]]:
+    """Determine the windows of dalidata the lag features of the given datetime range are looked up in.
+
+    Every lag looks up the horizon shifted back by its offset (with a day of margin for DST
+    transitions). Overlapping windows, such as those of the daily lags, are merged.
 
     Args:
         start_date_inclusive (datetime): The start date (inclusive)
         end_date_inclusive (datetime): The end date (inclusive)
 
     Returns:
-        pd.DataFrame: The dataframe containing time features for the date range.
-    """
-    predict_datetimes_df = pd.DataFrame(
-        {
-            "datetime": pd.date_range(
-                start=start_date_inclusive,
-                end=end_date_inclusive,
-                freq="15min",
-                tz=ZoneInfo("Europe/Amsterdam"),
-                inclusive="left",
-            )
-        }
+        list[tuple[datetime, datetime]]: The sorted, non-overlapping start (inclusive) and end (exclusive)
+            of the windows.
+    """
+    # No dalidata is measured within the last day before the end_date.
+    end_date_day_ago = pd.Timestamp(end_date_inclusive - timedelta(days=1))
+    margin = pd.Timedelta(days=1)
+
+    windows = sorted(
+        (
+            pd.Timestamp(start_date_inclusive) - offset - margin,
+            min(pd.Timestamp(end_date_inclusive) - offset + margin, end_date_day_ago),
+        )
+        for offset in _LAG_OFFSETS.values()
     )
 
-    predict_datetimes_df["year"] = predict_datetimes_df["datetime"].dt.year
-    predict_datetimes_df["month"] = predict_datetimes_df["datetime"].dt.month
-    predict_datetimes_df["day"] = predict_datetimes_df["datetime"].dt.day
-    predict_datetimes_df["hour"] = predict_datetimes_df["datetime"].dt.hour
-    predict_datetimes_df["minute"] = predict_datetimes_df["datetime"].dt.minute
-    predict_datetimes_df["dayofyear"] = predict_datetimes_df["datetime"].dt.dayofyear
-    predict_datetimes_df["dayofweek"] = predict_datetimes_df["datetime"].dt.dayofweek
-    predict_datetimes_df["weekofyear"] = (
-        predict_datetimes_df["datetime"].dt.isocalendar().week
-    )
+    merged: list[tuple[pd.Timestamp, pd.Timestamp]] = []
+    for window_start, window_end in windows:
+        if merged and window_start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], window_end))
+        else:
+            merged.append((window_start, window_end))
 
-    weekend_cutoff = 5
-    predict_datetimes_df["is_weekend"] = predict_datetimes_df[
-        "datetime"
-    ].dt.dayofweek.apply(func=lambda x: 1 if x >= weekend_cutoff else 0)
-
-    nl_holidays = holidays.country_holidays(country="NL")
-    predict_datetimes_df["is_holiday"] = predict_datetimes_df["datetime"].apply(
-        func=lambda x: 1 if x.date() in nl_holidays else 0
-    )
-    return predict_datetimes_df
+    return [
+        (window_start.to_pydatetime(), window_end.to_pydatetime())
+        for window_start, window_end in merged
+        if window_start < window_end
+    ]
 
 
-async def _get_lag_features_for_dates(
+async def _get_lag_window_dalidata(
     query_api: QueryApiAsync,
     start_date_inclusive: datetime,
     end_date_inclusive: datetime,
-) -> pd.DataFrame:
-    """Get time features for each date between the given datetime range.
+) -> TimeSeriesColumns:
+    """Retrieve the dalidata the lag features for the given datetime range are looked up in.
+
+    Only the windows around the lags are retrieved raw (about ten days for the daily lags and the
+    lag a year ago), so the amount of dalidata does not grow with the length of the lookback.
 
     Args:
         query_api (QueryApi): The read-only connection to the influx database.
@@ -90,111 +211,436 @@ async def _get_lag_features_for_dates(
         end_date_inclusive (datetime): The end date (inclusive)
 
     Returns:
-        pd.DataFrame: The dataframe containing time features for the date range.
-    """
-    predict_datetimes_df = pd.DataFrame(
-        {
-            "datetime": pd.date_range(
-                start=start_date_inclusive,
-                end=end_date_inclusive,
-                freq="15min",
-                tz=ZoneInfo("Europe/Amsterdam"),
-                inclusive="left",
+        TimeSeriesColumns: The dalidata of the lag windows, sorted by time.
+    """
+    windows = [
+        await retrieve_dali_data_between(
+            query_api=query_api,
+            start_date_inclusive=window_start,
+            end_date_inclusive=window_end,
+        )
+        for window_start, window_end in _get_lag_windows(
+            start_date_inclusive, end_date_inclusive
+        )
+    ]
+
+    return TimeSeriesColumns(
+        timestamps=np.concatenate(
+            [window.timestamps for window in windows] or [np.empty(0, np.int64)]
+        ),
+        values={
+            "WAARDE": np.concatenate(
+                [window.values["WAARDE"] for window in windows]
+                or [np.empty(0, np.float64)]
             )
-        }
+        },
     )
 
-    # Retrieve the dalidata starting from a year ago, since we account for the lag a year ago.
-    start_date_year_ago = start_date_inclusive - timedelta(days=366)
-    # Retrieve up to 1 day before the end_date
-    end_date_day_ago = end_date_inclusive - timedelta(days=1)
 
-    dalidata_df = await retrieve_dali_data_between(
-        query_api=query_api,
-        start_date_inclusive=start_date_year_ago,
-        end_date_inclusive=end_date_day_ago,
-    )
+async def _get_hourly_rollup(
+    query_api: QueryApiAsync,
+    start_date_inclusive: datetime,
+    end_date_inclusive: datetime,
+) -> pd.DataFrame | None:
+    """Retrieve the hourly rollup of the dalidata over the lookback of the long-lookback lags.
 
-    dalidata_df["datetime"] = pd.to_datetime(dalidata_df["datetime"], utc=True)
-    dalidata_df = dalidata_df.set_index("datetime")
+    The rollups are refreshed first. Failures of the rollup store are logged and treated as a miss.
 
-    lag_1_year_dt = predict_datetimes_df["datetime"].apply(
-        lambda dt: dt - pd.DateOffset(years=1)
-    )
-    lag_1_day_dt = predict_datetimes_df["datetime"].apply(
-        lambda dt: dt - pd.DateOffset(days=1)
+    Args:
+        query_api (QueryApi): The read-only connection to the influx database.
+        start_date_inclusive (datetime): The start date (inclusive)
+        end_date_inclusive (datetime): The end date (inclusive)
+
+    Returns:
+        pd.DataFrame | None: The hourly rollup. None if rollups are disabled or unavailable.
+    """
+    if not DALI_ROLLUPS_ENABLED:
+        return None
+
+    margin = pd.Timedelta(days=1)
+    try:
+        await dali_rollup_store.refresh(
+            query_api, MOCK_EAN_NUMBER, until=start_date_inclusive
+        )
+        return dali_rollup_store.read(
+            MOCK_EAN_NUMBER,
+            "hourly",
+            min(
+                pd.Timestamp(start_date_inclusive) - _LAG_OFFSETS[lag] - margin
+                for lag in _ROLLUP_FALLBACK_LAGS
+            ),
+            max(
+                pd.Timestamp(end_date_inclusive) - _LAG_OFFSETS[lag] + margin
+                for lag in _ROLLUP_FALLBACK_LAGS
+            ),
+        )
+    except Exception as exc:
+        logger.warning("Failed to read the dalidata rollups", exc_info=exc)
+        return None
+
+
+async def _get_lag_arrays(
+    query_api: QueryApiAsync,
+    start_date_inclusive: datetime,
+    end_date_inclusive: datetime,
+) -> dict[str, np.ndarray]:
+    """Retrieve the dalidata the lag features for the given datetime range are assembled from.
+
+    Args:
+        query_api (QueryApi): The read-only connection to the influx database.
+        start_date_inclusive (datetime): The start date (inclusive)
+        end_date_inclusive (datetime): The end date (inclusive)
+
+    Returns:
+        dict[str, np.ndarray]: The "timestamps" and "WAARDE" of the dalidata of the lag windows, with the
+            "hourly_timestamps" and "hourly_means" of the hourly rollup if it is available.
+    """
+    dalidata = await _get_lag_window_dalidata(
+        query_api, start_date_inclusive, end_date_inclusive
     )
-    lag_2_day_dt = predict_datetimes_df["datetime"].apply(
-        lambda dt: dt - pd.DateOffset(days=2)
+    lag_arrays = {
+        "timestamps": dalidata.timestamps,
+        "WAARDE": dalidata.values["WAARDE"],
+    }
+
+    hourly_rollup = await _get_hourly_rollup(
+        query_api, start_date_inclusive, end_date_inclusive
     )
-    lag_3_day_dt = predict_datetimes_df["datetime"].apply(
-        lambda dt: dt - pd.DateOffset(days=3)
+    if hourly_rollup is not None:
+        lag_arrays["hourly_timestamps"] = (
+            hourly_rollup["time"].to_numpy(dtype="datetime64[ns]").view("int64")
+        )
+        lag_arrays["hourly_means"] = hourly_rollup["mean"].to_numpy()
+
+    return lag_arrays
+
+
+def _write_lag_features(
+    grid: ForecastGrid,
+    dali_timestamps: np.ndarray,
+    dali_values: np.ndarray,
+    hourly_timestamps: np.ndarray | None = None,
+    hourly_means: np.ndarray | None = None,
+) -> None:
+    """Write the lag features of the slots into the grid.
+
+    Slots of the long-lookback lags for which no load was measured are filled with the hourly
+    mean load of the hourly rollup, if given.
+
+    Args:
+        grid (ForecastGrid): The forecast grid to write the features into.
+        dali_timestamps (np.ndarray): The timestamps of the dalidata of the lag windows, as int64 nanoseconds (UTC).
+        dali_values (np.ndarray): The measured loads of the dalidata of the lag windows.
+        hourly_timestamps (np.ndarray | None): The start of the hours of the hourly rollup, as int64
+            nanoseconds (UTC). Defaults to None.
+        hourly_means (np.ndarray | None): The mean measured load of the hours of the hourly rollup. Defaults to None.
+    """
+    slot_datetimes = pd.Series(grid.slots)
+
+    # The dalidata is decoded into typed columns, so it can be indexed without intermediate conversions.
+    dalidata_df = pd.DataFrame(
+        {"WAARDE": dali_values},
+        index=pd.to_datetime(dali_timestamps, unit="ns", utc=True),
     )
-    lag_4_day_dt = predict_datetimes_df["datetime"].apply(
-        lambda dt: dt - pd.DateOffset(days=4)
+    hourly_means_by_hour = (
+        pd.Series(
+            hourly_means, index=pd.to_datetime(hourly_timestamps, unit="ns", utc=True)
+        )
+        if hourly_timestamps is not None and hourly_means is not None
+        else None
     )
-    lag_5_day_dt = predict_datetimes_df["datetime"].apply(
-        lambda dt: dt - pd.DateOffset(days=5)
+
+    measured = dalidata_df["WAARDE"].dropna()
+    last_measured = measured.index.max() if len(measured) else None
+
+    for lag_column, lag_offset in _LAG_OFFSETS.items():
+        lag_datetimes = slot_datetimes.apply(lambda dt, offset=lag_offset: dt - offset)
+        if last_measured is not None:
+            lag_datetimes = _limit_to_measured(lag_datetimes, last_measured)
+
+        lag_values = dalidata_df.reindex(lag_datetimes)["WAARDE"]
+        if lag_column in _ROLLUP_FALLBACK_LAGS and hourly_means_by_hour is not None:
+            lag_values = lag_values.fillna(
+                hourly_means_by_hour.reindex(
+                    lag_datetimes.dt.tz_convert("UTC").dt.floor("h")
+                ).set_axis(lag_values.index)
+            )
+
+        grid.write(lag_column, lag_values.to_numpy())
+
+
+def _write_weather_features(grid: ForecastGrid, weather_features: pd.DataFrame) -> None:
+    """Write the weather features into the grid, aligned by the timestamps of the weather forecast.
+
+    Args:
+        grid (ForecastGrid): The forecast grid to write the features into.
+        weather_features (pd.DataFrame): The weather features.
+    """
+    positions = grid.positions(weather_features["datetime"])
+
+    for column in WeatherForecastData().om_weather_forecast_vars.values():
+        grid.write(column, weather_features[column].to_numpy(), positions)
+
+
+def _assemble_features(
+    dalidata: dict[str, np.ndarray],
+    grid: ForecastGrid,
+    weather_features: pd.DataFrame,
+) -> pd.DataFrame:
+    """Write the calendar, lag and weather features into the grid and assemble the features.
+
+    CPU-bound, runs in the process pool if it is enabled.
+
+    Args:
+        dalidata (dict[str, np.ndarray]): The "timestamps" and "WAARDE" of the dalidata of the lag windows,
+            optionally with the "hourly_timestamps" and "hourly_means" of the hourly rollup.
+        grid (ForecastGrid): The forecast grid of the horizon, holding the standard profile feature.
+        weather_features (pd.DataFrame): The weather features for the horizon.
+
+    Returns:
+        pd.DataFrame: A dataframe containing all the features for the horizon.
+    """
+    _write_time_features(grid)
+    _write_lag_features(
+        grid,
+        dalidata["timestamps"],
+        dalidata["WAARDE"],
+        dalidata.get("hourly_timestamps"),
+        dalidata.get("hourly_means"),
     )
-    lag_6_day_dt = predict_datetimes_df["datetime"].apply(
-        lambda dt: dt - pd.DateOffset(days=6)
+    _write_weather_features(grid, weather_features)
+
+    return grid.to_frame()
+
+
+def _parse_standard_profile_weights(weights: str, asset_id: str) -> dict[str, float]:
+    """Parse the standard profile weights of a grid asset from the configured standard profile weights.
+
+    The configured weights are a semicolon-delimited list of 'EAN=category:weight,...' entries, one per
+    asset. An entry without EAN holds the weights of the assets which do not have an entry of their own.
+
+    Args:
+        weights (str): The configured standard profile weights.
+        asset_id (str): The EAN number of the grid asset.
+
+    Returns:
+        dict[str, float]: The weight of each standard profile category for the asset.
+    """
+    asset_pairs: dict[str, str] = {}
+
+    for entry in filter(None, (e.strip() for e in weights.split(";"))):
+        entry_asset_id, _, entry_pairs = entry.rpartition("=")
+        asset_pairs[entry_asset_id.strip()] = entry_pairs
+
+    parsed_weights: dict[str, float] = {}
+    pairs = asset_pairs.get(asset_id, asset_pairs.get("", ""))
+
+    for pair in filter(None, (p.strip() for p in pairs.split(","))):
+        category, _, weight = pair.partition(":")
+        parsed_weights[category.strip()] = float(weight)
+
+    return parsed_weights
+
+
+async def _write_standard_profile_features(
+    query_api: QueryApiAsync, grid: ForecastGrid, asset_id: str
+) -> None:
+    """Write the scaled standard profile feature of the slots into the grid.
+
+    The standard profiles are served from the local memory-mapped profile store, which only
+    queries InfluxDB the first time a year is needed. If no standard profile weights are
+    configured for the asset, the feature is set to 0.
+
+    Args:
+        query_api (QueryApi): The read-only connection to the influx database.
+        grid (ForecastGrid): The forecast grid to write the feature into.
+        asset_id (str): The EAN number of the grid asset the standard profiles are scaled for.
+    """
+    weights = _parse_standard_profile_weights(STANDARD_PROFILE_WEIGHTS, asset_id)
+
+    if not weights:
+        grid.write("scaled_profile", 0.0)
+        return
+
+    await standard_profile_store.ensure_years(
+        query_api, set(grid.slots.tz_convert("UTC").year), weights.keys()
     )
-    lag_7_day_dt = predict_datetimes_df["datetime"].apply(
-        lambda dt: dt - pd.DateOffset(days=7)
+
+    grid.write("scaled_profile", standard_profile_store.lookup(grid.slots, weights))
+
+
+async def _get_source_fingerprint(
+    query_api: QueryApiAsync,
+    start_date_inclusive: datetime,
+    end_date_inclusive: datetime,
+    weather_features: pd.DataFrame,
+) -> str:
+    """Calculate a fingerprint of the upstream sources the features between the given dates are assembled from.
+
+    The dalidata is fingerprinted through its server-side daily aggregates over the lag window,
+    the weather forecast through the content of the retrieved forecast. The standard profiles are
+    static per year, only the weights they are scaled with are part of the fingerprint.
+
+    Args:
+        query_api (QueryApi): The read-only connection to the influx database.
+        start_date_inclusive (datetime): The start date (inclusive)
+        end_date_inclusive (datetime): The end date (inclusive)
+        weather_features (pd.DataFrame): The weather features for the date range.
+
+    Returns:
+        str: The fingerprint of the upstream sources.
+    """
+    dali_daily_aggregates = await retrieve_dali_daily_aggregates_between(
+        query_api=query_api,
+        start_date_inclusive=start_date_inclusive - timedelta(days=366),
+        end_date_inclusive=end_date_inclusive - timedelta(days=1),
     )
 
-    predict_datetimes_df["lag_1_year"] = dalidata_df.reindex(lag_1_year_dt)[
-        "WAARDE"
-    ].values
-    predict_datetimes_df["lag_1_days"] = dalidata_df.reindex(lag_1_day_dt)[
-        "WAARDE"
-    ].values
-    predict_datetimes_df["lag_2_days"] = dalidata_df.reindex(lag_2_day_dt)[
-        "WAARDE"
-    ].values
-    predict_datetimes_df["lag_3_days"] = dalidata_df.reindex(lag_3_day_dt)[
-        "WAARDE"
-    ].values
-    predict_datetimes_df["lag_4_days"] = dalidata_df.reindex(lag_4_day_dt)[
-        "WAARDE"
-    ].values
-    predict_datetimes_df["lag_5_days"] = dalidata_df.reindex(lag_5_day_dt)[
-        "WAARDE"
-    ].values
-    predict_datetimes_df["lag_6_days"] = dalidata_df.reindex(lag_6_day_dt)[
-        "WAARDE"
-    ].values
-    predict_datetimes_df["lag_7_days"] = dalidata_df.reindex(lag_7_day_dt)[
-        "WAARDE"
-    ].values
+    fingerprint = hashlib.sha256()
+    fingerprint.update(dali_daily_aggregates.content_hash().encode())
+    fingerprint.update(frame_content_hash(weather_features).encode())
+    fingerprint.update(STANDARD_PROFILE_WEIGHTS.encode())
+    return fingerprint.hexdigest()
 
-    return predict_datetimes_df
 
+def _read_stored_features(
+    asset_id: str,
+    start_date_inclusive: datetime,
+    end_date_inclusive: datetime,
+    source_fingerprint: str,
+) -> pd.DataFrame | None:
+    """Read the features between the given dates from the feature store.
 
-def _get_mock_standard_profile_features(
-    start_date_inclusive: datetime, end_date_inclusive: datetime
-) -> pd.DataFrame:
-    predict_datetimes_df = pd.DataFrame(
-        {
-            "datetime": pd.date_range(
-                start=start_date_inclusive,
-                end=end_date_inclusive,
-                freq="15min",
-                tz=ZoneInfo("Europe/Amsterdam"),
-                inclusive="left",
-            )
-        }
+    Failures of the feature store are logged and treated as a miss, the features are then assembled again.
+
+    Args:
+        asset_id (str): The EAN number of the grid asset the features are stored for.
+        start_date_inclusive (datetime): The start date (inclusive)
+        end_date_inclusive (datetime): The end date (inclusive)
+        source_fingerprint (str): The fingerprint of the current upstream sources.
+
+    Returns:
+        pd.DataFrame | None: The stored features. None if no valid features are stored.
+    """
+    try:
+        stored_features = feature_store.read(
+            asset_id=asset_id,
+            feature_version=FEATURE_VERSION,
+            start_date_inclusive=start_date_inclusive,
+            end_date_exclusive=end_date_inclusive,
+            source_fingerprint=source_fingerprint,
+        )
+    except Exception as exc:
+        logger.warning("Failed to read features from the feature store", exc_info=exc)
+        return None
+
+    if stored_features is not None:
+        logger.info(
+            "get_features_between_dates: Serving features from the feature store, upstream sources unchanged."
+        )
+
+    return stored_features
+
+
+def _store_features(
+    asset_id: str,
+    start_date_inclusive: datetime,
+    end_date_inclusive: datetime,
+    features: pd.DataFrame,
+    source_fingerprint: str,
+) -> None:
+    """Store the assembled features in the feature store.
+
+    Failures of the feature store are logged and otherwise ignored.
+
+    Args:
+        asset_id (str): The EAN number of the grid asset the features are stored for.
+        start_date_inclusive (datetime): The start date (inclusive) of the features.
+        end_date_inclusive (datetime): The end date (inclusive) of the features.
+        features (pd.DataFrame): The assembled features.
+        source_fingerprint (str): The fingerprint of the upstream sources of the features.
+    """
+    try:
+        content_hash = feature_store.write(
+            asset_id=asset_id,
+            feature_version=FEATURE_VERSION,
+            start_date_inclusive=start_date_inclusive,
+            end_date_exclusive=end_date_inclusive,
+            features=features,
+            source_fingerprint=source_fingerprint,
+        )
+        logger.info(
+            "get_features_between_dates: Stored features with content hash %s.",
+            content_hash,
+        )
+    except Exception as exc:
+        logger.warning("Failed to write features to the feature store", exc_info=exc)
+
+
+@dataclass
+class HorizonSources:
+    """The upstream sources of a horizon which are retrieved once for the whole horizon.
+
+    When a horizon is processed in chunks, the features of every chunk are assembled from the
+    sources of the horizon, so the weather forecast and the dalidata of the lag windows are fetched
+    (and fingerprinted) only once.
+    """
+
+    weather_features: pd.DataFrame
+    """The weather features of the horizon."""
+
+    source_fingerprint: str | None
+    """The fingerprint of the upstream sources of the horizon. None if the feature store is disabled."""
+
+    lag_arrays: dict[str, np.ndarray] | None = None
+    """The dalidata the lag features of the horizon are assembled from, see _get_lag_arrays. None if it
+    is retrieved only when the features are not stored."""
+
+
+async def get_horizon_sources(
+    query_api: QueryApiAsync,
+    start_date_inclusive: datetime,
+    end_date_inclusive: datetime,
+    include_lag_arrays: bool = False,
+) -> HorizonSources:
+    """Retrieve the upstream sources of the horizon between the given dates.
+
+    Args:
+        query_api (QueryApi): The read-only connection to the influx database.
+        start_date_inclusive (datetime): The start date (inclusive)
+        end_date_inclusive (datetime): The end date (inclusive)
+        include_lag_arrays (bool): Whether to retrieve the dalidata of the lag windows as well, when the
+            horizon is processed in chunks. Defaults to False.
+
+    Returns:
+        HorizonSources: The upstream sources of the horizon.
+    """
+    weather_features = await _get_weather_features_for_dates(
+        start_date_inclusive, end_date_inclusive
+    )
+    source_fingerprint = (
+        await _get_source_fingerprint(
+            query_api, start_date_inclusive, end_date_inclusive, weather_features
+        )
+        if FEATURE_STORE_ENABLED
+        else None
     )
 
-    predict_datetimes_df["scaled_profile"] = 0
+    lag_arrays = (
+        await _get_lag_arrays(query_api, start_date_inclusive, end_date_inclusive)
+        if include_lag_arrays
+        else None
+    )
 
-    return predict_datetimes_df
+    return HorizonSources(weather_features, source_fingerprint, lag_arrays)
 
 
 async def get_features_between_dates(
     query_api: QueryApiAsync,
     start_date_inclusive: datetime,
     end_date_inclusive: datetime,
+    asset_id: str = MOCK_EAN_NUMBER,
+    sources: HorizonSources | None = None,
 ) -> pd.DataFrame:
     """Get features for the prediction model between the start date (inclusive) and end date (inclusive).
 
@@ -202,24 +648,144 @@ async def get_features_between_dates(
         query_api (QueryApi): The read-only connection to the influx database.
         start_date_inclusive (datetime): The start date (inclusive)
         start_date_inclusive (datetime): The end date (inclusive)
+        asset_id (str): The EAN number of the grid asset the features are stored for in the feature store.
+            Defaults to MOCK_EAN_NUMBER.
+        sources (HorizonSources | None): The upstream sources of a horizon covering the dates, when the
+            dates are a chunk of that horizon. If None, the sources of the dates are retrieved.
 
     Returns:
         pd.DataFrame: A dataframe containing all the features for the given time range.
     """
-    time_features = _get_time_features_for_dates(
-        start_date_inclusive, end_date_inclusive
-    )
-    lag_features = await _get_lag_features_for_dates(
+    sources = sources or await get_horizon_sources(
         query_api, start_date_inclusive, end_date_inclusive
     )
-    weather_features = _get_weather_features_for_dates(
-        start_date_inclusive, end_date_inclusive
+    weather_features = sources.weather_features
+    source_fingerprint = sources.source_fingerprint
+
+    if source_fingerprint is not None:
+        stored_features = _read_stored_features(
+            asset_id, start_date_inclusive, end_date_inclusive, source_fingerprint
+        )
+        if stored_features is not None:
+            horizon_feature_cache.put(
+                asset_id, start_date_inclusive, end_date_inclusive, stored_features
+            )
+            return stored_features
+
+    lag_arrays = sources.lag_arrays
+    if lag_arrays is None:
+        lag_arrays = await _get_lag_arrays(
+            query_api, start_date_inclusive, end_date_inclusive
+        )
+
+    grid = ForecastGrid(start_date_inclusive, end_date_inclusive)
+    await _write_standard_profile_features(query_api, grid, asset_id)
+
+    # The dalidata of the lag windows is passed to the process pool through shared memory.
+    features = await run_cpu_bound(
+        _assemble_features, lag_arrays, grid, weather_features
     )
-    # standard_profiles = await retrieve_standard_profiles_between_dates(query_api, start_date_inclusive, end_date_inclusive)
-    standard_profiles = _get_mock_standard_profile_features(
-        start_date_inclusive, end_date_inclusive
+
+    if source_fingerprint is not None:
+        _store_features(
+            asset_id,
+            start_date_inclusive,
+            end_date_inclusive,
+            features,
+            source_fingerprint,
+        )
+    horizon_feature_cache.put(
+        asset_id, start_date_inclusive, end_date_inclusive, features
     )
 
-    return pd.concat(
-        [time_features, lag_features, weather_features, standard_profiles], axis=1
+    return features
+
+
+def _refresh_weather_features(
+    features: pd.DataFrame, weather_features: pd.DataFrame
+) -> int:
+    """Overwrite the weather features of the slots for which the weather forecast changed.
+
+    Args:
+        features (pd.DataFrame): The features to refresh in place.
+        weather_features (pd.DataFrame): The refreshed weather features.
+
+    Returns:
+        int: The number of quarter-hour slots for which the weather forecast changed.
+    """
+    weather_columns = list(WeatherForecastData().om_weather_forecast_vars.values())
+    slot_times = pd.Index(features["datetime"])
+
+    refreshed = weather_features.set_index("datetime")[weather_columns]
+    positions = slot_times.get_indexer(refreshed.index)
+    known_slots = positions >= 0
+    positions = positions[known_slots]
+    refreshed_values = refreshed.to_numpy(dtype=np.float32)[known_slots]
+
+    column_positions = features.columns.get_indexer(weather_columns)
+    current_values = features.iloc[positions, column_positions].to_numpy(
+        dtype=np.float32
+    )
+    changed_slots = ~np.isclose(current_values, refreshed_values, equal_nan=True).all(
+        axis=1
     )
+
+    features.iloc[positions[changed_slots], column_positions] = refreshed_values[
+        changed_slots
+    ]
+
+    return int(changed_slots.sum())
+
+
+async def get_features_for_remaining_horizon(
+    query_api: QueryApiAsync,
+    horizon_start: datetime,
+    horizon_end: datetime,
+    from_date: datetime,
+    asset_id: str = MOCK_EAN_NUMBER,
+) -> pd.DataFrame:
+    """Get features for the remaining part of a forecast horizon, starting at from_date.
+
+    The calendar, lag and standard profile features are reused from the features cached for the
+    horizon. Only the weather forecast is fetched again, and only the slots for which it changed
+    are overwritten. If the horizon is not cached, the features of the full horizon are computed.
+
+    Args:
+        query_api (QueryApi): The read-only connection to the influx database.
+        horizon_start (datetime): The start of the forecast horizon (inclusive)
+        horizon_end (datetime): The end of the forecast horizon (exclusive)
+        from_date (datetime): The start of the remaining part of the horizon (inclusive)
+        asset_id (str): The EAN number of the grid asset the features are stored for in the feature store.
+            Defaults to MOCK_EAN_NUMBER.
+
+    Returns:
+        pd.DataFrame: A dataframe containing all the features between from_date and the end of the horizon.
+    """
+    features = horizon_feature_cache.get(asset_id, horizon_start, horizon_end)
+
+    if features is None:
+        logger.info(
+            "get_features_for_remaining_horizon: No cached features for horizon %s - %s, computing all features.",
+            horizon_start,
+            horizon_end,
+        )
+        features = await get_features_between_dates(
+            query_api=query_api,
+            start_date_inclusive=horizon_start,
+            end_date_inclusive=horizon_end,
+            asset_id=asset_id,
+        )
+    else:
+        # The forecast API works on whole hours, refresh from the start of the hour so the
+        # first quarter-hours of the remaining horizon can still be interpolated.
+        weather_features = await _get_weather_features_for_dates(
+            from_date.replace(minute=0, second=0, microsecond=0), horizon_end
+        )
+        changed_slots = _refresh_weather_features(features, weather_features)
+        logger.info(
+            "get_features_for_remaining_horizon: Weather forecast changed for %d quarter-hour slots.",
+            changed_slots,
+        )
+
+    remaining_slots = features["datetime"] >= from_date
+    return features[remaining_slots].reset_index(drop=True)
@@ -0,0 +1,138 @@
+"""Module containing the time grid of a forecast horizon, shared by all feature sources.
+
+The quarter-hour slots of the horizon are computed once. Every feature source writes its values
+into preallocated columns of the grid by slot position, after which the features are assembled
+into a single frame without concatenating (and copying) the frames of the individual sources.
+"""
+
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+
+# The input columns of the prediction model, in the order the model expects them.
+MODEL_INPUT_COLUMNS = [
+    "year",
+    "month",
+    "day",
+    "hour",
+    "minute",
+    "dayofyear",
+    "dayofweek",
+    "weekofyear",
+    "is_weekend",
+    "is_holiday",
+    "lag_1_days",
+    "lag_2_days",
+    "lag_3_days",
+    "lag_4_days",
+    "lag_5_days",
+    "lag_6_days",
+    "lag_7_days",
+    "lag_1_year",
+    "temperature",
+    "irradiation_duration",
+    "irradiation",
+    "cloud_coverage",
+    "rain",
+    "humidity",
+    "snow",
+    "scaled_profile",
+]
+
+# The calendar features are small integers, all other features are float32 measurements.
+_CALENDAR_DTYPES = {
+    "year": np.int16,
+    "month": np.int8,
+    "day": np.int8,
+    "hour": np.int8,
+    "minute": np.int8,
+    "dayofyear": np.int16,
+    "dayofweek": np.int8,
+    "weekofyear": np.int8,
+    "is_weekend": np.int8,
+    "is_holiday": np.int8,
+}
+
+
+class ForecastGrid:
+    """The quarter-hour slots of a forecast horizon, with a preallocated column per model feature.
+
+    Measurement columns start out as NaN, so slots for which a source has no value stay missing.
+    """
+
+    def __init__(
+        self,
+        start_date_inclusive: datetime,
+        end_date_exclusive: datetime,
+        timezone: str = "Europe/Amsterdam",
+    ) -> None:
+        """Initializes the forecast grid.
+
+        Args:
+            start_date_inclusive (datetime): The start date (inclusive) of the horizon.
+            end_date_exclusive (datetime): The end date (exclusive) of the horizon.
+            timezone (str): The timezone of the slots. Defaults to "Europe/Amsterdam".
+        """
+        self.slots = pd.date_range(
+            start=start_date_inclusive,
+            end=end_date_exclusive,
+            freq="15min",
+            tz=ZoneInfo(timezone),
+            inclusive="left",
+        )
+        self._columns = {
+            column: (
+                np.zeros(len(self.slots), dtype=_CALENDAR_DTYPES[column])
+                if column in _CALENDAR_DTYPES
+                else np.full(len(self.slots), np.nan, dtype=np.float32)
+            )
+            for column in MODEL_INPUT_COLUMNS
+        }
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def positions(self, timestamps: pd.Series | pd.DatetimeIndex) -> np.ndarray:
+        """Look up the slot positions of the given timestamps.
+
+        Args:
+            timestamps (pd.Series | pd.DatetimeIndex): The (timezone-aware) timestamps.
+
+        Returns:
+            np.ndarray: The slot position of every timestamp. -1 for timestamps which are not a slot of the grid.
+        """
+        return self.slots.get_indexer(pd.DatetimeIndex(timestamps))
+
+    def write(
+        self,
+        column: str,
+        values: np.ndarray | float,
+        positions: np.ndarray | None = None,
+    ) -> None:
+        """Write the values of a feature into the grid.
+
+        Args:
+            column (str): The feature to write.
+            values (np.ndarray | float): The values, one per slot (or per position), or a single value for all slots.
+            positions (np.ndarray | None): The slot position of every value, as returned by positions. Values with
+                position -1 are skipped. If None, the values are aligned with the slots.
+        """
+        target = self._columns[column]
+
+        if positions is None:
+            target[:] = values
+            return
+
+        on_grid = positions >= 0
+        target[positions[on_grid]] = np.asarray(values)[on_grid]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Assemble the features of the grid into a frame.
+
+        Returns:
+            pd.DataFrame: The slot timestamps in the "datetime" column, followed by the features in
+                MODEL_INPUT_COLUMNS order.
+        """
+        return pd.DataFrame({"datetime": self.slots, **self._columns}, copy=False)
@@ -0,0 +1,284 @@
+"""Module containing the backends which score the model input with the prediction model."""
+
+import pickle
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from functools import cache
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    DITM_MODEL_API_BREAKER_COOLDOWN_SECONDS,
+    DITM_MODEL_API_BREAKER_FAILURES,
+    DITM_MODEL_API_HEDGE_DELAY_SECONDS,
+    DITM_MODEL_API_HEDGE_PERCENTILE,
+    DITM_MODEL_API_TIMEOUT_SECONDS,
+    DITM_MODEL_API_URL,
+    INFERENCE_BACKEND,
+    LOCAL_MODEL_PATH,
+    LOCAL_MODEL_THREADS,
+)
+from src.infrastructure._auth.http.authenticated_session import (
+    _BearerAuthenticatedSession,
+)
+from src.infrastructure.azureml.forecast_grid import MODEL_INPUT_COLUMNS
+from src.infrastructure.azureml.endpoint_resilience import (
+    CircuitBreaker,
+    HedgedEndpointCaller,
+)
+from src.logger import logger
+
+
+class InferenceBackend(ABC):
+    """Abstract backend which scores batches of model input with the prediction model."""
+
+    name: str
+
+    def warm_up(self) -> None:
+        """Prepare the backend for scoring, for example by loading the model.
+
+        Called before scoring and by the prewarm, so it is cheap once the backend is prepared.
+        """
+
+    @abstractmethod
+    def _score(self, model_input: pd.DataFrame) -> Sequence[float] | np.ndarray:
+        """Score the model input.
+
+        Args:
+            model_input (pd.DataFrame): The model input, with the columns in MODEL_INPUT_COLUMNS order.
+
+        Returns:
+            Sequence[float] | np.ndarray: The prediction of every row of the model input.
+        """
+
+    def predict(self, model_input: pd.DataFrame) -> list[float]:
+        """Score the model input, checking the predictions have the shape of the model input.
+
+        Args:
+            model_input (pd.DataFrame): The model input, with the columns in MODEL_INPUT_COLUMNS order.
+
+        Returns:
+            list[float]: The prediction of every row of the model input.
+        """
+        predictions = np.asarray(self._score(model_input), dtype=np.float64)
+
+        # Models returning a (rows, 1) output are flattened, any other shape is a mismatch.
+        if predictions.ndim == 2 and predictions.shape[1] == 1:
+            predictions = predictions[:, 0]
+        if predictions.shape != (len(model_input),):
+            msg = (
+                f"Inference backend '{self.name}' returned predictions of shape {predictions.shape} "
+                f"for {len(model_input)} rows"
+            )
+            raise ValueError(msg)
+
+        return predictions.tolist()
+
+
+class _DitmPredictionPayload:
+    def __init__(
+        self, columns: list[str], index: list[int], data: list[Any], params: dict
+    ) -> None:
+        """Create a DITM predictions payload
+
+        Args:
+            columns (list[str]): The columns to perform inference on
+            index (list[str]): The indexes
+            data (list[Any]): The data
+            params (dict): The parameters
+
+        Returns:
+            DitmPredictionPayload: The payload
+        """
+        self.columns = columns
+        self.index = index
+        self.data = data
+        self.params = params
+
+    def as_json(self) -> dict:
+        data = {
+            "input_data": {
+                "columns": self.columns,
+                "index": self.index,
+                "data": self.data,
+            },
+            "params": self.params,
+        }
+
+        return data
+
+
+class AzureMLEndpointBackend(InferenceBackend):
+    """Backend which scores the model input with the prediction model deployed to an Azure ML managed endpoint."""
+
+    name = "azureml"
+
+    def __init__(self, endpoint_caller: HedgedEndpointCaller) -> None:
+        """Initializes the Azure ML endpoint backend.
+
+        Args:
+            endpoint_caller (HedgedEndpointCaller): The caller guarding the latency of the endpoint calls.
+        """
+        self.endpoint_caller = endpoint_caller
+        self._lock = Lock()
+        self._session: _BearerAuthenticatedSession | None = None
+
+    def _get_session(self) -> _BearerAuthenticatedSession:
+        """Retrieve the session to the endpoint, reused by all invocations so its token and connections are kept.
+
+        Returns:
+            _BearerAuthenticatedSession: The session.
+        """
+        with self._lock:
+            if self._session is None:
+                self._session = _BearerAuthenticatedSession(
+                    scopes=["https://ml.azure.com/.default"]
+                )
+
+        return self._session
+
+    def warm_up(self) -> None:
+        """Fetch the access token of the endpoint, if no valid token is cached yet."""
+        self._get_session().token_manager.get_access_token()
+
+    def _score(self, model_input: pd.DataFrame) -> list[float]:
+        session = self._get_session()
+        headers = {"Content-Type": "application/json", "Accept": "application/json"}
+        payload = _DitmPredictionPayload(
+            columns=MODEL_INPUT_COLUMNS,
+            index=list(range(len(model_input))),
+            data=model_input.values.tolist(),
+            params={},
+        )
+
+        def _request_predictions(timeout: float) -> list[float]:
+            response = session.post(
+                url=DITM_MODEL_API_URL,
+                headers=headers,
+                json=payload.as_json(),
+                timeout=timeout,
+            )
+            response.raise_for_status()
+            return [float(x) for x in response.json()]
+
+        return self.endpoint_caller.call(_request_predictions)
+
+
+class LocalModelBackend(InferenceBackend):
+    """Backend which scores the model input in-process on the CPU with an exported model artifact.
+
+    ONNX models (.onnx) are scored with onnxruntime, other artifacts are unpickled and scored
+    through their predict method (for example scikit-learn or LightGBM models). The model is
+    loaded once per worker and reused by all subsequent invocations.
+    """
+
+    name = "local"
+
+    def __init__(self, model_path: Path, num_threads: int) -> None:
+        """Initializes the local model backend.
+
+        Args:
+            model_path (Path): The path of the exported model artifact.
+            num_threads (int): The number of CPU threads used to score a batch. 0 to let the runtime decide.
+        """
+        self.model_path = model_path
+        self.num_threads = num_threads
+        self._lock = Lock()
+        self._model: Any = None
+
+    def _load_onnx_model(self) -> Any:
+        import onnxruntime
+
+        session_options = onnxruntime.SessionOptions()
+        session_options.intra_op_num_threads = self.num_threads
+        session_options.inter_op_num_threads = 1
+        return onnxruntime.InferenceSession(
+            str(self.model_path),
+            sess_options=session_options,
+            providers=["CPUExecutionProvider"],
+        )
+
+    def _load_pickled_model(self) -> Any:
+        # The artifact is deployed together with the BL, so it is trusted.
+        with self.model_path.open("rb") as model_file:
+            model = pickle.load(model_file)
+
+        if self.num_threads and "n_jobs" in getattr(model, "get_params", dict)():
+            model.set_params(n_jobs=self.num_threads)
+        return model
+
+    def warm_up(self) -> None:
+        """Load the model artifact, if it was not loaded yet."""
+        with self._lock:
+            if self._model is not None:
+                return
+
+            if not self.model_path.exists():
+                msg = f"Model artifact '{self.model_path}' does not exist"
+                raise ValueError(msg)
+
+            self._model = (
+                self._load_onnx_model()
+                if self.model_path.suffix == ".onnx"
+                else self._load_pickled_model()
+            )
+            logger.info("LocalModelBackend: Loaded model from %s", self.model_path)
+
+    def _score(self, model_input: pd.DataFrame) -> np.ndarray:
+        self.warm_up()
+
+        if self.model_path.suffix == ".onnx":
+            input_name = self._model.get_inputs()[0].name
+            return self._model.run(
+                None, {input_name: model_input.to_numpy(dtype=np.float32)}
+            )[0]
+
+        return self._model.predict(model_input)
+
+
+def _create_inference_backend(backend: str) -> InferenceBackend:
+    """Create the inference backend with the given name.
+
+    Args:
+        backend (str): The name of the backend, "azureml" or "local".
+
+    Returns:
+        InferenceBackend: The inference backend.
+    """
+    if backend == AzureMLEndpointBackend.name:
+        return AzureMLEndpointBackend(
+            endpoint_caller=HedgedEndpointCaller(
+                request_timeout_seconds=DITM_MODEL_API_TIMEOUT_SECONDS,
+                hedge_percentile=DITM_MODEL_API_HEDGE_PERCENTILE,
+                hedge_delay_seconds=DITM_MODEL_API_HEDGE_DELAY_SECONDS,
+                breaker=CircuitBreaker(
+                    failure_threshold=DITM_MODEL_API_BREAKER_FAILURES,
+                    cooldown_seconds=DITM_MODEL_API_BREAKER_COOLDOWN_SECONDS,
+                ),
+            )
+        )
+
+    if backend == LocalModelBackend.name:
+        return LocalModelBackend(
+            model_path=Path(LOCAL_MODEL_PATH), num_threads=LOCAL_MODEL_THREADS
+        )
+
+    msg = f"Unknown inference backend '{backend}'"
+    raise ValueError(msg)
+
+
+@cache
+def get_inference_backend() -> InferenceBackend:
+    """Retrieve the configured inference backend, created on first use.
+
+    The backend is created once per worker, on the first prediction or prewarm. A misconfigured
+    backend fails that call instead of the import of the function app.
+
+    Returns:
+        InferenceBackend: The inference backend of INFERENCE_BACKEND.
+    """
+    return _create_inference_backend(INFERENCE_BACKEND)
@@ -0,0 +1,137 @@
+"""Module containing a cache for the results of the prediction model."""
+
+import hashlib
+from collections import OrderedDict
+from datetime import timedelta
+from threading import Lock
+
+import numpy as np
+import pandas as pd
+from influxdb_client.client.query_api_async import QueryApiAsync
+from influxdb_client.client.write_api_async import WriteApiAsync
+
+from src.config import DITM_MODEL_VERSION, INFERENCE_BACKEND
+from src.infrastructure.azureml.predictions import (
+    _prepare_model_input,
+    _to_predicted_grid_asset_loads,
+)
+from src.infrastructure.influxdb.inference_cache_store import (
+    retrieve_cached_predictions,
+    store_cached_predictions,
+)
+from src.logger import logger
+from src.models.predicted_load import PredictedGridAssetLoad
+
+
+def inference_key(features: pd.DataFrame, model_version: str) -> str:
+    """Calculate the key under which the predictions for the given features are cached.
+
+    The key is a hash of the model input (the feature matrix the model is called with), the
+    timestamps of the features and the model version.
+
+    Args:
+        features (pd.DataFrame): The features to make prediction(s) for.
+        model_version (str): The version of the prediction model.
+
+    Returns:
+        str: The inference key.
+    """
+    model_input = _prepare_model_input(features)
+    timestamps = pd.to_datetime(features["datetime"], utc=True)
+
+    digest = hashlib.sha256(model_version.encode())
+    digest.update(",".join(model_input.columns).encode())
+    digest.update(
+        np.ascontiguousarray(model_input.to_numpy(dtype=np.float64)).tobytes()
+    )
+    digest.update(
+        pd.DatetimeIndex(timestamps).as_unit("ns").to_numpy(dtype=np.int64).tobytes()
+    )
+    return digest.hexdigest()
+
+
+class InferenceCache:
+    """Cache of model predictions keyed by a hash of the model input and the model version.
+
+    Predictions are cached in memory and in the audit bucket, so retries, re-runs and replays
+    of features which were already scored return the earlier predictions without calling the model.
+    """
+
+    def __init__(self, model_version: str, max_entries: int = 32) -> None:
+        """Initializes the inference cache.
+
+        Args:
+            model_version (str): The version of the prediction model.
+            max_entries (int): The maximum number of predictions to keep in memory. Defaults to 32.
+        """
+        self.model_version = model_version
+        self._max_entries = max_entries
+        self._lock = Lock()
+        self._predictions: OrderedDict[str, list[float]] = OrderedDict()
+
+    def _remember(self, key: str, predictions: list[float]) -> None:
+        with self._lock:
+            self._predictions[key] = predictions
+            self._predictions.move_to_end(key)
+            while len(self._predictions) > self._max_entries:
+                self._predictions.popitem(last=False)
+
+    async def get(
+        self, query_api: QueryApiAsync, features: pd.DataFrame
+    ) -> list[PredictedGridAssetLoad] | None:
+        """Retrieve the cached predictions for the given features.
+
+        Args:
+            query_api (QueryApiAsync): The read-only connection to the database.
+            features (pd.DataFrame): The features to retrieve the predictions for.
+
+        Returns:
+            list[PredictedGridAssetLoad] | None: The cached predictions. None if the features were not scored before.
+        """
+        key = inference_key(features, self.model_version)
+
+        with self._lock:
+            predictions = self._predictions.get(key)
+
+        if predictions is None:
+            timestamps = pd.to_datetime(features["datetime"], utc=True)
+            cached = await retrieve_cached_predictions(
+                query_api,
+                key,
+                timestamps.min().to_pydatetime(),
+                (timestamps.max() + timedelta(minutes=15)).to_pydatetime(),
+            )
+            if len(cached) != len(features):
+                return None
+
+            predictions = cached.values["WAARDE"].tolist()
+            self._remember(key, predictions)
+            logger.info("InferenceCache: Serving predictions from the audit bucket.")
+        else:
+            logger.info("InferenceCache: Serving predictions from memory.")
+
+        return _to_predicted_grid_asset_loads(features, predictions)
+
+    async def put(
+        self,
+        write_api: WriteApiAsync,
+        features: pd.DataFrame,
+        predicted_loads: list[PredictedGridAssetLoad],
+    ) -> None:
+        """Cache the predictions made for the given features.
+
+        Args:
+            write_api (WriteApiAsync): The write connection to the database.
+            features (pd.DataFrame): The features the predictions were made for.
+            predicted_loads (list[PredictedGridAssetLoad]): The predictions.
+        """
+        key = inference_key(features, self.model_version)
+        self._remember(key, [load.load for load in predicted_loads])
+        await store_cached_predictions(
+            write_api, key, self.model_version, predicted_loads
+        )
+
+
+inference_cache = InferenceCache(
+    model_version=f"{INFERENCE_BACKEND}:{DITM_MODEL_VERSION}"
+)
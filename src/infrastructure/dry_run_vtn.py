@@ -0,0 +1,152 @@
+"""Module which implements a dry-run stand-in of the VTN, keeping the events of the BL in memory."""
+
+from datetime import UTC, datetime
+from uuid import uuid4
+
+from openadr3_client._vtn.interfaces.events import ReadWriteEventsInterface
+from openadr3_client._vtn.interfaces.filters import PaginationFilter, TargetFilter
+from openadr3_client.bl._client import BusinessLogicClient
+from openadr3_client.models.event.event import DeletedEvent, ExistingEvent, NewEvent
+
+from src.logger import logger
+
+
+class DryRunEventsInterface(ReadWriteEventsInterface):
+    """In-memory implementation of the events interface of the VTN.
+
+    Events are serialized and validated like the HTTP interface does, so a dry run spends the
+    same CPU time on the events as a run against the VTN, without publishing them.
+    """
+
+    def __init__(self) -> None:
+        """Initializes the DryRunEventsInterface."""
+        self.events: dict[str, ExistingEvent] = {}
+
+    def get_events(
+        self,
+        target: TargetFilter | None,
+        pagination: PaginationFilter | None,
+        program_id: str | None,
+    ) -> tuple[ExistingEvent, ...]:
+        """Retrieve the events matching the given filters.
+
+        Args:
+            target (TargetFilter | None): The target to filter on.
+            pagination (PaginationFilter | None): The pagination to apply (ignored).
+            program_id (str | None): The program id to filter on.
+
+        Returns:
+            tuple[ExistingEvent, ...]: The matching events.
+        """
+        return tuple(
+            event
+            for event in self.events.values()
+            if (program_id is None or event.program_id == program_id)
+            and (
+                target is None
+                or any(
+                    event_target.type == target.target_type
+                    and set(event_target.values) & set(target.target_values)
+                    for event_target in event.targets or ()
+                )
+            )
+        )
+
+    def get_event_by_id(self, event_id: str) -> ExistingEvent:
+        """Retrieve the event with the given identifier.
+
+        Args:
+            event_id (str): The identifier of the event.
+
+        Returns:
+            ExistingEvent: The event.
+        """
+        if event_id not in self.events:
+            msg = f"Event {event_id} does not exist in the dry-run VTN"
+            raise ValueError(msg)
+
+        return self.events[event_id]
+
+    def create_event(self, new_event: NewEvent) -> ExistingEvent:
+        """Create an event from the new event.
+
+        Args:
+            new_event (NewEvent): The new event to create.
+
+        Returns:
+            ExistingEvent: The created event.
+        """
+        with new_event.with_creation_guard():
+            created_at = datetime.now(tz=UTC).isoformat()
+            created_event = ExistingEvent.model_validate(
+                {
+                    **new_event.model_dump(by_alias=True, mode="json"),
+                    "id": str(uuid4()),
+                    "createdDateTime": created_at,
+                    "modificationDateTime": created_at,
+                }
+            )
+
+        self.events[created_event.id] = created_event
+        logger.info(
+            "DryRunVTN: Created event %s with %d intervals",
+            created_event.id,
+            len(created_event.intervals or ()),
+        )
+        return created_event
+
+    def update_event_by_id(
+        self, event_id: str, updated_event: ExistingEvent
+    ) -> ExistingEvent:
+        """Update the event with the given identifier.
+
+        Args:
+            event_id (str): The identifier of the event to update.
+            updated_event (ExistingEvent): The updated event.
+
+        Returns:
+            ExistingEvent: The updated event.
+        """
+        if event_id != updated_event.id:
+            msg = f"Event id {event_id} does not match the id of the updated event {updated_event.id}"
+            raise ValueError(msg)
+
+        self.get_event_by_id(event_id)
+        self.events[event_id] = ExistingEvent.model_validate(
+            updated_event.model_dump(by_alias=True, mode="json")
+        )
+        logger.info("DryRunVTN: Updated event %s", event_id)
+        return self.events[event_id]
+
+    def delete_event_by_id(self, event_id: str) -> DeletedEvent:
+        """Delete the event with the given identifier.
+
+        Args:
+            event_id (str): The identifier of the event to delete.
+
+        Returns:
+            DeletedEvent: The deleted event.
+        """
+        deleted_event = self.get_event_by_id(event_id)
+        del self.events[event_id]
+        logger.info("DryRunVTN: Deleted event %s", event_id)
+        return DeletedEvent.model_validate(
+            deleted_event.model_dump(by_alias=True, mode="json")
+        )
+
+
+def create_dry_run_bl_client() -> BusinessLogicClient:
+    """Create a BL client against an in-memory dry-run VTN.
+
+    Only the events of the VTN are used by the BL, the other resources are not available.
+
+    Returns:
+        BusinessLogicClient: The BL client.
+    """
+    return BusinessLogicClient(
+        events=DryRunEventsInterface(),
+        programs=None,  # type: ignore[arg-type]
+        reports=None,  # type: ignore[arg-type]
+        vens=None,  # type: ignore[arg-type]
+        subscriptions=None,  # type: ignore[arg-type]
+    )
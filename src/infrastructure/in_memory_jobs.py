@@ -0,0 +1,109 @@
+"""Module which implements an in-memory queue and job tracker to run fanned out runs locally."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+
+from src.application.fan_out import AssetJob, JobTrackerBase
+
+
+class InMemoryJobQueue:
+    """In-memory stand-in of the storage queue of the asset jobs.
+
+    Messages are processed by a number of concurrent workers, like the queue-triggered
+    function processes them on the instances of the function app.
+    """
+
+    def __init__(self) -> None:
+        """Initializes the InMemoryJobQueue."""
+        self._messages: asyncio.Queue[str] = asyncio.Queue()
+
+    def send(self, messages: list[str]) -> None:
+        """Enqueue the given messages.
+
+        Args:
+            messages (list[str]): The messages to enqueue.
+        """
+        for message in messages:
+            self._messages.put_nowait(message)
+
+    async def drain(
+        self, handler: Callable[[str], Awaitable[None]], concurrency: int = 4
+    ) -> list[str]:
+        """Process the enqueued messages until the queue is empty.
+
+        Args:
+            handler (Callable[[str], Awaitable[None]]): The handler of a single message.
+            concurrency (int): The number of messages processed concurrently. Defaults to 4.
+
+        Returns:
+            list[str]: The messages of which the handler failed (the poison messages).
+        """
+        poison_messages: list[str] = []
+
+        async def _worker() -> None:
+            while not self._messages.empty():
+                message = self._messages.get_nowait()
+                try:
+                    await handler(message)
+                except Exception:
+                    poison_messages.append(message)
+
+        await asyncio.gather(*(_worker() for _ in range(concurrency)))
+        return poison_messages
+
+
+class InMemoryJobTracker(JobTrackerBase):
+    """In-memory implementation of the job tracker."""
+
+    def __init__(self) -> None:
+        """Initializes the InMemoryJobTracker."""
+        # The enqueue time and whether it succeeded (None while unfinished) per (run, asset).
+        self._states: dict[tuple[str, str], tuple[datetime, bool | None]] = {}
+
+    async def record_enqueued(self, jobs: list[AssetJob]) -> None:
+        """Record that the assets of the given jobs were enqueued.
+
+        Args:
+            jobs (list[AssetJob]): The enqueued jobs.
+        """
+        enqueued_at = datetime.now(tz=UTC)
+        for job in jobs:
+            for asset_id in job.asset_ids:
+                self._states[(job.run_id, asset_id)] = (enqueued_at, None)
+
+    async def record_finished(
+        self, run_id: str, asset_id: str, succeeded: bool
+    ) -> None:
+        """Record that an asset of a run finished.
+
+        Args:
+            run_id (str): The identifier of the run.
+            asset_id (str): The EAN number of the asset.
+            succeeded (bool): Whether the events of the asset were published.
+        """
+        enqueued_at, _ = self._states.get(
+            (run_id, asset_id), (datetime.now(tz=UTC), None)
+        )
+        self._states[(run_id, asset_id)] = (enqueued_at, succeeded)
+
+    async def get_stragglers(
+        self, enqueued_after: datetime, enqueued_before: datetime
+    ) -> dict[str, list[str]]:
+        """Retrieve the assets which were enqueued in the given period, but did not finish successfully.
+
+        Args:
+            enqueued_after (datetime): The start (inclusive) of the period the assets were enqueued in.
+            enqueued_before (datetime): The end (exclusive) of the period the assets were enqueued in.
+
+        Returns:
+            dict[str, list[str]]: The EAN numbers of the unfinished or failed assets per run.
+        """
+        stragglers: dict[str, list[str]] = {}
+        for (run_id, asset_id), (enqueued_at, succeeded) in self._states.items():
+            if succeeded is False or (
+                succeeded is None and enqueued_after <= enqueued_at < enqueued_before
+            ):
+                stragglers.setdefault(run_id, []).append(asset_id)
+
+        return stragglers
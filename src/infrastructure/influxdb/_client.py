@@ -1,9 +1,17 @@
 """Module containing logic for managing database sessions."""
 
+import asyncio
+from weakref import WeakKeyDictionary
+
 from influxdb_client.client.influxdb_client_async import InfluxDBClientAsync
 
 from src.config import INFLUXDB_ORG, INFLUXDB_TOKEN, INFLUXDB_URL
 
+# The shared client of every event loop. The connections of a client are bound to its event loop.
+_shared_clients: WeakKeyDictionary[asyncio.AbstractEventLoop, InfluxDBClientAsync] = (
+    WeakKeyDictionary()
+)
+
 
 def create_db_client() -> InfluxDBClientAsync:
     """Creates an InfluxDB client with the appropriate configuration.
@@ -11,4 +19,23 @@ def create_db_client() -> InfluxDBClientAsync:
     Returns:
         InfluxDBClient: An initialized InfluxDB client.
     """
-    return InfluxDBClientAsync(url=INFLUXDB_URL, token=INFLUXDB_TOKEN, org=INFLUXDB_ORG)
+    # Query results are transferred gzip-compressed, large dalidata queries are mostly repetitive CSV.
+    return InfluxDBClientAsync(
+        url=INFLUXDB_URL, token=INFLUXDB_TOKEN, org=INFLUXDB_ORG, enable_gzip=True
+    )
+
+
+def get_db_client() -> InfluxDBClientAsync:
+    """Retrieve the InfluxDB client shared by the invocations on the running event loop.
+
+    The client keeps its connections open between invocations, so only the first invocation
+    (or the prewarm) pays for setting them up.
+
+    Returns:
+        InfluxDBClientAsync: The shared InfluxDB client.
+    """
+    loop = asyncio.get_running_loop()
+    if loop not in _shared_clients:
+        _shared_clients[loop] = create_db_client()
+
+    return _shared_clients[loop]
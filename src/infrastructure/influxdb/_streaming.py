@@ -0,0 +1,232 @@
+"""Module containing a columnar ingestion path for InfluxDB query results.
+
+Query results are requested as plain CSV (without annotations) and decoded chunk-wise straight into
+typed NumPy columns, timestamps as int64 nanoseconds since the epoch (UTC) and values as float64.
+This avoids the intermediate pandas dataframe and the python objects created per record by the
+default result parsers of the InfluxDB client.
+"""
+
+import hashlib
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+from influxdb_client.client.query_api_async import QueryApiAsync
+from influxdb_client.domain.dialect import Dialect
+
+from src.config import INFLUXDB_ORG
+from src.logger import logger
+
+_CSV_DIALECT = Dialect(
+    header=True, delimiter=",", annotations=[], date_time_format="RFC3339Nano"
+)
+
+# Columns added by InfluxDB to every result table which never contain values.
+_META_COLUMNS = frozenset(
+    {b"", b"result", b"table", b"_start", b"_stop", b"_measurement", b"_field"}
+)
+
+_DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+@dataclass
+class IngestionStats:
+    """Statistics of a single streamed query."""
+
+    rows: int = 0
+    bytes_parsed: int = 0
+    chunks: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class TimeSeriesColumns:
+    """Time series decoded from a query result into aligned typed columns."""
+
+    timestamps: np.ndarray
+    """The timestamps of the rows as int64 nanoseconds since the epoch (UTC)."""
+
+    values: dict[str, np.ndarray]
+    """The float64 value columns by column name, aligned with the timestamps."""
+
+    stats: IngestionStats = field(default_factory=IngestionStats)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def content_hash(self) -> str:
+        """Calculate a hash over the timestamps and value columns.
+
+        Returns:
+            str: The hex digest of the content hash.
+        """
+        digest = hashlib.sha256(np.ascontiguousarray(self.timestamps).tobytes())
+        for column in sorted(self.values):
+            digest.update(column.encode())
+            digest.update(np.ascontiguousarray(self.values[column]).tobytes())
+        return digest.hexdigest()
+
+
+class _CsvColumnDecoder:
+    """Incremental decoder of the plain CSV query result format of InfluxDB."""
+
+    def __init__(self, value_columns: list[str] | None) -> None:
+        """Initializes the decoder.
+
+        Args:
+            value_columns (list[str] | None): The value columns to decode. If None, all
+                non-meta columns of the result are decoded.
+        """
+        self._value_columns = (
+            None if value_columns is None else [c.encode() for c in value_columns]
+        )
+        self._time_position: int | None = None
+        self._value_positions: dict[bytes, int] = {}
+        self._timestamps: list[np.ndarray] = []
+        self._values: dict[bytes, list[np.ndarray]] = {}
+        self._row_count = 0
+        self._remainder = b""
+
+    def _read_header(self, header: list[bytes]) -> None:
+        self._time_position = header.index(b"_time")
+        value_columns = self._value_columns or [
+            c for c in header if c not in _META_COLUMNS and c != b"_time"
+        ]
+        self._value_positions = {c: header.index(c) for c in value_columns}
+
+    def _decode_rows(self, rows: list[list[bytes]]) -> None:
+        if not rows or self._time_position is None:
+            return
+
+        # InfluxDB writes RFC3339 timestamps in UTC, strip the 'Z' so NumPy parses them as naive UTC.
+        timestamps = np.array([row[self._time_position][:-1] for row in rows])
+        self._timestamps.append(timestamps.astype("datetime64[ns]").view("int64"))
+
+        for column, position in self._value_positions.items():
+            values = np.array([row[position] or b"nan" for row in rows])
+            try:
+                decoded_values = values.astype(np.float64)
+            except ValueError:
+                if self._value_columns is not None:
+                    raise
+                # Non-numeric (tag) column, only numeric columns are decoded when no columns are requested.
+                continue
+
+            if column not in self._values:
+                # Column first seen in this table, it has no values for the earlier rows.
+                self._values[column] = [np.full(self._row_count, np.nan)]
+            self._values[column].append(decoded_values)
+
+        self._row_count += len(rows)
+
+        # Columns missing from this table have no values for its rows.
+        for decoded in self._values.values():
+            missing_rows = self._row_count - sum(len(d) for d in decoded)
+            if missing_rows:
+                decoded.append(np.full(missing_rows, np.nan))
+
+    def feed(self, chunk: bytes) -> None:
+        """Decode all complete lines of the chunk, keeping a trailing partial line for the next chunk.
+
+        Args:
+            chunk (bytes): The chunk of the response body.
+        """
+        lines = (self._remainder + chunk).split(b"\n")
+        self._remainder = lines.pop()
+
+        rows: list[list[bytes]] = []
+        for line in lines:
+            fields = line.rstrip(b"\r").split(b",")
+
+            if len(fields) < 2:
+                # Empty line separating the tables of the result.
+                continue
+
+            if fields[1] == b"result":
+                # A new table with a (possibly) different schema starts.
+                self._decode_rows(rows)
+                rows = []
+                self._read_header(fields)
+                continue
+
+            rows.append(fields)
+
+        self._decode_rows(rows)
+
+    def finish(self) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+        """Decode the remaining data and return the decoded columns.
+
+        Returns:
+            tuple[np.ndarray, dict[str, np.ndarray]]: The timestamps and the value columns.
+        """
+        if self._remainder:
+            self.feed(b"\n")
+
+        timestamps = (
+            np.concatenate(self._timestamps)
+            if self._timestamps
+            else np.empty(0, dtype=np.int64)
+        )
+        columns = self._value_columns or list(self._values)
+        values = {
+            column.decode(): (
+                np.concatenate(self._values[column])
+                if column in self._values
+                else np.full(len(timestamps), np.nan)
+            )
+            for column in columns
+        }
+
+        return timestamps, values
+
+
+async def stream_time_series(
+    query_api: QueryApiAsync,
+    query: str,
+    value_columns: list[str] | None = None,
+    params: dict | None = None,
+    chunk_size: int = _DEFAULT_CHUNK_SIZE,
+) -> TimeSeriesColumns:
+    """Execute the Flux query and decode its result chunk-wise into typed columns.
+
+    Args:
+        query_api (QueryApiAsync): The read-only connection to the influx database.
+        query (str): The Flux query to execute.
+        value_columns (list[str] | None): The value columns to decode. If None, all non-meta
+            columns of the result are decoded. Defaults to None.
+        params (dict | None): The parameters of the Flux query. Defaults to None.
+        chunk_size (int): The size of the chunks the response is decoded in. Defaults to 1 MiB.
+
+    Returns:
+        TimeSeriesColumns: The decoded time series.
+    """
+    started_at = time.perf_counter()
+    stats = IngestionStats()
+    decoder = _CsvColumnDecoder(value_columns)
+
+    # The raw query method is the only public query method of the client which does not parse the result
+    # into python objects per record. It buffers the response body, which is then decoded chunk-wise.
+    body = (
+        await query_api.query_raw(
+            query, org=INFLUXDB_ORG, dialect=_CSV_DIALECT, params=params or {}
+        )
+    ).encode()
+    for offset in range(0, len(body), chunk_size):
+        chunk = body[offset : offset + chunk_size]
+        stats.chunks += 1
+        stats.bytes_parsed += len(chunk)
+        decoder.feed(chunk)
+
+    timestamps, values = decoder.finish()
+    stats.rows = len(timestamps)
+    stats.seconds = time.perf_counter() - started_at
+
+    logger.info(
+        "stream_time_series: Parsed %d rows (%d bytes in %d chunks) in %.3f seconds.",
+        stats.rows,
+        stats.bytes_parsed,
+        stats.chunks,
+        stats.seconds,
+    )
+
+    return TimeSeriesColumns(timestamps=timestamps, values=values, stats=stats)
@@ -0,0 +1,107 @@
+"""Module which contains functions to store and retrieve the states of the asset jobs of fanned out runs."""
+
+from datetime import UTC, datetime
+from enum import IntEnum
+
+from influxdb_client import Point
+from influxdb_client.client.query_api_async import QueryApiAsync
+from influxdb_client.client.write_api_async import WriteApiAsync
+
+from src.config import PREDICTED_TRAFO_LOAD_BUCKET
+from src.infrastructure.influxdb.flux_queries import (
+    FluxQueryTemplate,
+    compile_query,
+    register_query_template,
+)
+
+_ASSET_JOBS_MEASUREMENT = "bl_asset_jobs"
+
+# The last state of every asset of a run, kept for the assets which were not published (yet).
+_UNFINISHED_ASSETS_QUERY = register_query_template(
+    FluxQueryTemplate(
+        name="unfinished_assets",
+        source="""from(bucket: p_bucket)
+    |> range(start: p_start, stop: p_stop)
+    |> filter(fn: (r) => r["_measurement"] == "bl_asset_jobs")
+    |> filter(fn: (r) => r["_field"] == "state")""",
+        shape="""|> group(columns: ["run_id", "asset_id"])
+    |> sort(columns: ["_time"])
+    |> last()
+    |> filter(fn: (r) => r["_value"] != 1)
+    |> group()""",
+        default_params={"p_bucket": PREDICTED_TRAFO_LOAD_BUCKET},
+        downsampling=False,
+    )
+)
+
+
+class AssetJobState(IntEnum):
+    """The state of an asset of a fanned out run."""
+
+    ENQUEUED = 0
+    SUCCEEDED = 1
+    FAILED = 2
+
+
+async def store_asset_job_states(
+    write_api: WriteApiAsync,
+    run_id: str,
+    asset_ids: list[str],
+    state: AssetJobState,
+    time: datetime,
+) -> None:
+    """Write the state of assets of a run to the audit bucket.
+
+    Args:
+        write_api (WriteApi): The write connection to the database.
+        run_id (str): The identifier of the run.
+        asset_ids (list[str]): The EAN numbers of the assets.
+        state (AssetJobState): The state of the assets.
+        time (datetime): The time the assets reached the state.
+    """
+    points = [
+        Point(_ASSET_JOBS_MEASUREMENT)
+        .tag("run_id", run_id)
+        .tag("asset_id", asset_id)
+        .field("state", int(state))
+        .time(time)
+        for asset_id in asset_ids
+    ]
+
+    await write_api.write(bucket=PREDICTED_TRAFO_LOAD_BUCKET, record=points)
+
+
+async def retrieve_unfinished_assets(
+    query_api: QueryApiAsync, enqueued_after: datetime, enqueued_before: datetime
+) -> dict[str, list[str]]:
+    """Retrieve the assets enqueued in the given period which were not published (yet).
+
+    Args:
+        query_api (QueryApiAsync): The read-only connection to the database.
+        enqueued_after (datetime): The start (inclusive) of the period the assets were enqueued in.
+        enqueued_before (datetime): The end (exclusive) of the period the assets were enqueued in.
+
+    Returns:
+        dict[str, list[str]]: The EAN numbers of the unfinished or failed assets per run.
+    """
+    # The states are decoded per record, as the run and asset of a state are tags of the record.
+    tables = await query_api.query(
+        compile_query(_UNFINISHED_ASSETS_QUERY.name),
+        params=_UNFINISHED_ASSETS_QUERY.default_params
+        | {"p_start": enqueued_after, "p_stop": datetime.now(tz=UTC)},
+    )
+
+    unfinished_assets: dict[str, list[str]] = {}
+    for table in tables:
+        for record in table.records:
+            # Assets still enqueued are only late once they were enqueued before the given end.
+            if (
+                record.get_value() == AssetJobState.ENQUEUED
+                and record.get_time() >= enqueued_before
+            ):
+                continue
+            unfinished_assets.setdefault(record["run_id"], []).append(
+                record["asset_id"]
+            )
+
+    return unfinished_assets
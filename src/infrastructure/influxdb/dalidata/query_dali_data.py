@@ -1,37 +1,107 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 
-import pandas as pd
-
-from src.config import INFLUXDB_ORG, DALIDATA_BUCKET_NAME
+from src.config import DALIDATA_BUCKET_NAME
 from influxdb_client.client.query_api_async import QueryApiAsync
+from src.infrastructure.influxdb._streaming import TimeSeriesColumns
+from src.infrastructure.influxdb.flux_queries import (
+    FluxQueryTemplate,
+    query_time_series,
+    register_query_template,
+)
+
+_DALI_DATA_QUERY = register_query_template(
+    FluxQueryTemplate(
+        name="dali_data",
+        source="""from(bucket: p_bucket)
+            |> range(start: p_start, stop: p_stop)
+            |> filter(fn: (r) => r["_measurement"] == "WAARDE")
+            |> filter(fn: (r) => r["_field"] == "WAARDE")""",
+        shape="""|> group(columns: [])
+            |> sort(columns: ["_time"])
+            |> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")
+            |> keep(columns: ["_time", "WAARDE"])""",
+        value_columns=("WAARDE",),
+        default_params={"p_bucket": DALIDATA_BUCKET_NAME},
+    )
+)
+
+_DALI_DAILY_AGGREGATES_QUERY = register_query_template(
+    FluxQueryTemplate(
+        name="dali_daily_aggregates",
+        source="""data = from(bucket: p_bucket)
+            |> range(start: p_start, stop: p_stop)
+            |> filter(fn: (r) => r["_measurement"] == "WAARDE")
+            |> filter(fn: (r) => r["_field"] == "WAARDE")
+            |> group(columns: [])
+
+        daily_sum = data
+            |> aggregateWindow(every: 1d, fn: sum, createEmpty: false)
+            |> set(key: "_field", value: "sum")
+        daily_count = data
+            |> aggregateWindow(every: 1d, fn: count, createEmpty: false)
+            |> toFloat()
+            |> set(key: "_field", value: "count")
+
+        union(tables: [daily_sum, daily_count])
+            |> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")
+            |> sort(columns: ["_time"])""",
+        value_columns=("sum", "count"),
+        default_params={"p_bucket": DALIDATA_BUCKET_NAME},
+        downsampling=False,
+    )
+)
 
 
 async def retrieve_dali_data_between(
     query_api: QueryApiAsync,
     start_date_inclusive: datetime,
     end_date_inclusive: datetime,
-) -> pd.DataFrame:
+    every: timedelta | None = None,
+) -> TimeSeriesColumns:
     """Retrieve dalidata from InfluxDB between the given dates.
 
+    The result is streamed and decoded straight into typed columns, which keeps peak memory low
+    when retrieving a year of dalidata.
+
     Args:
         start_date_inclusive (datetime): The start date (inclusive)
         end_date_inclusive (datetime): The end date (inclusive)
+        every (timedelta | None): The window to average the dalidata over server-side. None to
+            retrieve the raw quarter-hour values. Defaults to None.
 
     Returns:
-        pd.DataFrame: The dataframe containing dalidata for the date range.
+        TimeSeriesColumns: The timestamps and 'WAARDE' values of the dalidata for the date range.
     """
-    start_date_str = start_date_inclusive.strftime(format="%Y-%m-%dT%H:%M:%SZ")
-    end_date_str = end_date_inclusive.strftime(format="%Y-%m-%dT%H:%M:%SZ")
+    return await query_time_series(
+        query_api,
+        _DALI_DATA_QUERY.name,
+        start_date_inclusive,
+        end_date_inclusive,
+        every=every,
+    )
 
-    query = f"""from(bucket: "{DALIDATA_BUCKET_NAME}")
-            |> range(start: {start_date_str}, stop: {end_date_str})
-            |> filter(fn: (r) => r["_measurement"] == "WAARDE")
-            |> filter(fn: (r) => r["_field"] == "WAARDE")
-            |> group(columns: [])
-            |> sort(columns: ["_time"])
-            |> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")
-    """  # noqa: E501
 
-    df = await query_api.query_data_frame(query=query, org=INFLUXDB_ORG)
+async def retrieve_dali_daily_aggregates_between(
+    query_api: QueryApiAsync,
+    start_date_inclusive: datetime,
+    end_date_inclusive: datetime,
+) -> TimeSeriesColumns:
+    """Retrieve the daily sum and count of the dalidata from InfluxDB between the given dates.
+
+    The aggregation is done server-side, so only a single row per day is transferred. The result
+    changes whenever dalidata in the range is added or corrected, which makes it usable as a
+    cheap fingerprint of the dalidata.
 
-    return df.rename(columns={"_time": "datetime"})
+    Args:
+        start_date_inclusive (datetime): The start date (inclusive)
+        end_date_inclusive (datetime): The end date (inclusive)
+
+    Returns:
+        TimeSeriesColumns: The timestamps and the daily 'sum' and 'count' of the dalidata.
+    """
+    return await query_time_series(
+        query_api,
+        _DALI_DAILY_AGGREGATES_QUERY.name,
+        start_date_inclusive,
+        end_date_inclusive,
+    )
@@ -0,0 +1,161 @@
+"""Module containing the shared, parameterized Flux query layer.
+
+Data sources register a named query template once. Templates reference their inputs as Flux
+parameters (``p_bucket``, ``p_start``, ``p_stop``, ...) instead of interpolating them into the
+query text, so the compiled query text of a template is identical for every execution and can be
+reused. Results are decoded by a single decoder into aligned timestamp/value arrays.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any
+
+from influxdb_client.client.query_api_async import QueryApiAsync
+
+from src.infrastructure.influxdb._streaming import (
+    TimeSeriesColumns,
+    stream_time_series,
+)
+
+# Aggregate functions which can be used for server-side downsampling.
+_DOWNSAMPLE_FUNCTIONS = frozenset(
+    {"mean", "median", "min", "max", "sum", "last", "count"}
+)
+
+
+@dataclass(frozen=True)
+class FluxQueryTemplate:
+    """A named, parameterized Flux query.
+
+    The query is split into a source part, which selects the raw points, and a shape part, which
+    shapes the selected points into the result table. When downsampling, the aggregation is placed
+    between both parts.
+    """
+
+    name: str
+    """The name the template is registered under."""
+
+    source: str
+    """The Flux selecting the raw points. Always has the parameters p_bucket, p_start and p_stop."""
+
+    shape: str = ""
+    """The Flux shaping the selected points into the result table."""
+
+    value_columns: tuple[str, ...] | None = None
+    """The value columns of the result. If None, all numeric non-meta columns are decoded."""
+
+    default_params: dict[str, Any] = field(default_factory=dict)
+    """Default values of the parameters of the query, for example the bucket."""
+
+    downsampling: bool = True
+    """Whether the query can be downsampled server-side."""
+
+
+_query_templates: dict[str, FluxQueryTemplate] = {}
+
+
+def register_query_template(template: FluxQueryTemplate) -> FluxQueryTemplate:
+    """Register a query template under its name.
+
+    Args:
+        template (FluxQueryTemplate): The query template to register.
+
+    Returns:
+        FluxQueryTemplate: The registered query template.
+    """
+    if template.name in _query_templates:
+        msg = f"A query template named '{template.name}' is already registered"
+        raise ValueError(msg)
+
+    _query_templates[template.name] = template
+    return template
+
+
+def get_query_template(name: str) -> FluxQueryTemplate:
+    """Retrieve a registered query template by name.
+
+    Args:
+        name (str): The name of the query template.
+
+    Returns:
+        FluxQueryTemplate: The query template.
+    """
+    try:
+        return _query_templates[name]
+    except KeyError:
+        msg = f"No query template named '{name}' is registered"
+        raise ValueError(msg) from None
+
+
+@lru_cache(maxsize=64)
+def compile_query(name: str, downsample_fn: str | None = None) -> str:
+    """Compile the Flux query text of a registered template.
+
+    Args:
+        name (str): The name of the query template.
+        downsample_fn (str | None): The aggregate function to downsample with, using the window
+            given by the p_every parameter. None to not downsample. Defaults to None.
+
+    Returns:
+        str: The Flux query text.
+    """
+    template = get_query_template(name)
+    stages = [template.source]
+
+    if downsample_fn is not None:
+        if not template.downsampling:
+            msg = f"Query template '{name}' does not support downsampling"
+            raise ValueError(msg)
+        if downsample_fn not in _DOWNSAMPLE_FUNCTIONS:
+            msg = f"Unsupported downsampling function '{downsample_fn}'"
+            raise ValueError(msg)
+        stages.append(
+            f"|> aggregateWindow(every: p_every, fn: {downsample_fn}, createEmpty: false)"
+        )
+
+    stages.append(template.shape)
+    return "\n".join(stage for stage in stages if stage)
+
+
+async def query_time_series(
+    query_api: QueryApiAsync,
+    name: str,
+    start_date_inclusive: datetime,
+    end_date_exclusive: datetime,
+    every: timedelta | None = None,
+    downsample_fn: str = "mean",
+    **params: Any,
+) -> TimeSeriesColumns:
+    """Execute a registered query template and decode the result into aligned typed columns.
+
+    Args:
+        query_api (QueryApiAsync): The read-only connection to the influx database.
+        name (str): The name of the query template.
+        start_date_inclusive (datetime): The start date (inclusive).
+        end_date_exclusive (datetime): The end date (exclusive).
+        every (timedelta | None): The window to downsample the result to server-side. None to
+            retrieve the raw points. Defaults to None.
+        downsample_fn (str): The aggregate function to downsample with. Defaults to "mean".
+        **params (Any): Additional parameters of the query, overriding the template defaults.
+
+    Returns:
+        TimeSeriesColumns: The decoded time series.
+    """
+    template = get_query_template(name)
+    query_params = template.default_params | params
+    query_params |= {"p_start": start_date_inclusive, "p_stop": end_date_exclusive}
+
+    if every is not None:
+        query_params["p_every"] = every
+
+    value_columns = (
+        list(template.value_columns) if template.value_columns is not None else None
+    )
+
+    return await stream_time_series(
+        query_api=query_api,
+        query=compile_query(name, downsample_fn if every is not None else None),
+        value_columns=value_columns,
+        params=query_params,
+    )
@@ -0,0 +1,143 @@
+"""Module which contains functions to compare audited predictions with the dalidata, and store the daily accuracy."""
+
+from datetime import UTC, datetime
+
+from influxdb_client import Point
+from influxdb_client.client.query_api_async import QueryApiAsync
+from influxdb_client.client.write_api_async import WriteApiAsync
+
+from src.config import DALIDATA_BUCKET_NAME, PREDICTED_TRAFO_LOAD_BUCKET
+from src.infrastructure.influxdb._streaming import TimeSeriesColumns
+from src.infrastructure.influxdb.flux_queries import (
+    FluxQueryTemplate,
+    compile_query,
+    query_time_series,
+    register_query_template,
+)
+
+_FORECAST_ACCURACY_MEASUREMENT = "bl_forecast_accuracy"
+
+# The audited predictions joined server-side with the measured load of the same quarter-hour, so only
+# the quarter-hours with both a prediction and a measurement are transferred.
+_PREDICTED_AND_MEASURED_QUERY = register_query_template(
+    FluxQueryTemplate(
+        name="predicted_and_measured",
+        source="""predicted = from(bucket: p_bucket)
+    |> range(start: p_start, stop: p_stop)
+    |> filter(fn: (r) => r["_measurement"] == p_measurement)
+    |> filter(fn: (r) => r["_field"] == "WAARDE")
+    |> group(columns: [])
+    |> keep(columns: ["_time", "_value"])
+measured = from(bucket: p_dali_bucket)
+    |> range(start: p_start, stop: p_stop)
+    |> filter(fn: (r) => r["_measurement"] == "WAARDE")
+    |> filter(fn: (r) => r["_field"] == "WAARDE")
+    |> group(columns: [])
+    |> keep(columns: ["_time", "_value"])
+
+join(tables: {predicted: predicted, measured: measured}, on: ["_time"])
+    |> sort(columns: ["_time"])""",
+        value_columns=("_value_predicted", "_value_measured"),
+        default_params={
+            "p_bucket": PREDICTED_TRAFO_LOAD_BUCKET,
+            "p_dali_bucket": DALIDATA_BUCKET_NAME,
+        },
+        downsampling=False,
+    )
+)
+
+# The start of the last day of which the accuracy of the predictions of the asset was stored.
+_LAST_ACCURACY_DAY_QUERY = register_query_template(
+    FluxQueryTemplate(
+        name="last_accuracy_day",
+        source="""from(bucket: p_bucket)
+    |> range(start: p_start, stop: p_stop)
+    |> filter(fn: (r) => r["_measurement"] == "bl_forecast_accuracy")
+    |> filter(fn: (r) => r["_field"] == "count")
+    |> filter(fn: (r) => r["asset_id"] == p_asset_id)""",
+        shape="""|> group()
+    |> last()""",
+        default_params={"p_bucket": PREDICTED_TRAFO_LOAD_BUCKET},
+        downsampling=False,
+    )
+)
+
+
+async def retrieve_predicted_and_measured_load(
+    query_api: QueryApiAsync,
+    measurement_name: str,
+    from_date: datetime,
+    to_date: datetime,
+) -> TimeSeriesColumns:
+    """Retrieve the audited predictions and the measured load of the quarter-hours between the given times.
+
+    Args:
+        query_api (QueryApiAsync): The read-only connection to the database.
+        measurement_name (str): The measurement the predictions were audited in.
+        from_date (datetime): The start date (inclusive).
+        to_date (datetime): The end date (exclusive).
+
+    Returns:
+        TimeSeriesColumns: The timestamps, '_value_predicted' and '_value_measured' of the quarter-hours
+            with both a prediction and a measurement.
+    """
+    return await query_time_series(
+        query_api,
+        _PREDICTED_AND_MEASURED_QUERY.name,
+        from_date,
+        to_date,
+        p_measurement=measurement_name,
+    )
+
+
+async def retrieve_last_accuracy_day(
+    query_api: QueryApiAsync, asset_id: str, since: datetime
+) -> datetime | None:
+    """Retrieve the start of the last day of which the accuracy of the predictions of an asset was stored.
+
+    Args:
+        query_api (QueryApiAsync): The read-only connection to the database.
+        asset_id (str): The EAN number of the asset.
+        since (datetime): The time from which to look for stored accuracies.
+
+    Returns:
+        datetime | None: The start of the last day. None if no accuracy was stored since the given time.
+    """
+    tables = await query_api.query(
+        compile_query(_LAST_ACCURACY_DAY_QUERY.name),
+        params=_LAST_ACCURACY_DAY_QUERY.default_params
+        | {"p_start": since, "p_stop": datetime.now(tz=UTC), "p_asset_id": asset_id},
+    )
+
+    return max(
+        (record.get_time() for table in tables for record in table.records),
+        default=None,
+    )
+
+
+async def store_forecast_accuracy(
+    write_api: WriteApiAsync,
+    asset_id: str,
+    forecaster: str,
+    day_start: datetime,
+    accuracy: dict[str, float],
+) -> None:
+    """Write the accuracy of the predictions of an asset on a single day to the audit bucket.
+
+    Args:
+        write_api (WriteApi): The write connection to the database.
+        asset_id (str): The EAN number of the asset.
+        forecaster (str): The forecaster which made the predictions, for example "model" or "baseline".
+        day_start (datetime): The start of the day.
+        accuracy (dict[str, float]): The accuracy metrics of the day by name.
+    """
+    point = (
+        Point(_FORECAST_ACCURACY_MEASUREMENT)
+        .tag("asset_id", asset_id)
+        .tag("forecaster", forecaster)
+        .time(day_start)
+    )
+    for metric, value in accuracy.items():
+        point = point.field(metric, value)
+
+    await write_api.write(bucket=PREDICTED_TRAFO_LOAD_BUCKET, record=point)
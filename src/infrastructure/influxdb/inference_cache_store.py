@@ -0,0 +1,96 @@
+"""Module which contains functions to store and retrieve cached model inference results in the audit bucket."""
+
+from datetime import datetime
+
+import pandas as pd
+from influxdb_client.client.query_api_async import QueryApiAsync
+from influxdb_client.client.write_api_async import WriteApiAsync
+
+from src.config import PREDICTED_TRAFO_LOAD_BUCKET
+from src.infrastructure.influxdb._streaming import TimeSeriesColumns
+from src.infrastructure.influxdb.flux_queries import (
+    FluxQueryTemplate,
+    query_time_series,
+    register_query_template,
+)
+from src.models.predicted_load import PredictedGridAssetLoad
+
+_INFERENCE_CACHE_MEASUREMENT = "inference_cache"
+
+# The inference key is a field rather than a tag, so every scored feature set does not add a series to the
+# bucket. The predictions are pivoted next to their inference key to filter on it.
+_CACHED_PREDICTIONS_QUERY = register_query_template(
+    FluxQueryTemplate(
+        name="cached_predictions",
+        source="""from(bucket: p_bucket)
+    |> range(start: p_start, stop: p_stop)
+    |> filter(fn: (r) => r["_measurement"] == "inference_cache")
+    |> filter(fn: (r) => r["_field"] == "WAARDE" or r["_field"] == "inference_key")""",
+        shape="""|> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")
+    |> filter(fn: (r) => r["inference_key"] == p_inference_key)
+    |> group(columns: [])
+    |> keep(columns: ["_time", "WAARDE"])
+    |> sort(columns: ["_time"])""",
+        value_columns=("WAARDE",),
+        default_params={"p_bucket": PREDICTED_TRAFO_LOAD_BUCKET},
+        downsampling=False,
+    )
+)
+
+
+async def retrieve_cached_predictions(
+    query_api: QueryApiAsync,
+    inference_key: str,
+    from_date: datetime,
+    to_date: datetime,
+) -> TimeSeriesColumns:
+    """Retrieve the predictions cached under the given inference key between the given times.
+
+    Args:
+        query_api (QueryApiAsync): The read-only connection to the database.
+        inference_key (str): The inference key (hash of the model input and model version).
+        from_date (datetime): The start date (inclusive) of the predictions.
+        to_date (datetime): The end date (exclusive) of the predictions.
+
+    Returns:
+        TimeSeriesColumns: The timestamps and values of the cached predictions.
+    """
+    return await query_time_series(
+        query_api,
+        _CACHED_PREDICTIONS_QUERY.name,
+        from_date,
+        to_date,
+        p_inference_key=inference_key,
+    )
+
+
+async def store_cached_predictions(
+    write_api: WriteApiAsync,
+    inference_key: str,
+    model_version: str,
+    predicted_loads: list[PredictedGridAssetLoad],
+) -> None:
+    """Write predictions to the audit bucket, with the inference key they were made for.
+
+    The inference key is stored as field, so the bucket keeps the predictions of the latest scored
+    features of every quarter-hour.
+
+    Args:
+        write_api (WriteApi): The write connection to the database.
+        inference_key (str): The inference key (hash of the model input and model version).
+        model_version (str): The version of the model which made the predictions.
+        predicted_loads (list[PredictedGridAssetLoad]): The predictions to cache.
+    """
+    df = pd.DataFrame(
+        [(pl.time, pl.load) for pl in predicted_loads], columns=["datetime", "WAARDE"]
+    )
+    df["inference_key"] = inference_key
+    df["model_version"] = model_version
+
+    await write_api.write(
+        bucket=PREDICTED_TRAFO_LOAD_BUCKET,
+        record=df,
+        data_frame_measurement_name=_INFERENCE_CACHE_MEASUREMENT,
+        data_frame_timestamp_column="datetime",
+        data_frame_tag_columns=["model_version"],
+    )
@@ -2,8 +2,28 @@
 
 from datetime import datetime
 from influxdb_client.client.query_api_async import QueryApiAsync
+import pandas as pd
+
+from src.infrastructure.influxdb.flux_queries import (
+    FluxQueryTemplate,
+    query_time_series,
+    register_query_template,
+)
 from src.models.predicted_load import PredictedGridAssetLoad
 
+_PREDICTIONS_QUERY = register_query_template(
+    FluxQueryTemplate(
+        name="predictions",
+        source="""from(bucket: p_bucket)
+    |> range(start: p_start, stop: p_stop)
+    |> filter(fn: (r) => r["_measurement"] == "predictions")
+    |> filter(fn: (r) => r["_field"] == "WAARDE")""",
+        shape="""|> group(columns: [])
+    |> sort(columns: ["_time"])""",
+        value_columns=("_value",),
+    )
+)
+
 
 async def retrieve_predicted_grid_asset_load(
     query_api: QueryApiAsync, bucket: str, from_date: datetime, to_date: datetime
@@ -19,20 +39,14 @@ async def retrieve_predicted_grid_asset_load(
     Returns:
         list[PredictedGridAssetLoad]: The predicted grid asset load.
     """
-    from_date_str = from_date.strftime("%Y-%m-%dT%H:%M:%SZ")
-    to_date_str = to_date.strftime("%Y-%m-%dT%H:%M:%SZ")
-
-    query = f"""from(bucket: "{bucket}")
-    |> range(start: {from_date_str}, stop: {to_date_str})
-    |> filter(fn: (r) => r["_measurement"] == "predictions")
-    |> filter(fn: (r) => r["_field"] == "value")
-    |> sort(columns: ["_time"])
-    """
-
-    predicted_loads = await query_api.query(query=query)
-    flattened_predicted_loads = predicted_loads.to_values(columns=["_time", "_value"])
+    predicted_loads = await query_time_series(
+        query_api, _PREDICTIONS_QUERY.name, from_date, to_date, p_bucket=bucket
+    )
+    times = pd.to_datetime(predicted_loads.timestamps, unit="ns", utc=True)
 
     return [
-        PredictedGridAssetLoad(time=predicted_load[0], load=predicted_load[1])  # type: ignore[arg-type]
-        for predicted_load in flattened_predicted_loads
+        PredictedGridAssetLoad(time=time, load=load)
+        for time, load in zip(
+            times.to_pydatetime(), predicted_loads.values["_value"].tolist()
+        )
     ]
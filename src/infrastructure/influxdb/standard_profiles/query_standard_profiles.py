@@ -1,34 +1,45 @@
 from datetime import datetime
 
-import pandas as pd
-from src.config import INFLUXDB_ORG, STANDARD_PROFILES_BUCKET_NAME
+from src.config import STANDARD_PROFILES_BUCKET_NAME
 from influxdb_client.client.query_api_async import QueryApiAsync
+from src.infrastructure.influxdb._streaming import TimeSeriesColumns
+from src.infrastructure.influxdb.flux_queries import (
+    FluxQueryTemplate,
+    query_time_series,
+    register_query_template,
+)
+
+_STANDARD_PROFILES_QUERY = register_query_template(
+    FluxQueryTemplate(
+        name="standard_profiles",
+        source="""from(bucket: p_bucket)
+            |> range(start: p_start, stop: p_stop)
+            |> filter(fn: (r) => r["_measurement"] == "standard_profile")""",
+        shape="""|> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")""",
+        default_params={"p_bucket": STANDARD_PROFILES_BUCKET_NAME},
+    )
+)
 
 
 async def retrieve_standard_profiles_between_dates(
     query_api: QueryApiAsync,
     start_date_inclusive: datetime,
     end_date_inclusive: datetime,
-) -> pd.DataFrame:
+) -> TimeSeriesColumns:
     """Retrieve standard profiles from InfluxDB between the given dates.
 
+    The result is streamed and decoded straight into typed columns, one per profile.
+
     Args:
         start_date_inclusive (datetime): The start date (inclusive)
         end_date_inclusive (datetime): The end date (inclusive)
 
     Returns:
-        pd.DataFrame: The dataframe containing standard profiles for the date range.
+        TimeSeriesColumns: The timestamps and values of the standard profiles for the date range.
     """
-    start_date_str = start_date_inclusive.strftime(format="%Y-%m-%dT%H:%M:%SZ")
-    end_date_str = end_date_inclusive.strftime(format="%Y-%m-%dT%H:%M:%SZ")
-
-    query = f"""
-        from(bucket: "{STANDARD_PROFILES_BUCKET_NAME}")
-            |> range(start: {start_date_str}, stop: {end_date_str})
-            |> filter(fn: (r) => r["_measurement"] == "standard_profile")
-            |> filter(fn: (r) => "profile")
-        |> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")
-    """
-
-    response = await query_api.query_data_frame(query=query, org=INFLUXDB_ORG)
-    return response.rename(columns={"_time": "datumtijd"})
+    return await query_time_series(
+        query_api,
+        _STANDARD_PROFILES_QUERY.name,
+        start_date_inclusive,
+        end_date_inclusive,
+    )
@@ -8,13 +8,16 @@ from src.models.predicted_load import PredictedGridAssetLoad
 
 
 async def store_predictions_for_audit(
-    write_api: WriteApiAsync, predicted_loads: list[PredictedGridAssetLoad]
+    write_api: WriteApiAsync,
+    predicted_loads: list[PredictedGridAssetLoad],
+    measurement_name: str = "predictions",
 ) -> None:
     """Write predicted transformer loads to the database for auditing purposes.
 
     Args:
         write_api (WriteApi): The write connection to the database.
         predicted_loads (list[PredictedGridAssetLoad]): List of predicted transformer loads to write to the database.
+        measurement_name (str): The measurement to write the predictions to. Defaults to "predictions".
     """
     df = pd.DataFrame(
         [(tl.time, tl.load) for tl in predicted_loads], columns=["datetime", "WAARDE"]
@@ -23,6 +26,6 @@ async def store_predictions_for_audit(
     await write_api.write(
         bucket=PREDICTED_TRAFO_LOAD_BUCKET,
         record=df,
-        data_frame_measurement_name="predictions",
+        data_frame_measurement_name=measurement_name,
         data_frame_timestamp_column="datetime",
     )
@@ -0,0 +1,39 @@
+"""Module which contains functions to mirror archived weather forecast snapshots to the audit bucket."""
+
+from datetime import datetime
+
+import pandas as pd
+from influxdb_client.client.write_api_async import WriteApiAsync
+
+from src.config import PREDICTED_TRAFO_LOAD_BUCKET
+
+_WEATHER_FORECAST_MEASUREMENT = "weather_forecast_snapshots"
+
+
+async def store_weather_forecast_snapshot(
+    write_api: WriteApiAsync,
+    grid_cell: str,
+    model_run: datetime,
+    forecast: pd.DataFrame,
+) -> None:
+    """Write a weather forecast snapshot, interpolated to quarter-hours, to the audit bucket.
+
+    The model run is stored as field rather than tag, so every model run does not add a series to
+    the bucket. The bucket keeps the forecast of the latest mirrored model run of every quarter-hour,
+    the local archive keeps the forecasts of all model runs.
+
+    Args:
+        write_api (WriteApi): The write connection to the database.
+        grid_cell (str): The identifier of the grid cell the forecast was fetched for.
+        model_run (datetime): The model run the forecast was fetched from.
+        forecast (pd.DataFrame): The forecast, with the quarter-hours in the "datetime" column.
+    """
+    snapshot = forecast.assign(grid_cell=grid_cell, model_run=model_run.isoformat())
+
+    await write_api.write(
+        bucket=PREDICTED_TRAFO_LOAD_BUCKET,
+        record=snapshot,
+        data_frame_measurement_name=_WEATHER_FORECAST_MEASUREMENT,
+        data_frame_timestamp_column="datetime",
+        data_frame_tag_columns=["grid_cell"],
+    )
@@ -0,0 +1,197 @@
+"""Module containing logic for storing dataframes on the local disk in a columnar format.
+
+Every column of a dataframe is stored as a separate NumPy file next to a JSON manifest which
+describes the columns. Columns can be memory-mapped on read, so reading a range of rows only
+touches the part of the files that is needed.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+_MANIFEST_FILE = "manifest.json"
+
+
+def _column_to_array(column: pd.Series) -> tuple[np.ndarray, dict[str, Any]]:
+    """Convert a dataframe column to a NumPy array and the metadata needed to restore it.
+
+    Timezone-aware datetimes are stored as int64 nanoseconds since the epoch (UTC).
+
+    Args:
+        column (pd.Series): The column to convert.
+
+    Returns:
+        tuple[np.ndarray, dict[str, Any]]: The array and the metadata of the column.
+    """
+    metadata: dict[str, Any] = {"name": column.name, "dtype": str(column.dtype)}
+
+    if isinstance(column.dtype, pd.DatetimeTZDtype):
+        metadata["tz"] = str(column.dtype.tz)
+        utc_times = column.dt.tz_convert("UTC").dt.tz_localize(None)
+        return utc_times.to_numpy(dtype="datetime64[ns]").view("int64"), metadata
+
+    if isinstance(column.dtype, pd.api.extensions.ExtensionDtype):
+        numpy_dtype = getattr(column.dtype, "numpy_dtype", object)
+        if column.isna().any():
+            numpy_dtype = np.dtype("float64")
+        return column.to_numpy(dtype=numpy_dtype), metadata
+
+    return column.to_numpy(), metadata
+
+
+def _array_to_column(array: np.ndarray, metadata: dict[str, Any]) -> pd.Series:
+    """Restore a dataframe column from a stored array and its metadata.
+
+    Args:
+        array (np.ndarray): The stored array.
+        metadata (dict[str, Any]): The metadata of the column.
+
+    Returns:
+        pd.Series: The restored column.
+    """
+    if "tz" in metadata:
+        return pd.Series(
+            pd.to_datetime(np.array(array), unit="ns", utc=True).tz_convert(
+                metadata["tz"]
+            ),
+            name=metadata["name"],
+        )
+
+    return pd.Series(np.array(array), name=metadata["name"]).astype(metadata["dtype"])
+
+
+def frame_content_hash(frame: pd.DataFrame) -> str:
+    """Calculate a hash over the column names and values of a dataframe.
+
+    Args:
+        frame (pd.DataFrame): The dataframe to hash.
+
+    Returns:
+        str: The hex digest of the content hash.
+    """
+    digest = hashlib.sha256()
+
+    for position in range(frame.shape[1]):
+        array, metadata = _column_to_array(frame.iloc[:, position])
+        digest.update(json.dumps(metadata, sort_keys=True, default=str).encode())
+        digest.update(np.ascontiguousarray(array).tobytes())
+
+    return digest.hexdigest()
+
+
+def write_frame(directory: Path, frame: pd.DataFrame, metadata: dict[str, Any]) -> str:
+    """Write a dataframe to the given directory, replacing any dataframe stored there.
+
+    The dataframe is first written to a temporary directory which is then moved into place,
+    so readers never observe a partially written dataframe.
+
+    Args:
+        directory (Path): The directory to store the dataframe in.
+        frame (pd.DataFrame): The dataframe to store.
+        metadata (dict[str, Any]): Additional metadata to store in the manifest.
+
+    Returns:
+        str: The content hash of the stored dataframe.
+    """
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    staging_directory = directory.parent / f".{directory.name}.{uuid.uuid4().hex}"
+    staging_directory.mkdir()
+
+    columns = []
+    for position in range(frame.shape[1]):
+        array, column_metadata = _column_to_array(frame.iloc[:, position])
+        column_metadata["file"] = f"col_{position:03d}.npy"
+        np.save(staging_directory / column_metadata["file"], array, allow_pickle=False)
+        columns.append(column_metadata)
+
+    content_hash = frame_content_hash(frame)
+    manifest = metadata | {
+        "columns": columns,
+        "rows": len(frame),
+        "content_hash": content_hash,
+    }
+    (staging_directory / _MANIFEST_FILE).write_text(json.dumps(manifest, default=str))
+
+    if directory.exists():
+        shutil.rmtree(directory)
+    os.replace(staging_directory, directory)
+
+    return content_hash
+
+
+def read_manifest(directory: Path) -> dict[str, Any] | None:
+    """Read the manifest of the dataframe stored in the given directory.
+
+    Args:
+        directory (Path): The directory the dataframe is stored in.
+
+    Returns:
+        dict[str, Any] | None: The manifest. None if no dataframe is stored in the directory.
+    """
+    manifest_file = directory / _MANIFEST_FILE
+
+    if not manifest_file.exists():
+        return None
+
+    return json.loads(manifest_file.read_text())
+
+
+def read_frame(
+    directory: Path,
+    manifest: dict[str, Any],
+    rows: slice = slice(None),
+    verify: bool = False,
+) -> pd.DataFrame:
+    """Read (a range of rows of) the dataframe stored in the given directory.
+
+    Args:
+        directory (Path): The directory the dataframe is stored in.
+        manifest (dict[str, Any]): The manifest of the stored dataframe.
+        rows (slice): The range of rows to read. Defaults to all rows.
+        verify (bool): Whether to verify the read dataframe against the content hash in the manifest.
+            Only a dataframe which is read as a whole can be verified. Defaults to False.
+
+    Raises:
+        ValueError: If the dataframe is verified and does not match the content hash in the manifest.
+
+    Returns:
+        pd.DataFrame: The stored dataframe.
+    """
+    if verify and rows != slice(None):
+        msg = "Only a dataframe which is read as a whole can be verified"
+        raise ValueError(msg)
+
+    columns = [
+        _array_to_column(
+            np.load(directory / column["file"], mmap_mode="r")[rows], column
+        )
+        for column in manifest["columns"]
+    ]
+    frame = pd.concat(columns, axis=1)
+
+    if verify and frame_content_hash(frame) != manifest["content_hash"]:
+        msg = f"The dataframe stored in {directory} does not match its content hash"
+        raise ValueError(msg)
+
+    return frame
+
+
+def read_column(directory: Path, manifest: dict[str, Any], position: int) -> np.ndarray:
+    """Memory-map a single stored column, without restoring its pandas dtype.
+
+    Args:
+        directory (Path): The directory the dataframe is stored in.
+        manifest (dict[str, Any]): The manifest of the stored dataframe.
+        position (int): The position of the column.
+
+    Returns:
+        np.ndarray: The memory-mapped column.
+    """
+    return np.load(directory / manifest["columns"][position]["file"], mmap_mode="r")
@@ -0,0 +1,273 @@
+"""Module containing a local store of the hourly and daily rollups of the measured load (dalidata).
+
+Features looking back further than a few days read statistics of the measured load from the
+rollups, instead of retrieving a year of raw quarter-hour dalidata from InfluxDB. The rollups are
+maintained incrementally: only the days which were added or corrected in InfluxDB since the
+last refresh are retrieved and rolled up again.
+"""
+
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+
+import numpy as np
+import pandas as pd
+from influxdb_client.client.query_api_async import QueryApiAsync
+
+from src.config import DALI_ROLLUP_HISTORY_DAYS, LOCAL_STORE_DIR
+from src.infrastructure.influxdb.dalidata.query_dali_data import (
+    retrieve_dali_daily_aggregates_between,
+    retrieve_dali_data_between,
+)
+from src.infrastructure.local_store._columnar import (
+    read_column,
+    read_frame,
+    read_manifest,
+    write_frame,
+)
+from src.logger import logger
+
+# The resolutions of the rollups, by the pandas frequency they are rolled up with.
+ROLLUP_RESOLUTIONS = {"hourly": "1h", "daily": "1D"}
+
+_ONE_DAY = pd.Timedelta(days=1)
+
+
+def _roll_up(measured_load: pd.Series, frequency: str) -> pd.DataFrame:
+    """Roll up the measured load to the given frequency.
+
+    Args:
+        measured_load (pd.Series): The measured load, indexed by its (UTC) timestamps.
+        frequency (str): The pandas frequency to roll up to.
+
+    Returns:
+        pd.DataFrame: The "time" (start of the period, UTC), "mean", "max", "p95", "sum" and "count"
+            of the measured load per period with at least one measurement.
+    """
+    resampled = measured_load.resample(frequency)
+    rollup = pd.DataFrame(
+        {
+            "mean": resampled.mean(),
+            "max": resampled.max(),
+            "p95": resampled.quantile(0.95),
+            "sum": resampled.sum(),
+            "count": resampled.count().astype(np.int64),
+        }
+    )
+    rollup = rollup[rollup["count"] > 0]
+
+    return rollup.rename_axis("time").reset_index()
+
+
+def _contiguous_ranges(
+    days: pd.DatetimeIndex,
+) -> list[tuple[pd.Timestamp, pd.Timestamp]]:
+    """Group sorted days into ranges of consecutive days.
+
+    Args:
+        days (pd.DatetimeIndex): The (sorted) start times of the days.
+
+    Returns:
+        list[tuple[pd.Timestamp, pd.Timestamp]]: The start (inclusive) and end (exclusive) of every range.
+    """
+    ranges: list[tuple[pd.Timestamp, pd.Timestamp]] = []
+    for day in days:
+        if ranges and ranges[-1][1] == day:
+            ranges[-1] = (ranges[-1][0], day + _ONE_DAY)
+        else:
+            ranges.append((day, day + _ONE_DAY))
+
+    return ranges
+
+
+class DaliRollupStore:
+    """Store which maintains the hourly and daily rollups (mean, max, 95th percentile) of the measured load per asset.
+
+    The daily rollup records the sum and count of the measurements of every day. On refresh, these
+    are compared with the daily sum and count aggregated server-side, which transfers a single row
+    per day. Only the days which differ are retrieved raw and rolled up again.
+    """
+
+    def __init__(self, root_directory: Path, history_days: int) -> None:
+        """Initializes the rollup store.
+
+        Args:
+            root_directory (Path): The directory to store the rollups in.
+            history_days (int): The number of (complete, UTC) days the rollups cover.
+        """
+        self.root_directory = root_directory
+        self.history_days = history_days
+        self._lock = Lock()
+
+    def _rollup_directory(self, asset_id: str, resolution: str) -> Path:
+        return self.root_directory / asset_id / resolution
+
+    def _read_rollup(self, asset_id: str, resolution: str) -> pd.DataFrame | None:
+        directory = self._rollup_directory(asset_id, resolution)
+        manifest = read_manifest(directory)
+
+        return read_frame(directory, manifest) if manifest is not None else None
+
+    def _find_stale_days(
+        self, stored_daily: pd.DataFrame | None, server_daily: pd.DataFrame
+    ) -> pd.DatetimeIndex:
+        """Find the days of which the stored rollups differ from the dalidata in InfluxDB.
+
+        Args:
+            stored_daily (pd.DataFrame | None): The stored daily rollup.
+            server_daily (pd.DataFrame): The "time" (start of the day), "sum" and "count" of the dalidata.
+
+        Returns:
+            pd.DatetimeIndex: The start times of the stale days.
+        """
+        if stored_daily is None:
+            return pd.DatetimeIndex(server_daily["time"])
+
+        compared = server_daily.merge(
+            stored_daily[["time", "sum", "count"]],
+            on="time",
+            how="left",
+            suffixes=("", "_stored"),
+        )
+        stale = (compared["count"] != compared["count_stored"]) | ~np.isclose(
+            compared["sum"], compared["sum_stored"]
+        )
+
+        return pd.DatetimeIndex(compared.loc[stale, "time"])
+
+    async def refresh(
+        self, query_api: QueryApiAsync, asset_id: str, until: datetime
+    ) -> int:
+        """Bring the rollups of an asset up to date with the dalidata in InfluxDB.
+
+        Args:
+            query_api (QueryApiAsync): The read-only connection to the influx database.
+            asset_id (str): The identifier of the asset.
+            until (datetime): The time up to which the rollups are refreshed. Only complete (UTC)
+                days are rolled up.
+
+        Returns:
+            int: The number of days which were rolled up again.
+        """
+        history_end = pd.Timestamp(until).tz_convert("UTC").floor("D")
+        history_start = history_end - self.history_days * _ONE_DAY
+
+        aggregates = await retrieve_dali_daily_aggregates_between(
+            query_api=query_api,
+            start_date_inclusive=history_start.to_pydatetime(),
+            end_date_inclusive=history_end.to_pydatetime(),
+        )
+        # The daily aggregates are timestamped with the end of their day.
+        server_daily = pd.DataFrame(
+            {
+                "time": pd.to_datetime(aggregates.timestamps, unit="ns", utc=True)
+                - _ONE_DAY,
+                "sum": aggregates.values["sum"],
+                "count": aggregates.values["count"].astype(np.int64),
+            }
+        )
+        server_daily = server_daily[server_daily["count"] > 0]
+
+        stored_daily = self._read_rollup(asset_id, "daily")
+        stale_days = self._find_stale_days(stored_daily, server_daily)
+        # Days which dropped out of the history, or were removed from InfluxDB, are removed from the rollups.
+        removed_days = (
+            stored_daily is not None
+            and not stored_daily["time"].isin(server_daily["time"]).all()
+        )
+
+        if stale_days.empty and not removed_days:
+            return 0
+
+        measured_loads = []
+        for range_start, range_end in _contiguous_ranges(stale_days):
+            dalidata = await retrieve_dali_data_between(
+                query_api=query_api,
+                start_date_inclusive=range_start.to_pydatetime(),
+                end_date_inclusive=range_end.to_pydatetime(),
+            )
+            measured_loads.append(
+                pd.Series(
+                    dalidata.values["WAARDE"],
+                    index=pd.to_datetime(dalidata.timestamps, unit="ns", utc=True),
+                ).dropna()
+            )
+
+        with self._lock:
+            for resolution, frequency in ROLLUP_RESOLUTIONS.items():
+                rollups = [_roll_up(load, frequency) for load in measured_loads]
+
+                stored = self._read_rollup(asset_id, resolution)
+                if stored is not None:
+                    # Keep the stored periods of the days which are still present and up to date.
+                    stored_days = stored["time"].dt.floor("D")
+                    rollups.append(
+                        stored[
+                            stored_days.isin(server_daily["time"])
+                            & ~stored_days.isin(stale_days)
+                        ]
+                    )
+
+                write_frame(
+                    self._rollup_directory(asset_id, resolution),
+                    pd.concat(rollups, ignore_index=True).sort_values(
+                        "time", ignore_index=True
+                    ),
+                    metadata={"history_end": history_end.isoformat()},
+                )
+
+        logger.info(
+            "DaliRollupStore: Rolled up %d days of dalidata of %s.",
+            len(stale_days),
+            asset_id,
+        )
+        return len(stale_days)
+
+    def read(
+        self,
+        asset_id: str,
+        resolution: str,
+        start_date_inclusive: datetime,
+        end_date_exclusive: datetime,
+    ) -> pd.DataFrame | None:
+        """Read the rollup of an asset between the given dates.
+
+        Only the rows of the requested range are read from disk.
+
+        Args:
+            asset_id (str): The identifier of the asset.
+            resolution (str): The resolution of the rollup, "hourly" or "daily".
+            start_date_inclusive (datetime): The start date (inclusive).
+            end_date_exclusive (datetime): The end date (exclusive).
+
+        Returns:
+            pd.DataFrame | None: The "time" (start of the period, UTC), "mean", "max", "p95", "sum" and "count"
+                of the measured load per period. None if the rollups of the asset were not built yet.
+        """
+        if resolution not in ROLLUP_RESOLUTIONS:
+            msg = f"Unknown rollup resolution '{resolution}'"
+            raise ValueError(msg)
+
+        directory = self._rollup_directory(asset_id, resolution)
+        manifest = read_manifest(directory)
+
+        if manifest is None:
+            return None
+
+        # The first column holds the start times of the periods as int64 nanoseconds (UTC).
+        period_times = read_column(directory, manifest, position=0)
+        first_row, last_row = np.searchsorted(
+            period_times,
+            [
+                pd.Timestamp(start_date_inclusive).value,
+                pd.Timestamp(end_date_exclusive).value,
+            ],
+        )
+
+        return read_frame(directory, manifest, rows=slice(first_row, last_row))
+
+
+dali_rollup_store = DaliRollupStore(
+    root_directory=Path(LOCAL_STORE_DIR) / "dali_rollups",
+    history_days=DALI_ROLLUP_HISTORY_DAYS,
+)
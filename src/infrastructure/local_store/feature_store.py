@@ -0,0 +1,133 @@
+"""Module containing a local store for the assembled features of the prediction model."""
+
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from src.config import LOCAL_STORE_DIR
+from src.infrastructure.local_store._columnar import (
+    read_frame,
+    read_manifest,
+    write_frame,
+)
+from src.logger import logger
+
+
+class FeatureStore:
+    """Store which materializes the assembled model features per (asset, window, feature version).
+
+    Every entry records a fingerprint of the upstream sources (DALI data, weather forecast) of its
+    window it was assembled from. An entry is only served while the fingerprint of the upstream sources is
+    unchanged, so feature assembly becomes a lookup when the inputs did not change.
+    """
+
+    def __init__(self, root_directory: Path) -> None:
+        """Initializes the feature store.
+
+        Args:
+            root_directory (Path): The directory to store the features in.
+        """
+        self.root_directory = root_directory
+
+    def _entry_directory(
+        self,
+        asset_id: str,
+        feature_version: str,
+        start_date_inclusive: datetime,
+        end_date_exclusive: datetime,
+    ) -> Path:
+        # The fingerprint covers the exact window, so the entries are keyed by the exact window.
+        window = "_".join(
+            pd.Timestamp(date).tz_convert("UTC").strftime("%Y%m%dT%H%M%SZ")
+            for date in (start_date_inclusive, end_date_exclusive)
+        )
+        return self.root_directory / asset_id / f"v{feature_version}" / window
+
+    def read(
+        self,
+        asset_id: str,
+        feature_version: str,
+        start_date_inclusive: datetime,
+        end_date_exclusive: datetime,
+        source_fingerprint: str,
+    ) -> pd.DataFrame | None:
+        """Read the stored features of the given window.
+
+        Args:
+            asset_id (str): The identifier of the asset.
+            feature_version (str): The version of the feature assembly logic.
+            start_date_inclusive (datetime): The start date (inclusive).
+            end_date_exclusive (datetime): The end date (exclusive).
+            source_fingerprint (str): The fingerprint of the current upstream sources of the window.
+
+        Returns:
+            pd.DataFrame | None: The stored features. None if the features of the window are not stored,
+                are incomplete or corrupted, or were assembled from different upstream sources.
+        """
+        directory = self._entry_directory(
+            asset_id, feature_version, start_date_inclusive, end_date_exclusive
+        )
+        manifest = read_manifest(directory)
+
+        if manifest is None:
+            return None
+
+        if manifest["source_fingerprint"] != source_fingerprint:
+            logger.info(
+                "FeatureStore: Upstream sources changed for %s, invalidating stored features.",
+                directory,
+            )
+            return None
+
+        expected_rows = len(
+            pd.date_range(
+                start_date_inclusive, end_date_exclusive, freq="15min", inclusive="left"
+            )
+        )
+
+        if manifest["rows"] != expected_rows:
+            return None
+
+        try:
+            return read_frame(directory, manifest, verify=True)
+        except (OSError, ValueError) as exc:
+            logger.warning(
+                "FeatureStore: Failed to read stored features from %s, ignoring them.",
+                directory,
+                exc_info=exc,
+            )
+            return None
+
+    def write(
+        self,
+        asset_id: str,
+        feature_version: str,
+        start_date_inclusive: datetime,
+        end_date_exclusive: datetime,
+        features: pd.DataFrame,
+        source_fingerprint: str,
+    ) -> str:
+        """Store the assembled features of the given window.
+
+        Args:
+            asset_id (str): The identifier of the asset.
+            feature_version (str): The version of the feature assembly logic.
+            start_date_inclusive (datetime): The start date (inclusive) of the features.
+            end_date_exclusive (datetime): The end date (exclusive) of the features.
+            features (pd.DataFrame): The assembled features, the first column holding the slot timestamps.
+            source_fingerprint (str): The fingerprint of the upstream sources of the features.
+
+        Returns:
+            str: The content hash of the stored features.
+        """
+        directory = self._entry_directory(
+            asset_id, feature_version, start_date_inclusive, end_date_exclusive
+        )
+
+        return write_frame(
+            directory, features, metadata={"source_fingerprint": source_fingerprint}
+        )
+
+
+feature_store = FeatureStore(root_directory=Path(LOCAL_STORE_DIR) / "features")
@@ -0,0 +1,197 @@
+"""Module containing a local, memory-mapped store of the yearly standard profiles."""
+
+import asyncio
+import json
+from collections.abc import Collection
+from datetime import UTC, datetime
+from pathlib import Path
+from threading import Lock
+
+import numpy as np
+import pandas as pd
+from influxdb_client.client.query_api_async import QueryApiAsync
+
+from src.config import LOCAL_STORE_DIR
+from src.infrastructure.influxdb.standard_profiles.query_standard_profiles import (
+    retrieve_standard_profiles_between_dates,
+)
+from src.logger import logger
+
+_SLOT_NS = pd.Timedelta(minutes=15).value
+
+
+class _YearlyProfileTable:
+    """The standard profiles of a single (UTC) year, indexed by quarter-hour slot and profile category."""
+
+    def __init__(self, year: int, values: np.ndarray, categories: list[str]) -> None:
+        self.year_start_ns = pd.Timestamp(datetime(year, 1, 1, tzinfo=UTC)).value
+        self.values = values
+        self.category_positions = {c: i for i, c in enumerate(categories)}
+
+    def covers(self, categories: Collection[str]) -> bool:
+        """Check whether the table contains the profiles of all the given categories."""
+        return self.category_positions.keys() >= set(categories)
+
+
+class StandardProfileStore:
+    """Store which serves the standard profiles from memory-mapped yearly tables.
+
+    Standard profiles are static per year. Each year is retrieved once from InfluxDB and persisted
+    as a (slot, category) float32 array on the local disk. Lookups for any horizon are a vectorized
+    index into the memory-mapped array, without querying InfluxDB.
+    """
+
+    def __init__(self, root_directory: Path) -> None:
+        """Initializes the standard profile store.
+
+        Args:
+            root_directory (Path): The directory to store the yearly profile tables in.
+        """
+        self.root_directory = root_directory
+        self._lock = Lock()
+        # Serializes the loading of missing years, so concurrent runs do not write the same table.
+        self._load_lock = asyncio.Lock()
+        self._tables: dict[int, _YearlyProfileTable] = {}
+
+    def _open_table(self, year: int) -> _YearlyProfileTable | None:
+        directory = self.root_directory / str(year)
+        categories_file = directory / "categories.json"
+
+        if not categories_file.exists():
+            return None
+
+        return _YearlyProfileTable(
+            year,
+            np.load(directory / "profiles.npy", mmap_mode="r"),
+            json.loads(categories_file.read_text()),
+        )
+
+    async def _load_year(
+        self, query_api: QueryApiAsync, year: int, required_categories: Collection[str]
+    ) -> None:
+        year_start = datetime(year, 1, 1, tzinfo=UTC)
+        year_end = datetime(year + 1, 1, 1, tzinfo=UTC)
+
+        profiles = await retrieve_standard_profiles_between_dates(
+            query_api=query_api,
+            start_date_inclusive=year_start,
+            end_date_inclusive=year_end,
+        )
+
+        # An incomplete year is not stored, so it is retrieved again on the next run.
+        missing_categories = set(required_categories) - profiles.values.keys()
+        if len(profiles.timestamps) == 0 or missing_categories:
+            logger.warning(
+                "StandardProfileStore: Standard profiles for %d are incomplete (missing categories: %s), not storing them.",
+                year,
+                sorted(missing_categories),
+            )
+            return
+
+        categories = sorted(profiles.values)
+        slot_count = (
+            pd.Timestamp(year_end).value - pd.Timestamp(year_start).value
+        ) // _SLOT_NS
+
+        directory = self.root_directory / str(year)
+        directory.mkdir(parents=True, exist_ok=True)
+        # A table which is rebuilt is unlinked first, so memory maps of the table stay valid.
+        (directory / "categories.json").unlink(missing_ok=True)
+        (directory / "profiles.npy").unlink(missing_ok=True)
+
+        table = np.lib.format.open_memmap(
+            directory / "profiles.npy",
+            mode="w+",
+            dtype=np.float32,
+            shape=(slot_count, len(categories)),
+        )
+        table[:] = np.nan
+        slots = (profiles.timestamps - pd.Timestamp(year_start).value) // _SLOT_NS
+        in_year = (slots >= 0) & (slots < slot_count)
+        for position, category in enumerate(categories):
+            table[slots[in_year], position] = profiles.values[category][in_year]
+        table.flush()
+        del table
+
+        # The categories are written last, they mark the table as complete.
+        (directory / "categories.json").write_text(json.dumps(categories))
+        logger.info(
+            "StandardProfileStore: Stored %d standard profiles for %d.",
+            len(categories),
+            year,
+        )
+
+    async def ensure_years(
+        self, query_api: QueryApiAsync, years: set[int], categories: Collection[str]
+    ) -> None:
+        """Make sure the profile tables of the given years are available.
+
+        Years which are not yet stored on the local disk are retrieved from InfluxDB once. A year
+        is only stored once it contains all the given categories, until then it is retrieved again on
+        the next call. A stored year which lacks any of the given categories, for example because a
+        category was configured after it was stored, is retrieved again and rebuilt.
+
+        Args:
+            query_api (QueryApiAsync): The read-only connection to the influx database.
+            years (set[int]): The (UTC) years to make available.
+            categories (Collection[str]): The profile categories the tables of the years must contain.
+        """
+        async with self._load_lock:
+            for year in sorted(years):
+                table = self._tables.get(year)
+                if table is not None and table.covers(categories):
+                    continue
+
+                table = self._open_table(year)
+
+                if table is None or not table.covers(categories):
+                    await self._load_year(query_api, year, categories)
+                    table = self._open_table(year)
+
+                if table is not None:
+                    with self._lock:
+                        self._tables[year] = table
+
+    def lookup(
+        self, timestamps: pd.DatetimeIndex, weights: dict[str, float]
+    ) -> np.ndarray:
+        """Look up the weighted sum of the standard profiles at the given timestamps.
+
+        Args:
+            timestamps (pd.DatetimeIndex): The (timezone-aware) timestamps to look up.
+            weights (dict[str, float]): The weight of each profile category for the asset.
+
+        Returns:
+            np.ndarray: The scaled profile at each timestamp. NaN where no profile is available.
+        """
+        timestamps_ns = (
+            timestamps.tz_convert("UTC").as_unit("ns").to_numpy(dtype=np.int64)
+        )
+        years = timestamps.tz_convert("UTC").year.to_numpy()
+        scaled_profile = np.full(len(timestamps), np.nan)
+
+        for year in np.unique(years):
+            table = self._tables.get(int(year))
+            if table is None:
+                continue
+
+            unknown_categories = weights.keys() - table.category_positions.keys()
+            if unknown_categories:
+                msg = f"Unknown standard profile categories for {year}: {sorted(unknown_categories)}"
+                raise ValueError(msg)
+
+            in_year = years == year
+            slots = (timestamps_ns[in_year] - table.year_start_ns) // _SLOT_NS
+            positions = [table.category_positions[c] for c in weights]
+            category_weights = np.fromiter(weights.values(), dtype=np.float64)
+
+            scaled_profile[in_year] = (
+                table.values[np.ix_(slots, positions)] @ category_weights
+            )
+
+        return scaled_profile
+
+
+standard_profile_store = StandardProfileStore(
+    root_directory=Path(LOCAL_STORE_DIR) / "standard_profiles"
+)
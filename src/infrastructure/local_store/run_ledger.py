@@ -0,0 +1,298 @@
+"""Module containing a local ledger of the runs of the BL, checkpointing the output of every stage."""
+
+import fcntl
+import json
+import os
+import shutil
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from src.application.run_checkpoints import RunCheckpointsBase
+from src.config import LOCAL_STORE_DIR, RUN_LEDGER_RETENTION_DAYS
+from src.infrastructure.local_store._columnar import (
+    read_frame,
+    read_manifest,
+    write_frame,
+)
+from src.logger import logger
+from src.models.predicted_load import PredictedGridAssetLoad
+
+_STATE_FILE = "state.json"
+_LOCK_FILE = ".lock"
+
+
+class RunLockedError(Exception):
+    """Raised when the ledger entry of a run is locked by another run."""
+
+
+class RunLedgerEntry(RunCheckpointsBase):
+    """The checkpoints of the run of a single asset and target day.
+
+    The features and predictions are stored as columnar dataframes, the completion of the other
+    stages in a JSON state file. Every checkpoint is written atomically.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        """Initializes the ledger entry.
+
+        Args:
+            directory (Path): The directory of the entry.
+        """
+        self.directory = directory
+        state_file = directory / _STATE_FILE
+        self._state: dict[str, Any] = (
+            json.loads(state_file.read_text()) if state_file.exists() else {}
+        )
+
+    def _write_state(self) -> None:
+        staging_file = self.directory / f".{_STATE_FILE}.tmp"
+        staging_file.write_text(json.dumps(self._state))
+        os.replace(staging_file, self.directory / _STATE_FILE)
+
+    def reset(self, horizon: list[str]) -> None:
+        """Discard all checkpoints and start the entry for the given horizon.
+
+        Args:
+            horizon (list[str]): The start and end of the horizon of the run (ISO format).
+        """
+        for path in self.directory.iterdir():
+            if path.name == _LOCK_FILE:
+                continue
+            if path.is_dir():
+                shutil.rmtree(path)
+            else:
+                path.unlink()
+
+        self._state = {"horizon": horizon, "audited": False, "published": {}}
+        self._write_state()
+
+    @property
+    def horizon(self) -> list[str] | None:
+        """The start and end of the horizon of the run (ISO format). None for a new entry."""
+        return self._state.get("horizon")
+
+    def _features_directory(self, start: datetime, end: datetime) -> Path:
+        return self.directory / "features" / f"{start.isoformat()}_{end.isoformat()}"
+
+    def get_features(self, start: datetime, end: datetime) -> pd.DataFrame | None:
+        """Retrieve the checkpointed features between the given times.
+
+        Args:
+            start (datetime): The start time (inclusive) of the features.
+            end (datetime): The end time (exclusive) of the features.
+
+        Returns:
+            pd.DataFrame | None: The features. None if the features were not checkpointed.
+        """
+        directory = self._features_directory(start, end)
+        manifest = read_manifest(directory)
+
+        return read_frame(directory, manifest) if manifest is not None else None
+
+    def put_features(
+        self, start: datetime, end: datetime, features: pd.DataFrame
+    ) -> None:
+        """Checkpoint the features between the given times.
+
+        Args:
+            start (datetime): The start time (inclusive) of the features.
+            end (datetime): The end time (exclusive) of the features.
+            features (pd.DataFrame): The features.
+        """
+        write_frame(self._features_directory(start, end), features, metadata={})
+
+    def get_predictions(self) -> list[PredictedGridAssetLoad] | None:
+        """Retrieve the checkpointed predictions of the run.
+
+        Returns:
+            list[PredictedGridAssetLoad] | None: The predictions. None if the predictions were not checkpointed.
+        """
+        directory = self.directory / "predictions"
+        manifest = read_manifest(directory)
+
+        if manifest is None:
+            return None
+
+        predictions = read_frame(directory, manifest)
+        return [
+            PredictedGridAssetLoad(
+                time=time.to_pydatetime(),
+                load=load,
+                duration=timedelta(seconds=duration_seconds),
+            )
+            for time, duration_seconds, load in zip(
+                predictions["time"],
+                predictions["duration_seconds"].tolist(),
+                predictions["load"].tolist(),
+                strict=True,
+            )
+        ]
+
+    def put_predictions(
+        self, predicted_grid_asset_loads: list[PredictedGridAssetLoad]
+    ) -> None:
+        """Checkpoint the predictions of the run.
+
+        Args:
+            predicted_grid_asset_loads (list[PredictedGridAssetLoad]): The predictions.
+        """
+        predictions = pd.DataFrame(
+            {
+                "time": pd.to_datetime(
+                    [load.time for load in predicted_grid_asset_loads]
+                ),
+                "duration_seconds": [
+                    load.duration.total_seconds() for load in predicted_grid_asset_loads
+                ],
+                "load": [load.load for load in predicted_grid_asset_loads],
+            }
+        )
+        write_frame(self.directory / "predictions", predictions, metadata={})
+
+    def is_audited(self) -> bool:
+        """Check whether the predictions of the run were audited.
+
+        Returns:
+            bool: Whether the predictions were audited.
+        """
+        return self._state.get("audited", False)
+
+    def mark_audited(self) -> None:
+        """Checkpoint that the predictions of the run were audited."""
+        self._state["audited"] = True
+        self._write_state()
+
+    def get_published_events(self) -> dict[str, str]:
+        """Retrieve the events of the run which were published to the VTN.
+
+        Returns:
+            dict[str, str]: The id in the VTN of every published event, by the start of the event (ISO format).
+        """
+        return dict(self._state.get("published", {}))
+
+    def mark_published(self, event_start: str, event_id: str) -> None:
+        """Checkpoint that an event of the run was published to the VTN.
+
+        Args:
+            event_start (str): The start of the event (ISO format).
+            event_id (str): The id of the event in the VTN.
+        """
+        self._state.setdefault("published", {})[event_start] = event_id
+        self._write_state()
+
+
+class RunLedger:
+    """Ledger of the runs of the BL, with an entry per (asset, target day).
+
+    An entry is locked while a run works on it, so overlapping runs (for example overlapping
+    timer firings) do not run the same work twice. The lock is an advisory file lock, which is
+    released by the operating system if the process holding it dies.
+    """
+
+    def __init__(self, root_directory: Path, retention_days: int) -> None:
+        """Initializes the run ledger.
+
+        Args:
+            root_directory (Path): The directory to store the ledger in.
+            retention_days (int): The number of days the entries of past target days are kept.
+        """
+        self.root_directory = root_directory
+        self.retention_days = retention_days
+
+    def _prune(self, asset_directory: Path, today: date) -> None:
+        """Remove the entries of an asset whose target day is past the retention period.
+
+        Args:
+            asset_directory (Path): The directory of the entries of the asset.
+            today (date): The current target day.
+        """
+        for entry_directory in asset_directory.iterdir():
+            try:
+                target_day = date.fromisoformat(entry_directory.name)
+            except ValueError:
+                continue
+
+            if (today - target_day).days > self.retention_days:
+                shutil.rmtree(entry_directory, ignore_errors=True)
+
+    @contextmanager
+    def open(
+        self, asset_id: str, from_date: datetime, to_date: datetime
+    ) -> Iterator[RunLedgerEntry]:
+        """Open and lock the entry of the run of the given asset and horizon.
+
+        The entry is keyed by the asset and the day the horizon starts. If the entry was created for
+        a different horizon, its checkpoints are discarded.
+
+        Args:
+            asset_id (str): The identifier of the asset.
+            from_date (datetime): The start time (inclusive) of the horizon of the run.
+            to_date (datetime): The end time (exclusive) of the horizon of the run.
+
+        Returns:
+            Iterator[RunLedgerEntry]: The locked entry.
+        """
+        asset_directory = self.root_directory / asset_id
+        directory = asset_directory / from_date.date().isoformat()
+        directory.mkdir(parents=True, exist_ok=True)
+
+        with open(directory / _LOCK_FILE, "a") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError as exc:
+                msg = f"The run of {directory} is locked by another run"
+                raise RunLockedError(msg) from exc
+
+            try:
+                self._prune(asset_directory, from_date.date())
+
+                entry = RunLedgerEntry(directory)
+                horizon = [from_date.isoformat(), to_date.isoformat()]
+                if entry.horizon != horizon:
+                    entry.reset(horizon)
+                else:
+                    logger.info(
+                        "RunLedger: Resuming run of %s from its checkpoints.", directory
+                    )
+
+                yield entry
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def peek(
+        self, asset_id: str, from_date: datetime, to_date: datetime
+    ) -> RunLedgerEntry | None:
+        """Read the entry of the run of the given asset and horizon, without locking it.
+
+        The entry may be written by a run in the meantime, so it must only be read from. Every
+        checkpoint is written atomically, so a checkpoint is read either completely or not at all.
+
+        Args:
+            asset_id (str): The identifier of the asset.
+            from_date (datetime): The start time (inclusive) of the horizon of the run.
+            to_date (datetime): The end time (exclusive) of the horizon of the run.
+
+        Returns:
+            RunLedgerEntry | None: The entry. None if no run of the horizon was started.
+        """
+        directory = self.root_directory / asset_id / from_date.date().isoformat()
+
+        if not directory.is_dir():
+            return None
+
+        entry = RunLedgerEntry(directory)
+        if entry.horizon != [from_date.isoformat(), to_date.isoformat()]:
+            return None
+
+        return entry
+
+
+run_ledger = RunLedger(
+    root_directory=Path(LOCAL_STORE_DIR) / "runs",
+    retention_days=RUN_LEDGER_RETENTION_DAYS,
+)
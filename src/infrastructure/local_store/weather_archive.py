@@ -0,0 +1,232 @@
+"""Module containing a local archive of the fetched weather forecasts.
+
+Every fetched forecast, already interpolated to quarter-hours, is archived as a snapshot keyed by
+the grid cell it was fetched for, the model run it was fetched from and the window it covers. The
+forecast frames are stored once per content hash, so snapshots of an unchanged forecast only add
+an entry to the index. Replays, backtests and retried runs read the forecast from the archive
+instead of calling the weather forecast API. Snapshots past the retention period are pruned.
+"""
+
+import json
+import os
+import shutil
+import uuid
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+import pandas as pd
+
+from src.config import LOCAL_STORE_DIR, WEATHER_ARCHIVE_RETENTION_DAYS
+from src.infrastructure.local_store._columnar import (
+    frame_content_hash,
+    read_frame,
+    read_manifest,
+    write_frame,
+)
+from src.logger import logger
+
+
+class WeatherForecastArchive:
+    """Archive of weather forecast snapshots, with the forecast frames deduplicated by content hash.
+
+    The snapshots are indexed per grid cell and (UTC) day the window of the snapshot starts, so a
+    lookup only reads the index of a few days.
+    """
+
+    def __init__(self, root_directory: Path, retention_days: int) -> None:
+        """Initializes the weather forecast archive.
+
+        Args:
+            root_directory (Path): The directory to store the archive in.
+            retention_days (int): The number of days the snapshots are kept, counted from the day their
+                window starts.
+        """
+        self.root_directory = root_directory
+        self.retention_days = retention_days
+        self._lock = Lock()
+
+    def _frame_directory(self, content_hash: str) -> Path:
+        return self.root_directory / "frames" / content_hash
+
+    def _index_file(self, grid_cell: str, day: str) -> Path:
+        return self.root_directory / "index" / grid_cell / f"{day}.json"
+
+    def _read_index(self, grid_cell: str, day: str) -> list[dict[str, Any]]:
+        index_file = self._index_file(grid_cell, day)
+
+        return json.loads(index_file.read_text()) if index_file.exists() else []
+
+    def _prune(self, today: date) -> None:
+        """Remove the snapshots past the retention period, and the frames no snapshot refers to anymore.
+
+        Args:
+            today (date): The current (UTC) day.
+        """
+        index_files = list((self.root_directory / "index").glob("*/*.json"))
+        expired_files = [
+            index_file
+            for index_file in index_files
+            if (today - date.fromisoformat(index_file.stem)).days > self.retention_days
+        ]
+        if not expired_files:
+            return
+
+        for index_file in expired_files:
+            index_file.unlink(missing_ok=True)
+
+        # Frames are shared by the snapshots of all days, so only unreferenced frames are removed.
+        referenced_hashes = {
+            snapshot["content_hash"]
+            for index_file in index_files
+            if index_file not in expired_files
+            for snapshot in json.loads(index_file.read_text())
+        }
+        for frame_directory in (self.root_directory / "frames").iterdir():
+            if frame_directory.name not in referenced_hashes:
+                shutil.rmtree(frame_directory, ignore_errors=True)
+
+        logger.info(
+            "WeatherForecastArchive: Pruned the snapshots of %d grid cell days.",
+            len(expired_files),
+        )
+
+    def put(
+        self,
+        grid_cell: str,
+        model_run: datetime,
+        window_start: datetime,
+        window_end: datetime,
+        forecast: pd.DataFrame,
+    ) -> bool:
+        """Archive a snapshot of a fetched weather forecast.
+
+        Args:
+            grid_cell (str): The identifier of the grid cell the forecast was fetched for.
+            model_run (datetime): The (UTC) model run the forecast was fetched from.
+            window_start (datetime): The start time (inclusive) of the window of the forecast.
+            window_end (datetime): The end time (exclusive) of the window of the forecast.
+            forecast (pd.DataFrame): The forecast, interpolated to quarter-hours.
+
+        Returns:
+            bool: Whether the content of the forecast was not archived before.
+        """
+        content_hash = frame_content_hash(forecast)
+        frame_directory = self._frame_directory(content_hash)
+
+        window_start_utc = pd.Timestamp(window_start).tz_convert("UTC")
+        day = window_start_utc.date().isoformat()
+        snapshot = {
+            "model_run": model_run.isoformat(),
+            "window_start": window_start_utc.isoformat(),
+            "window_end": pd.Timestamp(window_end).tz_convert("UTC").isoformat(),
+            "content_hash": content_hash,
+        }
+
+        # The frame is written under the lock as well, so it is not pruned before its snapshot is indexed.
+        with self._lock:
+            self._prune(pd.Timestamp(model_run).tz_convert("UTC").date())
+
+            is_new_content = read_manifest(frame_directory) is None
+            if is_new_content:
+                write_frame(
+                    frame_directory, forecast, metadata={"grid_cell": grid_cell}
+                )
+
+            index = self._read_index(grid_cell, day)
+            if snapshot in index:
+                return is_new_content
+
+            index.append(snapshot)
+            index_file = self._index_file(grid_cell, day)
+            index_file.parent.mkdir(parents=True, exist_ok=True)
+            staging_file = index_file.parent / f".{index_file.name}.{uuid.uuid4().hex}"
+            staging_file.write_text(json.dumps(index))
+            os.replace(staging_file, index_file)
+
+        logger.info(
+            "WeatherForecastArchive: Archived forecast of %s from model run %s (%s content).",
+            grid_cell,
+            snapshot["model_run"],
+            "new" if is_new_content else "known",
+        )
+        return is_new_content
+
+    def read(
+        self,
+        grid_cell: str,
+        window_start: datetime,
+        window_end: datetime,
+        model_run: datetime | None = None,
+        as_of: datetime | None = None,
+    ) -> pd.DataFrame | None:
+        """Read the archived forecast of the given window, from the latest model run archived.
+
+        Snapshots of a larger window which covers the given window are read from as well, limited
+        to the quarter-hours of the given window.
+
+        Args:
+            grid_cell (str): The identifier of the grid cell.
+            window_start (datetime): The start time (inclusive) of the window.
+            window_end (datetime): The end time (exclusive) of the window.
+            model_run (datetime | None): Only read the snapshots of this model run. If None, snapshots
+                of all model runs are read.
+            as_of (datetime | None): Only read the snapshots of model runs at or before this time. If None,
+                snapshots of all model runs are read.
+
+        Returns:
+            pd.DataFrame | None: The forecast. None if no snapshot of the window was archived.
+        """
+        window_start_utc = pd.Timestamp(window_start).tz_convert("UTC")
+        window_end_utc = pd.Timestamp(window_end).tz_convert("UTC")
+        # Covering windows are looked up in the index of the start day and the day before.
+        days = [
+            (window_start_utc - timedelta(days=offset)).date().isoformat()
+            for offset in (1, 0)
+        ]
+
+        snapshots = [
+            snapshot
+            for day in days
+            for snapshot in self._read_index(grid_cell, day)
+            if pd.Timestamp(snapshot["window_start"]) <= window_start_utc
+            and pd.Timestamp(snapshot["window_end"]) >= window_end_utc
+            and (model_run is None or snapshot["model_run"] == model_run.isoformat())
+            and (as_of is None or pd.Timestamp(snapshot["model_run"]) <= as_of)
+        ]
+
+        if not snapshots:
+            return None
+
+        # Of the snapshots of the latest model run, the one of the narrowest window is the closest to a fetch.
+        latest = max(
+            snapshots,
+            key=lambda snapshot: (
+                snapshot["model_run"],
+                snapshot["window_start"],
+                pd.Timestamp(snapshot["window_start"])
+                - pd.Timestamp(snapshot["window_end"]),
+            ),
+        )
+        frame_directory = self._frame_directory(latest["content_hash"])
+        manifest = read_manifest(frame_directory)
+
+        if manifest is None:
+            return None
+
+        forecast = read_frame(frame_directory, manifest)
+        in_window = (forecast["datetime"] >= window_start_utc) & (
+            forecast["datetime"] < window_end_utc
+        )
+
+        if in_window.all():
+            return forecast
+
+        return forecast[in_window].reset_index(drop=True)
+
+
+weather_forecast_archive = WeatherForecastArchive(
+    root_directory=Path(LOCAL_STORE_DIR) / "weather_forecasts",
+    retention_days=WEATHER_ARCHIVE_RETENTION_DAYS,
+)
@@ -1,14 +1,44 @@
 """Module which implements prediction actions."""
 
-from datetime import datetime
+import asyncio
+import time
+from datetime import datetime, timedelta
 
 from influxdb_client.client.influxdb_client_async import InfluxDBClientAsync
 from influxdb_client.client.query_api_async import QueryApiAsync
 from influxdb_client.client.write_api_async import WriteApiAsync
+import pandas as pd
 
 from src.application.generate_events import PredictionActionsBase
-from src.infrastructure.azureml.feature_generation import get_features_between_dates
+from src.infrastructure._memory import memory_budget, track_stage
+from src.infrastructure.accuracy_monitor import AUDITED_FORECASTERS
+from src.infrastructure.azureml.feature_generation import (
+    HorizonSources,
+    get_features_between_dates,
+    get_features_for_remaining_horizon,
+    get_horizon_sources,
+)
+from src.config import (
+    BASELINE_FORECASTER_MODE,
+    MEMORY_CHUNK_HOURS,
+    MOCK_EAN_NUMBER,
+    PREDICTED_TRAFO_LOAD_BUCKET,
+    PREDICTION_MODE,
+)
+from src.infrastructure.azureml.baseline_forecaster import (
+    get_baseline_predictions_for_features,
+    log_forecast_comparison,
+)
+from src.infrastructure.azureml.inference_cache import inference_cache
+from src.infrastructure.azureml.endpoint_resilience import (
+    ModelEndpointUnavailableError,
+)
 from src.infrastructure.azureml.predictions import get_predictions_for_features
+from src.infrastructure.influxdb.prediction_retrieval import (
+    retrieve_predicted_grid_asset_load,
+)
+from src.infrastructure.local_store.run_ledger import RunLedgerEntry
+from src.logger import logger
 from src.models.predicted_load import PredictedGridAssetLoad
 from src.infrastructure.influxdb.trafo_load_audit import store_predictions_for_audit
 
@@ -23,13 +53,28 @@ class PredictionActionsInfluxDB(PredictionActionsBase[QueryApiAsync, WriteApiAsy
         PredictionActionsBase: Base class for actions
     """
 
-    def __init__(self, client: InfluxDBClientAsync) -> None:
+    def __init__(
+        self,
+        client: InfluxDBClientAsync,
+        ledger_entry: RunLedgerEntry | None = None,
+        asset_id: str = MOCK_EAN_NUMBER,
+        read_only: bool = False,
+    ) -> None:
         """Initializes the PredictionActionsInfluxDB.
 
         Args:
             client (InfluxDBClient): The influx DB client to use in these actions.
+            ledger_entry (RunLedgerEntry | None): The ledger entry of the run to checkpoint the features in.
+                If None, the features are not checkpointed.
+            asset_id (str): The EAN number of the grid asset the predictions are made for. Defaults to MOCK_EAN_NUMBER.
+            read_only (bool): Whether the actions only read from the database, as for previews. New predictions
+                are then neither stored in the inference cache nor compared with the baseline forecaster, and
+                nothing is audited. Defaults to False.
         """
         self.client = client
+        self.ledger_entry = ledger_entry
+        self.asset_id = asset_id
+        self.read_only = read_only
         super().__init__()
 
     def get_query_api(self) -> QueryApiAsync:
@@ -40,6 +85,115 @@ class PredictionActionsInfluxDB(PredictionActionsBase[QueryApiAsync, WriteApiAsy
         """Retrieve a write connection for the database."""
         return self.client.write_api()
 
+    async def _predict(
+        self, query_api: QueryApiAsync, features: pd.DataFrame
+    ) -> list[PredictedGridAssetLoad]:
+        """Make predictions for the given features, served from the inference cache if they were scored before.
+
+        Args:
+            query_api (QueryApi): The read-only connection to the database.
+            features (pd.DataFrame): The features to make predictions for.
+
+        Returns:
+            list[PredictedGridAssetLoad]: The list of predicted grid asset loads.
+        """
+        if BASELINE_FORECASTER_MODE == "primary":
+            return get_baseline_predictions_for_features(features=features)
+
+        cached_predictions = await inference_cache.get(query_api, features)
+        if cached_predictions is not None:
+            return cached_predictions
+
+        started_at = time.perf_counter()
+        try:
+            # The call to the endpoint blocks, so it is made on a worker thread to keep the event loop responsive.
+            predictions = await asyncio.to_thread(
+                get_predictions_for_features, features=features
+            )
+        except ModelEndpointUnavailableError as exc:
+            # The baseline predictions are marked as made by the baseline forecaster, so they are neither
+            # checkpointed in the run ledger nor audited as predictions of the model. They are not stored in
+            # the inference cache, the model is called again on the next run.
+            logger.warning(
+                "Prediction model unavailable, using baseline forecast", exc_info=exc
+            )
+            return get_baseline_predictions_for_features(features=features)
+        model_seconds = time.perf_counter() - started_at
+
+        if self.read_only:
+            return predictions
+
+        write_api = self.get_write_api()
+        await inference_cache.put(write_api, features, predictions)
+
+        if BASELINE_FORECASTER_MODE == "shadow":
+            started_at = time.perf_counter()
+            baseline_predictions = get_baseline_predictions_for_features(
+                features=features
+            )
+            log_forecast_comparison(
+                model_loads=predictions,
+                model_seconds=model_seconds,
+                baseline_loads=baseline_predictions,
+                baseline_seconds=time.perf_counter() - started_at,
+            )
+            await store_predictions_for_audit(
+                write_api=write_api,
+                predicted_loads=baseline_predictions,
+                measurement_name="baseline_predictions",
+            )
+
+        return predictions
+
+    async def _predict_between(
+        self,
+        query_api: QueryApiAsync,
+        from_date: datetime,
+        to_date: datetime,
+        sources: HorizonSources | None = None,
+    ) -> list[PredictedGridAssetLoad]:
+        """Generate the features between the given times and make predictions for them.
+
+        The memory used to do so is recorded against the memory budget, to estimate the memory usage
+        of the next horizons.
+
+        Args:
+            query_api (QueryApi): The read-only connection to the database.
+            from_date (datetime): The start time (inclusive) of the predictions.
+            to_date (datetime): The end time (exclusive) of the predictions.
+            sources (HorizonSources | None): The upstream sources of the horizon, if the times are a chunk of
+                the horizon. If None, the sources of the times are retrieved.
+
+        Returns:
+            list[PredictedGridAssetLoad]: The list of predicted grid asset loads.
+        """
+        with track_stage("features") as features_metrics:
+            features_for_time_range = (
+                self.ledger_entry.get_features(from_date, to_date)
+                if self.ledger_entry
+                else None
+            )
+            if features_for_time_range is None:
+                features_for_time_range = await get_features_between_dates(
+                    query_api=query_api,
+                    start_date_inclusive=from_date,
+                    end_date_inclusive=to_date,
+                    asset_id=self.asset_id,
+                    sources=sources,
+                )
+                if self.ledger_entry:
+                    self.ledger_entry.put_features(
+                        from_date, to_date, features_for_time_range
+                    )
+
+        with track_stage("inference") as inference_metrics:
+            predictions = await self._predict(query_api, features_for_time_range)
+
+        memory_budget.record_horizon(
+            len(features_for_time_range), [features_metrics, inference_metrics]
+        )
+        return predictions
+
     async def get_predicted_grid_asset_load(
         self, query_api: QueryApiAsync, from_date: datetime, to_date: datetime
     ) -> list[PredictedGridAssetLoad]:
@@ -53,25 +207,110 @@ class PredictionActionsInfluxDB(PredictionActionsBase[QueryApiAsync, WriteApiAsy
         Returns:
             list[TransformerLoad]: The list of predicted transformer loads.
         """
-        features_for_time_range = await get_features_between_dates(
-            query_api=query_api,
-            start_date_inclusive=from_date,
-            end_date_inclusive=to_date,
+        if PREDICTION_MODE == "stored":
+            logger.info(
+                "Serving stored predictions between %s and %s", from_date, to_date
+            )
+            return await retrieve_predicted_grid_asset_load(
+                query_api=query_api,
+                bucket=PREDICTED_TRAFO_LOAD_BUCKET,
+                from_date=from_date,
+                to_date=to_date,
+            )
+
+        # Whether to chunk is decided up front, from the estimated memory usage of the whole horizon.
+        if memory_budget.fits((to_date - from_date) // timedelta(minutes=15)):
+            return await self._predict_between(query_api, from_date, to_date)
+
+        logger.info(
+            "Horizon %s - %s is estimated to exceed the memory budget, processing it in chunks of %d hours",
+            from_date,
+            to_date,
+            MEMORY_CHUNK_HOURS,
         )
-        return get_predictions_for_features(features=features_for_time_range)
+
+        # Process the horizon in chunks, so only the features of a single chunk are held in memory. The weather
+        # forecast, fingerprint and dalidata of the lag windows of the horizon are retrieved once for all chunks.
+        sources = await get_horizon_sources(
+            query_api, from_date, to_date, include_lag_arrays=True
+        )
+        predicted_loads: list[PredictedGridAssetLoad] = []
+        chunk_start = from_date
+        while chunk_start < to_date:
+            chunk_end = min(chunk_start + timedelta(hours=MEMORY_CHUNK_HOURS), to_date)
+            predicted_loads.extend(
+                await self._predict_between(query_api, chunk_start, chunk_end, sources)
+            )
+            chunk_start = chunk_end
+
+        return predicted_loads
+
+    async def get_remaining_predicted_grid_asset_load(
+        self,
+        query_api: QueryApiAsync,
+        horizon_start: datetime,
+        horizon_end: datetime,
+        from_date: datetime,
+    ) -> list[PredictedGridAssetLoad]:
+        """Retrieve predicted trafo load for the remaining part of an already forecasted horizon.
+
+        Args:
+            query_api (QueryApi): The read-only connection to the database.
+            horizon_start (datetime): The start time (inclusive) of the forecasted horizon.
+            horizon_end (datetime): The end time (exclusive) of the forecasted horizon.
+            from_date (datetime): The start time (inclusive) of the remaining part of the horizon.
+
+        Returns:
+            list[TransformerLoad]: The list of predicted transformer loads.
+        """
+        if PREDICTION_MODE == "stored":
+            return await self.get_predicted_grid_asset_load(
+                query_api, from_date, horizon_end
+            )
+
+        with track_stage("features"):
+            features_for_remaining_horizon = await get_features_for_remaining_horizon(
+                query_api=query_api,
+                horizon_start=horizon_start,
+                horizon_end=horizon_end,
+                from_date=from_date,
+                asset_id=self.asset_id,
+            )
+
+        with track_stage("inference"):
+            return await self._predict(query_api, features_for_remaining_horizon)
 
     async def audit_predicted_grid_asset_loads(
         self,
         write_api: WriteApiAsync,
         predicted_grid_asset_loads: list[PredictedGridAssetLoad],
+        reforecast: bool = False,
     ) -> None:
         """Audit predicted grid asset loads by storing them in the database.
 
+        The predictions are stored in the measurement of the forecaster which made them. Intraday
+        re-forecasts are stored in the same measurement prefixed with "intraday_", so they do not
+        overwrite the day-ahead forecast.
+
         Args:
             write_api (WriteApi): The write connection to the database.
             predicted_grid_asset_loads (list[PredictedGridAssetLoad]): The list of predicted grid asset loads to audit.
+            reforecast (bool): Whether the loads are an intraday re-forecast of an active event. Defaults to False.
         """
-        await store_predictions_for_audit(
-            write_api=write_api,
-            predicted_loads=predicted_grid_asset_loads,
-        )
+        if self.read_only:
+            return
+
+        loads_per_forecaster: dict[str, list[PredictedGridAssetLoad]] = {}
+        for load in predicted_grid_asset_loads:
+            loads_per_forecaster.setdefault(load.forecaster, []).append(load)
+
+        with track_stage("audit"):
+            for forecaster, loads in loads_per_forecaster.items():
+                measurement_name = AUDITED_FORECASTERS[forecaster]
+                await store_predictions_for_audit(
+                    write_api=write_api,
+                    predicted_loads=loads,
+                    measurement_name=f"intraday_{measurement_name}"
+                    if reforecast
+                    else measurement_name,
+                )
@@ -59,16 +59,40 @@ class PredictionActionsStub(PredictionActionsBase[None, None]):
 
         return predicted_grid_asset_loads
 
+    async def get_remaining_predicted_grid_asset_load(
+        self,
+        query_api: None,
+        horizon_start: datetime,
+        horizon_end: datetime,
+        from_date: datetime,
+    ) -> list[PredictedGridAssetLoad]:
+        """Generate predicted grid asset loads for the remaining part of a horizon within this stub.
+
+        Args:
+            query_api (None): The read-only connection.
+            horizon_start (datetime): The start time (inclusive) of the forecasted horizon.
+            horizon_end (datetime): The end time (exclusive) of the forecasted horizon.
+            from_date (datetime): The start time (inclusive) of the remaining part of the horizon.
+
+        Returns:
+            list[TransformerLoad]: The list of predicted transformer loads.
+        """
+        return await self.get_predicted_grid_asset_load(
+            query_api, from_date, horizon_end
+        )
+
     async def audit_predicted_grid_asset_loads(
         self,
         write_api: None,
         predicted_grid_asset_loads: list[PredictedGridAssetLoad],
+        reforecast: bool = False,
     ) -> None:
         """Stub implementation of auditing predicted grid asset loads.
 
         Args:
             write_api (None): The write connection.
             predicted_grid_asset_loads (list[PredictedGridAssetLoad]): The list of predicted grid asset loads to audit.
+            reforecast (bool): Whether the loads are an intraday re-forecast of an active event.
         """
         # In this stub implementation, we do nothing.
         pass
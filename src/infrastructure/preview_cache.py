@@ -0,0 +1,102 @@
+"""Module containing the in-memory cache of the previews served by the preview endpoint.
+
+A preview which is not cached, or expired, is computed once: concurrent requests for the same
+preview wait for the computation in flight instead of starting their own (single-flight), so a
+burst of requests runs at most one prediction of the window.
+"""
+
+import asyncio
+import hashlib
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+
+from src.config import PREVIEW_CACHE_SECONDS
+
+
+@dataclass(frozen=True)
+class CachedPreview:
+    """A computed preview, with the entity tag of its body."""
+
+    body: bytes
+    etag: str
+    expires_at: float
+
+
+class PreviewCache:
+    """Cache of serialized previews, which computes a missing preview once for all concurrent requests."""
+
+    def __init__(self, ttl_seconds: float) -> None:
+        """Initializes the preview cache.
+
+        Args:
+            ttl_seconds (float): The number of seconds a preview is served from the cache.
+        """
+        self.ttl_seconds = ttl_seconds
+        self._previews: dict[Hashable, CachedPreview] = {}
+        self._in_flight: dict[Hashable, asyncio.Task[CachedPreview]] = {}
+
+    async def _compute(
+        self, key: Hashable, compute: Callable[[], Awaitable[bytes]]
+    ) -> CachedPreview:
+        try:
+            body = await compute()
+            preview = CachedPreview(
+                body=body,
+                etag=f'"{hashlib.sha256(body).hexdigest()}"',
+                expires_at=time.monotonic() + self.ttl_seconds,
+            )
+            self._previews[key] = preview
+            return preview
+        finally:
+            del self._in_flight[key]
+
+    async def get_or_compute(
+        self, key: Hashable, compute: Callable[[], Awaitable[bytes]]
+    ) -> CachedPreview:
+        """Retrieve the cached preview of the given key, computing it if it is not cached or expired.
+
+        A failed computation is not cached, the next request computes the preview again.
+
+        Args:
+            key (Hashable): The key of the preview.
+            compute (Callable[[], Awaitable[bytes]]): Computes the serialized preview.
+
+        Returns:
+            CachedPreview: The preview.
+        """
+        current_time = time.monotonic()
+        preview = self._previews.get(key)
+        if preview is not None and preview.expires_at > current_time:
+            return preview
+
+        # Drop the expired previews, so previews of windows which are not requested again do not pile up.
+        for expired_key in [
+            cached_key
+            for cached_key, cached in self._previews.items()
+            if cached.expires_at <= current_time
+        ]:
+            del self._previews[expired_key]
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._compute(key, compute))
+            self._in_flight[key] = task
+
+        # A cancelled request does not cancel the computation the other requests wait for.
+        return await asyncio.shield(task)
+
+    @staticmethod
+    def remaining_seconds(preview: CachedPreview) -> int:
+        """Retrieve the number of (whole) seconds the given preview is still served from the cache.
+
+        Args:
+            preview (CachedPreview): The preview.
+
+        Returns:
+            int: The seconds until the preview expires. Zero if it expired.
+        """
+        return max(0, int(preview.expires_at - time.monotonic()))
+
+
+preview_cache = PreviewCache(ttl_seconds=PREVIEW_CACHE_SECONDS)
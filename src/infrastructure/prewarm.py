@@ -0,0 +1,129 @@
+"""Module containing the prewarm of the caches, tokens and connections used by the runs of the BL.
+
+Without prewarming, the first run on a worker pays for all of them lazily: the OAuth tokens of
+the VTN and the prediction model endpoint, the connections to InfluxDB, the VTN and the weather
+API, the holiday calendar, the standard profiles, the dalidata rollups and the process pool.
+The prewarm sets them up ahead of the run and assembles the features of the upcoming horizon,
+which are stored in the feature store and served to the run if its upstream sources are unchanged.
+
+Every step is idempotent, and cheap when what it warms is still warm.
+"""
+
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+
+from openadr3_client._vtn.interfaces.filters import PaginationFilter, TargetFilter
+from openadr3_client.bl._client import BusinessLogicClient
+
+from src.config import DALI_ROLLUPS_ENABLED, MOCK_EAN_NUMBER, PROGRAM_ID, VEN_NAMES
+from src.cpu_pool import warm_up_pool
+from src.infrastructure.azureml.feature_generation import (
+    get_features_between_dates,
+    get_nl_holidays,
+)
+from src.infrastructure.azureml.inference_backends import get_inference_backend
+from src.infrastructure.influxdb._client import get_db_client
+from src.infrastructure.local_store.dali_rollups import dali_rollup_store
+from src.logger import logger
+
+# The modules of the stages which run in the process pool.
+_POOL_STAGE_MODULES = (
+    "src.infrastructure.azureml.feature_generation",
+    "src.application.generate_events",
+)
+
+
+async def _warm_vtn(bl_client: BusinessLogicClient) -> None:
+    """Fetch the access token of the VTN and open the connection to it, with the smallest possible request.
+
+    Args:
+        bl_client (BusinessLogicClient): The BL client.
+    """
+    bl_client.events.get_events(
+        program_id=PROGRAM_ID,
+        pagination=PaginationFilter(skip=0, limit=1),
+        target=TargetFilter(target_type="VEN_NAME", target_values=VEN_NAMES.split(",")),
+    )
+
+
+async def _warm_influxdb() -> None:
+    """Open the connection of the shared InfluxDB client."""
+    if not await get_db_client().ping():
+        msg = "InfluxDB did not respond to the ping"
+        raise ValueError(msg)
+
+
+async def _warm_calendar(from_date: datetime, to_date: datetime) -> None:
+    """Build the holiday calendars of the years of the horizon.
+
+    Args:
+        from_date (datetime): The start time (inclusive) of the horizon.
+        to_date (datetime): The end time (exclusive) of the horizon.
+    """
+    for year in range(from_date.year, to_date.year + 1):
+        get_nl_holidays(year)
+
+
+async def _warm_inference() -> None:
+    """Load the local model, or fetch the access token of the prediction model endpoint."""
+    get_inference_backend().warm_up()
+
+
+async def _warm_dali_rollups(from_date: datetime) -> None:
+    """Roll up the dalidata measured since the last refresh of the rollups.
+
+    Args:
+        from_date (datetime): The start time (inclusive) of the horizon.
+    """
+    if DALI_ROLLUPS_ENABLED:
+        await dali_rollup_store.refresh(
+            get_db_client().query_api(), MOCK_EAN_NUMBER, until=from_date
+        )
+
+
+async def _warm_features(from_date: datetime, to_date: datetime) -> None:
+    """Assemble the features of the horizon, retrieving the weather forecast, dalidata and standard profiles.
+
+    Args:
+        from_date (datetime): The start time (inclusive) of the horizon.
+        to_date (datetime): The end time (exclusive) of the horizon.
+    """
+    await get_features_between_dates(get_db_client().query_api(), from_date, to_date)
+
+
+async def prewarm(
+    bl_client: BusinessLogicClient, from_date: datetime, to_date: datetime
+) -> dict[str, float]:
+    """Warm the caches, tokens and connections used by the run of the given horizon.
+
+    A failing step is logged and does not stop the other steps, the run then warms it lazily.
+
+    Args:
+        bl_client (BusinessLogicClient): The BL client the run publishes its events with.
+        from_date (datetime): The start time (inclusive) of the horizon of the run.
+        to_date (datetime): The end time (exclusive) of the horizon of the run.
+
+    Returns:
+        dict[str, float]: The duration in seconds of every step.
+    """
+    steps: dict[str, Callable[[], Awaitable[None]]] = {
+        "cpu_pool": lambda: warm_up_pool(_POOL_STAGE_MODULES),
+        "calendar": lambda: _warm_calendar(from_date, to_date),
+        "influxdb": _warm_influxdb,
+        "vtn": lambda: _warm_vtn(bl_client),
+        "inference": _warm_inference,
+        "dali_rollups": lambda: _warm_dali_rollups(from_date),
+        "features": lambda: _warm_features(from_date, to_date),
+    }
+
+    durations: dict[str, float] = {}
+    for step, warm in steps.items():
+        started_at = time.perf_counter()
+        try:
+            await warm()
+        except Exception as exc:
+            logger.warning("Prewarm: Step %s failed", step, exc_info=exc)
+        durations[step] = time.perf_counter() - started_at
+
+    return durations
@@ -3,7 +3,8 @@
 This module provides:
 - _call_weather_forecast_api: Function that calls the Open-Meteo API to fetch hourly forecast data.
 - _interpolate_hourly_data_to_quarterly: Function that interpolates the hourly values data to quarterly values.
-- etl_weather_forecast_data: Function that extracts, transforms and loads weather forecast data.
+- etl_weather_forecast_data: Function that extracts, transforms and loads weather forecast data,
+  served from and archived in the weather forecast archive.
 """
 
 from datetime import datetime, timezone
@@ -13,7 +14,16 @@ import pandas as pd
 import requests
 from pandas import concat
 
-from src.config import WEATHER_FORECAST_API_URL
+from src.config import (
+    WEATHER_ARCHIVE_MODE,
+    WEATHER_FORECAST_API_URL,
+    WEATHER_REPLAY_AS_OF,
+)
+from src.infrastructure.local_store.weather_archive import weather_forecast_archive
+from src.logger import logger
+
+# Session shared by all forecast retrievals, so the connection to the API is reused between runs.
+_session = requests.Session()
 
 
 class WeatherForecastData:
@@ -30,6 +40,16 @@ class WeatherForecastData:
             "relative_humidity_2m": "humidity",
             "snowfall": "snow",
         }
+        self.latitude = 52.7481819
+        self.longitude = 6.5663292
+        self.model = "knmi_seamless"
+        # The model run of the last fetched forecast, if its content was newly archived.
+        self.archived_model_run: datetime | None = None
+
+    @property
+    def grid_cell(self) -> str:
+        """The identifier of the location and model the forecasts are fetched for."""
+        return f"{self.model}_{self.latitude:.4f}_{self.longitude:.4f}"
 
     def _call_weather_forecast_api(
         self, start_time_inclusive: datetime, end_time_inclusive: datetime
@@ -50,15 +70,15 @@ class WeatherForecastData:
         end_time = end_time_utc.strftime(format="%Y-%m-%dT%H:%M")
 
         params: dict[str, Any] = {
-            "latitude": 52.7481819,
-            "longitude": 6.5663292,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
             "hourly": list(self.om_weather_forecast_vars.keys()),
-            "models": "knmi_seamless",
+            "models": self.model,
             "start_hour": start_time,
             "end_hour": end_time,
         }
 
-        response = requests.get(url=WEATHER_FORECAST_API_URL, params=params, timeout=10)
+        response = _session.get(url=WEATHER_FORECAST_API_URL, params=params, timeout=10)
         response.raise_for_status()
         return response.json()
 
@@ -83,7 +103,72 @@ class WeatherForecastData:
     def etl_weather_forecast_data(
         self, start_time_inclusive: datetime, end_time_inclusive: datetime
     ) -> pd.DataFrame:
-        """Extracts, transforms, and loads weather forecast data.
+        """Extracts, transforms, and loads weather forecast data, served from the weather forecast archive if possible.
+
+        In "record" mode, the forecast of the current model run is read from the archive if it was fetched
+        before, otherwise it is fetched and archived. In "replay" mode, it is only read from the archive.
+
+        Args:
+            start_time_inclusive (datetime): Datetime from which to start fetching forecasts
+            end_time_inclusive (datetime): Datetime from which to stop fetching forecasts
+
+        Returns:
+            Processed DataFrame with interpolated weather data at 15-minute intervals.
+        """
+        self.archived_model_run = None
+
+        if WEATHER_ARCHIVE_MODE == "replay":
+            archived_forecast = weather_forecast_archive.read(
+                self.grid_cell,
+                start_time_inclusive,
+                end_time_inclusive,
+                as_of=datetime.fromisoformat(WEATHER_REPLAY_AS_OF)
+                if WEATHER_REPLAY_AS_OF
+                else None,
+            )
+            if archived_forecast is None:
+                msg = f"No archived weather forecast of {self.grid_cell} between {start_time_inclusive} and {end_time_inclusive}"
+                raise ValueError(msg)
+            self.weather_data = archived_forecast
+            return self.weather_data
+
+        # The forecast of the API is approximated to be of the model run of the current hour.
+        model_run = datetime.now(tz=timezone.utc).replace(
+            minute=0, second=0, microsecond=0
+        )
+
+        if WEATHER_ARCHIVE_MODE == "record":
+            archived_forecast = weather_forecast_archive.read(
+                self.grid_cell,
+                start_time_inclusive,
+                end_time_inclusive,
+                model_run=model_run,
+            )
+            if archived_forecast is not None:
+                self.weather_data = archived_forecast
+                return self.weather_data
+
+        self._fetch_weather_forecast_data(start_time_inclusive, end_time_inclusive)
+
+        if WEATHER_ARCHIVE_MODE == "record":
+            try:
+                if weather_forecast_archive.put(
+                    self.grid_cell,
+                    model_run,
+                    start_time_inclusive,
+                    end_time_inclusive,
+                    self.weather_data,
+                ):
+                    self.archived_model_run = model_run
+            except Exception as exc:
+                logger.warning("Failed to archive the weather forecast", exc_info=exc)
+
+        return self.weather_data
+
+    def _fetch_weather_forecast_data(
+        self, start_time_inclusive: datetime, end_time_inclusive: datetime
+    ) -> pd.DataFrame:
+        """Extracts, transforms, and loads weather forecast data from the weather forecast API.
 
         - Extracts and transforms the forecast data.
         - Reindexes data to 15-minute intervals to maintain consitency.
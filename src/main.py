@@ -1,17 +1,50 @@
+import json
+
 import azure.functions as func
 
+from collections.abc import Callable
+from contextlib import AbstractContextManager, nullcontext
+from functools import cache
 from datetime import UTC, datetime, timedelta
 from zoneinfo import ZoneInfo
 from openadr3_client.bl.http_factory import BusinessLogicHttpClientFactory
 from openadr3_client.bl._client import BusinessLogicClient
-from openadr3_client.models.event.event import NewEvent
+from openadr3_client.models.event.event import ExistingEvent, NewEvent
 from openadr3_client._vtn.interfaces.filters import TargetFilter
 
-from src.application.generate_events import get_capacity_limitation_event
-from src.infrastructure.influxdb._client import create_db_client
+from src.application.fan_out import AssetJob, JobTrackerBase, plan_asset_jobs
+from src.application.generate_events import (
+    PredictionActionsBase,
+    get_capacity_limitation_event_update,
+    get_capacity_limitation_events,
+    get_capacity_limitation_preview,
+    get_event_horizon,
+)
+from src.infrastructure._deadline import run_deadline
+from src.infrastructure.accuracy_monitor import monitor_forecast_accuracy
+from src.infrastructure._memory import track_stage
+from src.infrastructure.asset_job_tracker_impl import AssetJobTrackerInfluxDB
+from src.infrastructure.in_memory_jobs import InMemoryJobQueue, InMemoryJobTracker
+from src.infrastructure.local_store.run_ledger import (
+    RunLedgerEntry,
+    RunLockedError,
+    run_ledger,
+)
+from src.infrastructure.influxdb._client import get_db_client
 from src.infrastructure.prediction_actions_impl import PredictionActionsInfluxDB
+from src.infrastructure.prewarm import prewarm
+from src.infrastructure.preview_cache import preview_cache
 from src.logger import logger
 from src.config import (
+    ASSET_EANS,
+    ASSET_JOB_BATCH_SIZE,
+    ASSET_JOB_STRAGGLER_MINUTES,
+    ASSET_JOBS_QUEUE_CONNECTION,
+    ASSET_JOBS_QUEUE_NAME,
+    FAN_OUT_ENABLED,
+    FORECAST_HORIZON_DAYS,
+    MOCK_EAN_NUMBER,
+    PREVIEW_MAX_DAYS,
     PROGRAM_ID,
     VEN_NAMES,
     VTN_BASE_URL,
@@ -19,14 +52,19 @@ from src.config import (
     OAUTH_CLIENT_SECRET,
     OAUTH_TOKEN_ENDPOINT,
     OAUTH_SCOPES,
+    RUN_DEADLINE_SECONDS,
+    RUN_LEDGER_ENABLED,
 )
 
 bp = func.Blueprint()
 
 
+@cache
 def _initialize_bl_client() -> BusinessLogicClient:
     """Initialize the BL client with the base URL of the VTN.
 
+    The client is created once per worker, so its access token and connections are reused by all runs.
+
     Returns:
         BusinessLogicClient: The BL client.
     """
@@ -40,74 +78,805 @@ def _initialize_bl_client() -> BusinessLogicClient:
     return bl_client
 
 
-async def _generate_events() -> NewEvent | None:
-    """Generate events for tomorrow to be published to the VTN.
+def _get_horizon(
+    from_date: datetime | None = None, to_date: datetime | None = None
+) -> tuple[datetime, datetime]:
+    """Determine the horizon to generate events for.
+
+    Args:
+        from_date (datetime | None): The start time (inclusive) of the horizon. Defaults to 12:00 today.
+        to_date (datetime | None): The end time (exclusive) of the horizon. Defaults to
+            FORECAST_HORIZON_DAYS days after the start time.
 
     Returns:
-        list[Event]: The list of events.
+        tuple[datetime, datetime]: The start time (inclusive) and end time (exclusive) of the horizon.
     """
     current_time_ams = datetime.now(ZoneInfo("Europe/Amsterdam"))
 
     # Start time is 12:00 today.
-    start_time = current_time_ams.replace(hour=12, minute=0, second=0, microsecond=0)
-    # End time is 12:00 24 hours in the future
-    end_time = start_time + timedelta(days=1)
+    start_time = from_date or current_time_ams.replace(
+        hour=12, minute=0, second=0, microsecond=0
+    )
+    # End time is 12:00 the configured number of days in the future
+    end_time = to_date or start_time + timedelta(days=FORECAST_HORIZON_DAYS)
+
+    return start_time, end_time
 
-    actions = PredictionActionsInfluxDB(client=create_db_client())
 
-    return await get_capacity_limitation_event(
-        actions, from_date=start_time, to_date=end_time
+async def _generate_events(
+    from_date: datetime | None = None,
+    to_date: datetime | None = None,
+    asset_id: str = MOCK_EAN_NUMBER,
+    actions: PredictionActionsBase | None = None,
+    ledger_entry: RunLedgerEntry | None = None,
+) -> list[NewEvent]:
+    """Generate events to be published to the VTN.
+
+    By default, events are generated for the configured number of days starting at 12:00 today.
+
+    Args:
+        from_date (datetime | None): The start time (inclusive) of the horizon. Defaults to 12:00 today.
+        to_date (datetime | None): The end time (exclusive) of the horizon. Defaults to
+            FORECAST_HORIZON_DAYS days after the start time.
+        asset_id (str): The EAN number of the grid asset to generate events for. Defaults to MOCK_EAN_NUMBER.
+        actions (PredictionActionsBase | None): The actions to use. Defaults to the InfluxDB actions.
+        ledger_entry (RunLedgerEntry | None): The ledger entry of the run to checkpoint the stages in.
+            If None, the stages are not checkpointed.
+
+    Returns:
+        list[Event]: The list of events, one per day of the horizon.
+    """
+    start_time, end_time = _get_horizon(from_date, to_date)
+    actions = actions or PredictionActionsInfluxDB(
+        client=get_db_client(), ledger_entry=ledger_entry, asset_id=asset_id
+    )
+
+    return await get_capacity_limitation_events(
+        actions,
+        from_date=start_time,
+        to_date=end_time,
+        asset_id=asset_id,
+        checkpoints=ledger_entry,
     )
 
 
-async def _clean_up_old_events(bl_client: BusinessLogicClient) -> None:
-    """Clean up old events from the VTN targeting the VEN of this BL that are going to be replaced by the new events."""
+def _open_run(
+    asset_id: str, from_date: datetime, to_date: datetime
+) -> AbstractContextManager[RunLedgerEntry | None]:
+    """Open the ledger entry of the run of the given asset and horizon.
+
+    Args:
+        asset_id (str): The EAN number of the grid asset.
+        from_date (datetime): The start time (inclusive) of the horizon.
+        to_date (datetime): The end time (exclusive) of the horizon.
+
+    Returns:
+        AbstractContextManager[RunLedgerEntry | None]: The locked ledger entry. None if the run ledger is disabled.
+    """
+    if not RUN_LEDGER_ENABLED:
+        return nullcontext()
+
+    return run_ledger.open(asset_id, from_date, to_date)
+
+
+def _get_events_of_asset(
+    bl_client: BusinessLogicClient, asset_id: str
+) -> list[ExistingEvent]:
+    """Retrieve the events of this BL in the VTN which target the given grid asset.
+
+    Args:
+        bl_client (BusinessLogicClient): The BL client.
+        asset_id (str): The EAN number of the grid asset.
+
+    Returns:
+        list[ExistingEvent]: The events of this BL targeting the grid asset.
+    """
+    ven_names = VEN_NAMES.split(",")
+
+    return [
+        event
+        for event in bl_client.events.get_events(
+            program_id=PROGRAM_ID,
+            pagination=None,
+            target=TargetFilter(
+                target_type="POWER_SERVICE_LOCATION", target_values=[asset_id]
+            ),
+        )
+        # Only events of this BL are considered, other BLs may target the same grid asset.
+        if any(
+            target.type == "VEN_NAME" and set(target.values) & set(ven_names)
+            for target in event.targets or ()
+        )
+    ]
+
+
+async def _clean_up_old_events(
+    bl_client: BusinessLogicClient, asset_id: str | None = None
+) -> None:
+    """Clean up old events from the VTN targeting the VEN of this BL that are going to be replaced by the new events.
+
+    Args:
+        bl_client (BusinessLogicClient): The BL client.
+        asset_id (str | None): The EAN number of the grid asset to clean up the events of. If None, the events of
+            all grid assets are cleaned up.
+    """
     # Get all events from the VTN
-    events = bl_client.events.get_events(
-        program_id=PROGRAM_ID,
-        pagination=None,
-        target=TargetFilter(target_type="VEN_NAME", target_values=VEN_NAMES.split(",")),
-    )
+    if asset_id is None:
+        events = list(
+            bl_client.events.get_events(
+                program_id=PROGRAM_ID,
+                pagination=None,
+                target=TargetFilter(
+                    target_type="VEN_NAME", target_values=VEN_NAMES.split(",")
+                ),
+            )
+        )
+    else:
+        events = _get_events_of_asset(bl_client, asset_id)
 
     for event in events:
         bl_client.events.delete_event_by_id(event_id=event.id)
         logger.info("Deleted old event with id replaced by the BL: %s", event.id)
 
 
-async def main() -> None:
+async def _publish_events(
+    bl_client: BusinessLogicClient,
+    events: list[NewEvent],
+    asset_id: str | None = None,
+    ledger_entry: RunLedgerEntry | None = None,
+) -> None:
+    """Replace the old events in the VTN with the given events.
+
+    Events published by a previous attempt of the run are not published again.
+
+    Args:
+        bl_client (BusinessLogicClient): The BL client.
+        events (list[NewEvent]): The events to publish.
+        asset_id (str | None): The EAN number of the grid asset to replace the events of. If None, the events
+            of all grid assets are replaced.
+        ledger_entry (RunLedgerEntry | None): The ledger entry of the run. If None, all events are published.
+    """
+    published_events = ledger_entry.get_published_events() if ledger_entry else {}
+
+    # The old events were already cleaned up by the attempt which published the first events.
+    if not published_events:
+        await _clean_up_old_events(bl_client=bl_client, asset_id=asset_id)
+
+    with track_stage("publish"):
+        for event in events:
+            # Events are checkpointed by their start. Events without interval period can not be, and are
+            # published by every attempt.
+            horizon = get_event_horizon(event)
+            event_start = horizon[0].isoformat() if horizon else None
+            if event_start is not None and event_start in published_events:
+                logger.info(
+                    "Event starting at %s was already published with id: %s, skipping...",
+                    event_start,
+                    published_events[event_start],
+                )
+                continue
+
+            created_event = bl_client.events.create_event(new_event=event)
+            logger.info("Created event with id: %s in VTN", created_event.id)
+            if ledger_entry and event_start is not None:
+                ledger_entry.mark_published(event_start, created_event.id)
+
+
+def _get_active_event(
+    bl_client: BusinessLogicClient, asset_id: str, current_time: datetime
+) -> ExistingEvent | None:
+    """Retrieve the event of this BL in the VTN for the given grid asset which covers the current time.
+
+    Args:
+        bl_client (BusinessLogicClient): The BL client.
+        asset_id (str): The EAN number of the grid asset.
+        current_time (datetime): The current time.
+
+    Returns:
+        ExistingEvent | None: The active event. None if no event of this BL for the grid asset covers the current time.
+    """
+    for event in _get_events_of_asset(bl_client, asset_id):
+        horizon = get_event_horizon(event)
+        if horizon and horizon[0] <= current_time < horizon[1]:
+            return event
+
+    return None
+
+
+async def _update_active_event(bl_client: BusinessLogicClient, asset_id: str) -> None:
+    """Re-forecast the remaining part of the active event of a grid asset and publish the changed intervals to the VTN.
+
+    Args:
+        bl_client (BusinessLogicClient): The BL client.
+        asset_id (str): The EAN number of the grid asset.
+    """
+    current_time = datetime.now(tz=UTC)
+    active_event = _get_active_event(
+        bl_client=bl_client, asset_id=asset_id, current_time=current_time
+    )
+
+    if not active_event:
+        logger.info(
+            "No active event found in the VTN for asset %s, skipping intraday update...",
+            asset_id,
+        )
+        return None
+
+    # Re-forecast from the start of the next quarter-hour, the current one is already running.
+    from_date = current_time.replace(
+        minute=current_time.minute - current_time.minute % 15, second=0, microsecond=0
+    ) + timedelta(minutes=15)
+
+    actions = PredictionActionsInfluxDB(client=get_db_client(), asset_id=asset_id)
+    reforecast = await get_capacity_limitation_event_update(
+        actions, active_event=active_event, from_date=from_date
+    )
+
+    if not reforecast:
+        logger.info(
+            "No capacity limits changed for asset %s, skipping intraday update...",
+            asset_id,
+        )
+        return None
+
+    event_update, predicted_grid_asset_loads = reforecast
+    with track_stage("publish"):
+        updated_event = bl_client.events.update_event_by_id(
+            event_id=active_event.id, updated_event=active_event.update(event_update)
+        )
+    logger.info("Updated event with id: %s in VTN", updated_event.id)
+
+    # Only the re-forecasts which changed the published limits are audited.
+    await actions.audit_predicted_grid_asset_loads(
+        actions.get_write_api(), predicted_grid_asset_loads, reforecast=True
+    )
+
+
+async def intraday_main() -> None:
+    try:
+        logger.info("Triggering intraday BL function at %s", datetime.now(tz=UTC))
+        bl_client = _initialize_bl_client()
+
+        # An asset failing does not stop the intraday updates of the other assets.
+        for asset_id in ASSET_EANS.split(","):
+            try:
+                await _update_active_event(bl_client=bl_client, asset_id=asset_id)
+            except Exception as exc:
+                logger.warning(
+                    "Exception occurred during intraday update of asset %s",
+                    asset_id,
+                    exc_info=exc,
+                )
+    except Exception as exc:
+        logger.warning(
+            "Exception occurred during intraday function execution", exc_info=exc
+        )
+
+    logger.info("Python intraday timer trigger function executed.")
+
+
+async def accuracy_main() -> None:
+    try:
+        logger.info("Triggering forecast accuracy monitor at %s", datetime.now(tz=UTC))
+        summarized_days = await monitor_forecast_accuracy(
+            get_db_client(), MOCK_EAN_NUMBER, until=datetime.now(tz=UTC)
+        )
+        logger.info("Summarized the forecast accuracy of %d days", summarized_days)
+    except Exception as exc:
+        logger.warning(
+            "Exception occurred during forecast accuracy monitoring", exc_info=exc
+        )
+
+
+async def prewarm_main() -> None:
+    try:
+        logger.info("Triggering BL prewarm at %s", datetime.now(tz=UTC))
+        from_date, to_date = _get_horizon()
+
+        with track_stage("prewarm"):
+            durations = await prewarm(_initialize_bl_client(), from_date, to_date)
+
+        logger.info(
+            "Prewarm took %.2f s: %s",
+            sum(durations.values()),
+            ", ".join(f"{step}={seconds:.2f}s" for step, seconds in durations.items()),
+        )
+    except Exception as exc:
+        logger.warning("Exception occurred during prewarm", exc_info=exc)
+
+
+async def main(
+    create_actions: Callable[[str, RunLedgerEntry | None], PredictionActionsBase]
+    | None = None,
+    bl_client: BusinessLogicClient | None = None,
+) -> None:
+    """Run the BL: generate the events of the horizon and replace the old events in the VTN with them.
+
+    Args:
+        create_actions (Callable[[str, RunLedgerEntry | None], PredictionActionsBase] | None): Creates the actions
+            to use for the grid asset and ledger entry of the run. Defaults to the InfluxDB actions.
+        bl_client (BusinessLogicClient | None): The BL client. Defaults to a client of the VTN at VTN_BASE_URL.
+    """
     try:
         logger.info("Triggering BL function at %s", datetime.now(tz=UTC))
-        event = await _generate_events()
+        from_date, to_date = _get_horizon()
+
+        with _open_run(MOCK_EAN_NUMBER, from_date, to_date) as ledger_entry:
+            events = await _generate_events(
+                from_date,
+                to_date,
+                actions=create_actions(MOCK_EAN_NUMBER, ledger_entry)
+                if create_actions
+                else None,
+                ledger_entry=ledger_entry,
+            )
+
+            if not events:
+                logger.warning(
+                    "No capacity limitation event could be constructed, skipping..."
+                )
+                return None
+
+            bl_client = bl_client or _initialize_bl_client()
+
+            try:
+                # Replace the old events in the VTN with the new events.
+                await _publish_events(bl_client, events, ledger_entry=ledger_entry)
+            except Exception as exc:
+                logger.warning(
+                    "Exception occurred during event creation in the VTN", exc_info=exc
+                )
+    except RunLockedError:
+        logger.info("The run is already in progress, skipping...")
+    except Exception as exc:
+        logger.warning("Exception occurred during function execution", exc_info=exc)
+
+    logger.info("Python timer trigger function executed.")
+
+
+async def coordinate_asset_jobs(
+    tracker: JobTrackerBase, run_id: str | None = None
+) -> list[str]:
+    """Plan the asset jobs of a run and record them as enqueued.
+
+    Args:
+        tracker (JobTrackerBase): The tracker of the asset jobs.
+        run_id (str | None): The identifier of the run. Defaults to an identifier based on the current time.
 
-        if not event:
+    Returns:
+        list[str]: The queue messages of the asset jobs.
+    """
+    from_date, to_date = _get_horizon()
+    jobs = plan_asset_jobs(
+        run_id=run_id or f"bl-run-{datetime.now(tz=UTC).strftime('%Y%m%dT%H%M%S')}",
+        asset_ids=ASSET_EANS.split(","),
+        from_date=from_date,
+        to_date=to_date,
+        batch_size=ASSET_JOB_BATCH_SIZE,
+    )
+
+    await tracker.record_enqueued(jobs)
+    logger.info("Enqueued %d asset jobs of run %s", len(jobs), jobs[0].run_id)
+
+    return [job.to_message() for job in jobs]
+
+
+async def _publish_asset_events(
+    bl_client: BusinessLogicClient,
+    create_actions: Callable[[str, RunLedgerEntry | None], PredictionActionsBase],
+    asset_id: str,
+    from_date: datetime,
+    to_date: datetime,
+) -> bool:
+    """Generate the events of a grid asset and replace its old events in the VTN with them.
+
+    Args:
+        bl_client (BusinessLogicClient): The BL client.
+        create_actions (Callable[[str, RunLedgerEntry | None], PredictionActionsBase]): Creates the actions to use
+            for the grid asset and ledger entry of the run.
+        asset_id (str): The EAN number of the grid asset.
+        from_date (datetime): The start time (inclusive) of the horizon.
+        to_date (datetime): The end time (exclusive) of the horizon.
+
+    Returns:
+        bool: Whether the events were published.
+    """
+    with _open_run(asset_id, from_date, to_date) as ledger_entry:
+        events = await _generate_events(
+            from_date,
+            to_date,
+            asset_id,
+            create_actions(asset_id, ledger_entry),
+            ledger_entry,
+        )
+
+        if not events:
             logger.warning(
-                "No capacity limitation event could be constructed, skipping..."
+                "No capacity limitation event could be constructed for asset %s, skipping...",
+                asset_id,
             )
-            return None
+            return False
 
-        bl_client = _initialize_bl_client()
+        await _publish_events(bl_client, events, asset_id, ledger_entry)
+
+    return True
+
+
+async def process_asset_job(
+    message: str,
+    tracker: JobTrackerBase,
+    bl_client: BusinessLogicClient,
+    create_actions: Callable[[str, RunLedgerEntry | None], PredictionActionsBase],
+) -> None:
+    """Run the pipeline of every asset of a queued asset job and record the outcome.
 
+    An asset failing does not stop the other assets of the job. Afterwards the job fails, so the
+    queue retries it (and moves it to the poison queue once the retries are exhausted).
+
+    Args:
+        message (str): The queue message of the asset job.
+        tracker (JobTrackerBase): The tracker of the asset jobs.
+        bl_client (BusinessLogicClient): The BL client.
+        create_actions (Callable[[str, RunLedgerEntry | None], PredictionActionsBase]): Creates the actions to use
+            for the grid asset and ledger entry of the run of an asset.
+    """
+    job = AssetJob.from_message(message)
+    failed_asset_ids: list[str] = []
+
+    for asset_id in job.asset_ids:
         try:
-            # Clean up the old events in the VTN that are going to be replaced by the new events
-            await _clean_up_old_events(bl_client=bl_client)
-            # Create the new event in the VTN.
-            created_event = bl_client.events.create_event(new_event=event)
-            logger.info("Created event with id: %s in VTN", created_event.id)
+            succeeded = await _publish_asset_events(
+                bl_client, create_actions, asset_id, job.from_date, job.to_date
+            )
         except Exception as exc:
             logger.warning(
-                "Exception occurred during event creation in the VTN", exc_info=exc
+                "Exception occurred while processing asset %s of run %s",
+                asset_id,
+                job.run_id,
+                exc_info=exc,
+            )
+            succeeded = False
+
+        await tracker.record_finished(job.run_id, asset_id, succeeded)
+        if not succeeded:
+            failed_asset_ids.append(asset_id)
+
+    if failed_asset_ids:
+        msg = f"Assets {failed_asset_ids} of run {job.run_id} failed"
+        raise ValueError(msg)
+
+
+async def report_stragglers(tracker: JobTrackerBase) -> dict[str, list[str]]:
+    """Report the assets of the runs of the last day which did not finish in time.
+
+    Args:
+        tracker (JobTrackerBase): The tracker of the asset jobs.
+
+    Returns:
+        dict[str, list[str]]: The EAN numbers of the unfinished or failed assets per run.
+    """
+    current_time = datetime.now(tz=UTC)
+    stragglers = await tracker.get_stragglers(
+        enqueued_after=current_time - timedelta(days=1),
+        enqueued_before=current_time - timedelta(minutes=ASSET_JOB_STRAGGLER_MINUTES),
+    )
+
+    for run_id, asset_ids in stragglers.items():
+        logger.warning(
+            "Run %s has %d unfinished or failed assets: %s",
+            run_id,
+            len(asset_ids),
+            ",".join(asset_ids),
+        )
+
+    return stragglers
+
+
+async def run_fan_out_locally(
+    bl_client: BusinessLogicClient,
+    create_actions: Callable[[str, RunLedgerEntry | None], PredictionActionsBase],
+    concurrency: int = 4,
+) -> dict[str, list[str]]:
+    """Run a fanned out run in-process, with an in-memory queue and tracker instead of the storage queue.
+
+    Args:
+        bl_client (BusinessLogicClient): The BL client.
+        create_actions (Callable[[str, RunLedgerEntry | None], PredictionActionsBase]): Creates the actions to use
+            for the grid asset and ledger entry of the run of an asset.
+        concurrency (int): The number of asset jobs processed concurrently. Defaults to 4.
+
+    Returns:
+        dict[str, list[str]]: The EAN numbers of the failed assets per run.
+    """
+    queue = InMemoryJobQueue()
+    tracker = InMemoryJobTracker()
+
+    queue.send(await coordinate_asset_jobs(tracker))
+    await queue.drain(
+        lambda message: process_asset_job(message, tracker, bl_client, create_actions),
+        concurrency=concurrency,
+    )
+
+    current_time = datetime.now(tz=UTC)
+    return await tracker.get_stragglers(
+        enqueued_after=current_time - timedelta(days=1), enqueued_before=current_time
+    )
+
+
+def _parse_preview_time(param: str) -> datetime:
+    """Parse a time of the window of a preview.
+
+    Args:
+        param (str): The time in ISO format, in Europe/Amsterdam time if it has no offset.
+
+    Returns:
+        datetime: The (timezone-aware) time.
+    """
+    parsed_time = datetime.fromisoformat(param)
+
+    if parsed_time.tzinfo is None:
+        return parsed_time.replace(tzinfo=ZoneInfo("Europe/Amsterdam"))
+
+    return parsed_time
+
+
+def _get_preview_window(
+    from_param: str | None, to_param: str | None
+) -> tuple[datetime, datetime]:
+    """Determine the window of a preview from the query parameters of the request.
+
+    Args:
+        from_param (str | None): The start time (inclusive) of the window in ISO format, in Europe/Amsterdam
+            time if it has no offset. Defaults to the start of the horizon of the daily run.
+        to_param (str | None): The end time (exclusive) of the window in ISO format, in Europe/Amsterdam
+            time if it has no offset. Defaults to FORECAST_HORIZON_DAYS days after the start time.
+
+    Returns:
+        tuple[datetime, datetime]: The start time (inclusive) and end time (exclusive) of the window.
+    """
+    from_date, to_date = (
+        _parse_preview_time(param) if param else None
+        for param in (from_param, to_param)
+    )
+    start_time, end_time = _get_horizon(from_date, to_date)
+
+    if end_time <= start_time:
+        msg = "The end of the window must be after its start"
+        raise ValueError(msg)
+
+    if end_time - start_time > timedelta(days=PREVIEW_MAX_DAYS):
+        msg = f"The window may span at most {PREVIEW_MAX_DAYS} days"
+        raise ValueError(msg)
+
+    return start_time, end_time
+
+
+async def _compute_preview(
+    asset_id: str, from_date: datetime, to_date: datetime
+) -> bytes:
+    """Compute the preview of the capacity limits of an asset, without auditing or publishing anything.
+
+    The predictions of the daily run of the window are reused if it predicted them already. Otherwise
+    the features are served from the feature store and the predictions from the inference cache,
+    if the upstream sources did not change since they were computed. Predictions made for the preview
+    are not written to the inference cache or the audit bucket.
+
+    Args:
+        asset_id (str): The EAN number of the grid asset.
+        from_date (datetime): The start time (inclusive) of the window.
+        to_date (datetime): The end time (exclusive) of the window.
+
+    Returns:
+        bytes: The preview, serialized as JSON.
+    """
+    predicted_grid_asset_loads, intervals = await get_capacity_limitation_preview(
+        PredictionActionsInfluxDB(
+            client=get_db_client(), asset_id=asset_id, read_only=True
+        ),
+        from_date=from_date,
+        to_date=to_date,
+        checkpoints=run_ledger.peek(asset_id, from_date, to_date)
+        if RUN_LEDGER_ENABLED
+        else None,
+    )
+
+    return json.dumps(
+        {
+            "asset_id": asset_id,
+            "from": from_date.isoformat(),
+            "to": to_date.isoformat(),
+            "predicted_loads": [
+                {
+                    "start": load.time.isoformat(),
+                    "duration_seconds": load.duration.total_seconds(),
+                    "load_kw": load.load,
+                }
+                for load in predicted_grid_asset_loads
+            ],
+            "capacity_limits": [
+                {
+                    "start": interval.interval_period.start.isoformat(),
+                    "duration_seconds": interval.interval_period.duration.total_seconds(),
+                    "limit_kw": interval.payloads[0].values[0],
+                }
+                for interval in intervals
+                if interval.interval_period
+            ],
+        }
+    ).encode("utf-8")
+
+
+async def preview_capacity_limits(
+    asset_id: str,
+    from_param: str | None,
+    to_param: str | None,
+    if_none_match: str | None,
+) -> func.HttpResponse:
+    """Serve the preview of the predicted loads and capacity limits of an asset.
+
+    Previews are served from the preview cache, and computed once for concurrent requests of the
+    same window. Conditional requests whose ETag matches the preview are answered with 304.
+
+    Args:
+        asset_id (str): The EAN number of the grid asset.
+        from_param (str | None): The "from" query parameter of the request.
+        to_param (str | None): The "to" query parameter of the request.
+        if_none_match (str | None): The If-None-Match header of the request.
+
+    Returns:
+        func.HttpResponse: The response.
+    """
+    if asset_id not in ASSET_EANS.split(","):
+        return func.HttpResponse(f"Unknown asset {asset_id}", status_code=404)
+
+    try:
+        from_date, to_date = _get_preview_window(from_param, to_param)
+    except ValueError as exc:
+        return func.HttpResponse(str(exc), status_code=400)
+
+    try:
+        with run_deadline(RUN_DEADLINE_SECONDS):
+            preview = await preview_cache.get_or_compute(
+                (asset_id, from_date, to_date),
+                lambda: _compute_preview(asset_id, from_date, to_date),
             )
     except Exception as exc:
-        logger.warning("Exception occurred during function execution", exc_info=exc)
+        logger.warning("Exception occurred while computing a preview", exc_info=exc)
+        return func.HttpResponse("The preview could not be computed", status_code=500)
 
-    logger.info("Python timer trigger function executed.")
+    headers = {
+        "ETag": preview.etag,
+        "Cache-Control": f"private, max-age={preview_cache.remaining_seconds(preview)}",
+    }
+    requested_etags = {
+        etag.strip().removeprefix("W/") for etag in (if_none_match or "").split(",")
+    }
+    if preview.etag in requested_etags or "*" in requested_etags:
+        return func.HttpResponse(status_code=304, headers=headers)
+
+    return func.HttpResponse(
+        preview.body,
+        status_code=200,
+        headers=headers,
+        mimetype="application/json",
+    )
+
+
+@bp.schedule(
+    schedule="0 40 7 * * *",
+    arg_name="myTimer",
+    run_on_startup=False,
+    use_monitor=False,
+)
+async def prewarm_for_tomorrow(myTimer: func.TimerRequest) -> None:
+    with run_deadline(RUN_DEADLINE_SECONDS):
+        await prewarm_main()
+
+
+# The daily run only binds to the asset jobs queue when it is fanned out over queued asset jobs. The asset jobs
+# are then processed by the queue-triggered workers.
+if FAN_OUT_ENABLED:
+
+    @bp.schedule(
+        schedule="0 55 7 * * *",
+        arg_name="myTimer",
+        run_on_startup=False,
+        use_monitor=False,
+    )
+    @bp.queue_output(
+        arg_name="jobs",
+        queue_name=ASSET_JOBS_QUEUE_NAME,
+        connection=ASSET_JOBS_QUEUE_CONNECTION,
+    )
+    async def generate_events_for_tomorrow(
+        myTimer: func.TimerRequest, jobs: func.Out[list[str]]
+    ) -> None:
+        with run_deadline(RUN_DEADLINE_SECONDS):
+            try:
+                tracker = AssetJobTrackerInfluxDB(client=get_db_client())
+                jobs.set(await coordinate_asset_jobs(tracker))
+            except Exception as exc:
+                logger.warning(
+                    "Exception occurred while enqueueing the asset jobs", exc_info=exc
+                )
+
+    @bp.queue_trigger(
+        arg_name="msg",
+        queue_name=ASSET_JOBS_QUEUE_NAME,
+        connection=ASSET_JOBS_QUEUE_CONNECTION,
+    )
+    async def generate_events_for_asset_job(msg: func.QueueMessage) -> None:
+        client = get_db_client()
+        with run_deadline(RUN_DEADLINE_SECONDS):
+            await process_asset_job(
+                msg.get_body().decode("utf-8"),
+                tracker=AssetJobTrackerInfluxDB(client=client),
+                bl_client=_initialize_bl_client(),
+                create_actions=lambda asset_id, ledger_entry: PredictionActionsInfluxDB(
+                    client=client, ledger_entry=ledger_entry, asset_id=asset_id
+                ),
+            )
+
+else:
+
+    @bp.schedule(
+        schedule="0 55 7 * * *",
+        arg_name="myTimer",
+        run_on_startup=False,
+        use_monitor=False,
+    )
+    async def generate_events_for_tomorrow(myTimer: func.TimerRequest) -> None:
+        with run_deadline(RUN_DEADLINE_SECONDS):
+            await main()
 
 
 @bp.schedule(
-    schedule="0 55 7 * * *",
+    schedule="0 55 8 * * *",
     arg_name="myTimer",
     run_on_startup=False,
     use_monitor=False,
 )
-async def generate_events_for_tomorrow(myTimer: func.TimerRequest) -> None:
-    await main()
+async def report_straggling_asset_jobs(myTimer: func.TimerRequest) -> None:
+    if not FAN_OUT_ENABLED:
+        return
+
+    try:
+        await report_stragglers(AssetJobTrackerInfluxDB(client=get_db_client()))
+    except Exception as exc:
+        logger.warning("Exception occurred while reporting stragglers", exc_info=exc)
+
+
+@bp.schedule(
+    schedule="0 30 6 * * *",
+    arg_name="myTimer",
+    run_on_startup=False,
+    use_monitor=False,
+)
+async def monitor_forecast_accuracy_daily(myTimer: func.TimerRequest) -> None:
+    with run_deadline(RUN_DEADLINE_SECONDS):
+        await accuracy_main()
+
+
+@bp.schedule(
+    schedule="0 10 * * * *",
+    arg_name="myTimer",
+    run_on_startup=False,
+    use_monitor=False,
+)
+async def update_events_intraday(myTimer: func.TimerRequest) -> None:
+    with run_deadline(RUN_DEADLINE_SECONDS):
+        await intraday_main()
+
+
+@bp.route(
+    route="preview/{asset_id}",
+    methods=[func.HttpMethod.GET],
+    auth_level=func.AuthLevel.FUNCTION,
+)
+async def preview_capacity_limits_for_asset(req: func.HttpRequest) -> func.HttpResponse:
+    return await preview_capacity_limits(
+        asset_id=req.route_params.get("asset_id", ""),
+        from_param=req.params.get("from"),
+        to_param=req.params.get("to"),
+        if_none_match=req.headers.get("If-None-Match"),
+    )
@@ -7,7 +7,11 @@ class PredictedGridAssetLoad:
     """Represents the load on a grid asset at a specific time."""
 
     def __init__(
-        self, time: datetime, load: float, duration: timedelta = timedelta(minutes=15)
+        self,
+        time: datetime,
+        load: float,
+        duration: timedelta = timedelta(minutes=15),
+        forecaster: str = "model",
     ) -> None:
         """Initializes a predicted grid asset load object.
 
@@ -15,10 +19,13 @@ class PredictedGridAssetLoad:
             time (datetime): The time of the prediction.
             load (float): The load on the grid asset.
             duration (timedelta): The duration of the prediction. Defaults to 15 minutes.
+            forecaster (str): The forecaster which made the prediction, "model" for the prediction model
+                or "baseline" for the baseline forecaster. Defaults to "model".
         """
         self.time = time
         self.duration = duration
         self.load = load
+        self.forecaster = forecaster
 
     def __eq__(self, other) -> bool:
         """Implement value based equality instead of reference based.
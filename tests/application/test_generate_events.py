@@ -0,0 +1,171 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from src.application.generate_events import (
+    PredictionActionsBase,
+    _generate_capacity_limitation_event,
+    get_capacity_limitation_event_update,
+    get_capacity_limitation_events,
+)
+from src.application.run_checkpoints import RunCheckpointsBase
+from src.config import MAX_CAPACITY
+from src.models.predicted_load import PredictedGridAssetLoad
+
+HORIZON_START = datetime(2025, 6, 2, 12, tzinfo=UTC)
+
+
+class _FakePredictionActions(PredictionActionsBase[None, None]):
+    """Prediction actions which return the given predicted grid asset loads."""
+
+    def __init__(self, loads: list[float], forecaster: str = "model") -> None:
+        self.predicted_grid_asset_loads = [
+            PredictedGridAssetLoad(
+                time=HORIZON_START + i * timedelta(minutes=15),
+                load=load,
+                forecaster=forecaster,
+            )
+            for i, load in enumerate(loads)
+        ]
+        self.audited: list[list[PredictedGridAssetLoad]] = []
+
+    def get_query_api(self) -> None:
+        return None
+
+    def get_write_api(self) -> None:
+        return None
+
+    async def get_predicted_grid_asset_load(
+        self, query_api: None, from_date: datetime, to_date: datetime
+    ) -> list[PredictedGridAssetLoad]:
+        return [
+            load
+            for load in self.predicted_grid_asset_loads
+            if from_date <= load.time < to_date
+        ]
+
+    async def get_remaining_predicted_grid_asset_load(
+        self,
+        query_api: None,
+        horizon_start: datetime,
+        horizon_end: datetime,
+        from_date: datetime,
+    ) -> list[PredictedGridAssetLoad]:
+        return await self.get_predicted_grid_asset_load(
+            query_api, from_date, horizon_end
+        )
+
+    async def audit_predicted_grid_asset_loads(
+        self,
+        write_api: None,
+        predicted_grid_asset_loads: list[PredictedGridAssetLoad],
+        reforecast: bool = False,
+    ) -> None:
+        self.audited.append(predicted_grid_asset_loads)
+
+
+class _FakeCheckpoints(RunCheckpointsBase):
+    """Checkpoints of a run kept in memory."""
+
+    def __init__(self) -> None:
+        self.predictions: list[PredictedGridAssetLoad] | None = None
+        self.audited = False
+
+    def get_predictions(self) -> list[PredictedGridAssetLoad] | None:
+        return self.predictions
+
+    def put_predictions(
+        self, predicted_grid_asset_loads: list[PredictedGridAssetLoad]
+    ) -> None:
+        self.predictions = predicted_grid_asset_loads
+
+    def is_audited(self) -> bool:
+        return self.audited
+
+    def mark_audited(self) -> None:
+        self.audited = True
+
+    def get_published_events(self) -> dict[str, str]:
+        return {}
+
+    def mark_published(self, event_start: str, event_id: str) -> None:
+        pass
+
+
+def _limits(intervals) -> list[float]:
+    return [interval.payloads[0].values[0] for interval in intervals]
+
+
+def _active_event(loads: list[float]):
+    return _generate_capacity_limitation_event(
+        _FakePredictionActions(loads).predicted_grid_asset_loads, MAX_CAPACITY
+    )
+
+
+def test_capacity_limit_follows_predicted_load() -> None:
+    event = _active_event([MAX_CAPACITY / 2, MAX_CAPACITY * 2])
+
+    # Every quarter-hour is expanded into three sub intervals of five minutes.
+    assert _limits(event.intervals) == [100, 100, 100, 20, 20, 20]
+
+
+def test_event_update_for_changed_load() -> None:
+    active_event = _active_event([MAX_CAPACITY / 2] * 4)
+    actions = _FakePredictionActions([MAX_CAPACITY / 2] * 2 + [MAX_CAPACITY * 2] * 2)
+
+    reforecast = asyncio.run(
+        get_capacity_limitation_event_update(
+            actions, active_event, from_date=HORIZON_START + timedelta(minutes=30)
+        )
+    )
+
+    assert reforecast is not None
+    event_update, predicted_grid_asset_loads = reforecast
+    assert event_update.intervals is not None
+    assert active_event.intervals is not None
+    assert [i.id for i in event_update.intervals] == [
+        i.id for i in active_event.intervals
+    ]
+    assert _limits(event_update.intervals) == [100] * 6 + [20] * 6
+    assert [load.load for load in predicted_grid_asset_loads] == [MAX_CAPACITY * 2] * 2
+    # The re-forecast is audited by the caller once the update is published.
+    assert actions.audited == []
+
+
+def test_no_event_update_for_unchanged_load() -> None:
+    active_event = _active_event([MAX_CAPACITY / 2] * 4)
+    actions = _FakePredictionActions([MAX_CAPACITY / 2] * 4)
+
+    reforecast = asyncio.run(
+        get_capacity_limitation_event_update(
+            actions, active_event, from_date=HORIZON_START
+        )
+    )
+
+    assert reforecast is None
+    assert actions.audited == []
+
+
+@pytest.mark.parametrize(
+    ("forecaster", "checkpointed"), [("model", True), ("baseline", False)]
+)
+def test_only_model_predictions_are_checkpointed(
+    forecaster: str, checkpointed: bool
+) -> None:
+    actions = _FakePredictionActions([MAX_CAPACITY / 2] * 4, forecaster)
+    checkpoints = _FakeCheckpoints()
+
+    events = asyncio.run(
+        get_capacity_limitation_events(
+            actions,
+            from_date=HORIZON_START,
+            to_date=HORIZON_START + timedelta(hours=1),
+            checkpoints=checkpoints,
+        )
+    )
+
+    assert len(events) == 1
+    assert len(actions.audited) == 1
+    assert (checkpoints.predictions is not None) == checkpointed
+    assert checkpoints.audited == checkpointed
@@ -0,0 +1,33 @@
+"""Configuration of the test suite.
+
+The configuration of the BL is read from the environment when its modules are imported, so the
+required settings are given a test value before any module of the BL is imported.
+"""
+
+import os
+import tempfile
+
+_TEST_SETTINGS = {
+    "VTN_BASE_URL": "http://vtn.test",
+    "VEN_NAMES": "test-ven",
+    "MOCK_EAN_NUMBER": "871234567890123456",
+    "PROGRAM_ID": "test-program",
+    "MAX_CAPACITY": "100",
+    "INFLUXDB_ORG": "test-org",
+    "INFLUXDB_BUCKET": "test-bucket",
+    "INFLUXDB_TOKEN": "test-token",
+    "INFLUXDB_URL": "http://influxdb.test",
+    "WEATHER_FORECAST_API_URL": "http://weather.test",
+    "DITM_MODEL_API_URL": "http://model.test",
+    "DITM_MODEL_API_CLIENT_ID": "test-client",
+    "DITM_MODEL_API_CLIENT_SECRET": "test-secret",
+    "DITM_MODEL_API_TOKEN_URL": "http://token.test",
+    "OAUTH_CLIENT_ID": "test-client",
+    "OAUTH_CLIENT_SECRET": "test-secret",
+    "OAUTH_TOKEN_ENDPOINT": "http://token.test",
+    "OAUTH_SCOPES": "test-scope",
+    "LOCAL_STORE_DIR": tempfile.mkdtemp(prefix="ditm-bl-tests-"),
+}
+
+for _name, _value in _TEST_SETTINGS.items():
+    os.environ.setdefault(_name, _value)
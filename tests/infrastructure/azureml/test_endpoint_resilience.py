@@ -0,0 +1,67 @@
+import pytest
+
+from src.infrastructure._deadline import run_deadline
+from src.infrastructure.azureml.endpoint_resilience import (
+    CircuitBreaker,
+    CircuitState,
+    HedgedEndpointCaller,
+    ModelEndpointUnavailableError,
+)
+
+
+def _endpoint_caller(breaker: CircuitBreaker) -> HedgedEndpointCaller:
+    return HedgedEndpointCaller(
+        request_timeout_seconds=10.0,
+        hedge_percentile=95.0,
+        hedge_delay_seconds=5.0,
+        breaker=breaker,
+    )
+
+
+def _failing_request(timeout: float) -> float:
+    msg = "Service unavailable"
+    raise ConnectionError(msg)
+
+
+def test_failed_calls_open_the_breaker() -> None:
+    breaker = CircuitBreaker(failure_threshold=2, cooldown_seconds=60.0)
+    endpoint_caller = _endpoint_caller(breaker)
+
+    for _ in range(2):
+        with pytest.raises(ModelEndpointUnavailableError):
+            endpoint_caller.call(_failing_request)
+
+    assert breaker.state == CircuitState.OPEN
+
+
+def test_exhausted_deadline_does_not_open_the_breaker() -> None:
+    breaker = CircuitBreaker(failure_threshold=2, cooldown_seconds=60.0)
+    endpoint_caller = _endpoint_caller(breaker)
+
+    with run_deadline(0):
+        for _ in range(2):
+            with pytest.raises(ModelEndpointUnavailableError, match="deadline"):
+                endpoint_caller.call(_failing_request)
+
+    assert breaker.state == CircuitState.CLOSED
+    metrics = endpoint_caller.metrics()
+    assert metrics.timeouts == 2
+    assert metrics.requests == 0
+    assert metrics.failures == 0
+
+
+def test_exhausted_deadline_does_not_take_the_half_open_trial() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, cooldown_seconds=0.0)
+    endpoint_caller = _endpoint_caller(breaker)
+
+    with pytest.raises(ModelEndpointUnavailableError):
+        endpoint_caller.call(_failing_request)
+    assert breaker.state == CircuitState.OPEN
+
+    with run_deadline(0):
+        with pytest.raises(ModelEndpointUnavailableError, match="deadline"):
+            endpoint_caller.call(_failing_request)
+
+    # The cooldown passed, so the next call is let through as trial call and closes the breaker.
+    assert endpoint_caller.call(lambda timeout: 1.0) == 1.0
+    assert breaker.state == CircuitState.CLOSED
@@ -0,0 +1,59 @@
+from datetime import UTC, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+from src.infrastructure.azureml.feature_cache import HorizonFeatureCache
+
+HORIZON_START = datetime(2025, 6, 2, 12, tzinfo=ZoneInfo("Europe/Amsterdam"))
+HORIZON_END = HORIZON_START + timedelta(days=2)
+ASSET_ID = "871234567890123456"
+
+
+def _features(start: datetime, end: datetime) -> pd.DataFrame:
+    slots = pd.date_range(start, end, freq="15min", inclusive="left")
+    return pd.DataFrame({"datetime": slots, "lag_7_days": range(len(slots))})
+
+
+def test_get_serves_the_cached_horizon() -> None:
+    cache = HorizonFeatureCache()
+    features = _features(HORIZON_START, HORIZON_END)
+    cache.put(ASSET_ID, HORIZON_START, HORIZON_END, features)
+
+    assert cache.get(ASSET_ID, HORIZON_START, HORIZON_END) is features
+
+
+def test_get_serves_a_covered_horizon() -> None:
+    cache = HorizonFeatureCache()
+    cache.put(
+        ASSET_ID, HORIZON_START, HORIZON_END, _features(HORIZON_START, HORIZON_END)
+    )
+
+    # The horizon of the second event of the day-ahead run, as read back from the VTN in UTC.
+    event_start = (HORIZON_START + timedelta(days=1)).astimezone(UTC)
+    features = cache.get(ASSET_ID, event_start, event_start + timedelta(days=1))
+
+    assert features is not None
+    assert len(features) == 96
+    assert features["datetime"].iloc[0] == event_start
+    assert features["lag_7_days"].iloc[0] == 96
+
+
+def test_get_misses_a_horizon_which_is_not_covered() -> None:
+    cache = HorizonFeatureCache()
+    cache.put(
+        ASSET_ID, HORIZON_START, HORIZON_END, _features(HORIZON_START, HORIZON_END)
+    )
+
+    assert (
+        cache.get(ASSET_ID, HORIZON_START, HORIZON_END + timedelta(minutes=15)) is None
+    )
+
+
+def test_get_misses_the_horizon_of_another_asset() -> None:
+    cache = HorizonFeatureCache()
+    cache.put(
+        ASSET_ID, HORIZON_START, HORIZON_END, _features(HORIZON_START, HORIZON_END)
+    )
+
+    assert cache.get("871234567890123457", HORIZON_START, HORIZON_END) is None
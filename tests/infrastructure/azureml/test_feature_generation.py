@@ -0,0 +1,134 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import cast
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+import pytest
+from influxdb_client.client.query_api_async import QueryApiAsync
+
+from src.infrastructure.azureml import feature_generation
+from src.infrastructure.azureml.feature_generation import (
+    HorizonSources,
+    _get_lag_windows,
+    _limit_to_measured,
+    _parse_standard_profile_weights,
+)
+
+AMSTERDAM = ZoneInfo("Europe/Amsterdam")
+HORIZON_START = datetime(2025, 6, 2, 12, tzinfo=AMSTERDAM)
+HORIZON_END = HORIZON_START + timedelta(days=1)
+
+
+def test_lag_windows_merge_the_daily_lags() -> None:
+    windows = _get_lag_windows(HORIZON_START, HORIZON_END)
+
+    assert windows == [
+        # The lag a year ago, with a day of margin.
+        (
+            datetime(2024, 6, 1, 12, tzinfo=AMSTERDAM),
+            datetime(2024, 6, 4, 12, tzinfo=AMSTERDAM),
+        ),
+        # The daily lags of one to seven days ago, up to a day before the end of the horizon.
+        (HORIZON_START - timedelta(days=8), HORIZON_END - timedelta(days=1)),
+    ]
+
+
+def test_lag_windows_of_multi_day_horizon() -> None:
+    windows = _get_lag_windows(HORIZON_START, HORIZON_START + timedelta(days=3))
+
+    assert len(windows) == 2
+    assert windows[1] == (
+        HORIZON_START - timedelta(days=8),
+        HORIZON_START + timedelta(days=2),
+    )
+    assert all(window_start < window_end for window_start, window_end in windows)
+
+
+def _amsterdam(*datetimes: str) -> pd.Series:
+    return pd.Series(pd.to_datetime(list(datetimes))).dt.tz_localize("Europe/Amsterdam")
+
+
+def test_lags_after_last_measurement_move_to_latest_measured_day() -> None:
+    lag_datetimes = _amsterdam(
+        "2025-06-02 10:00", "2025-06-02 11:45", "2025-06-02 13:00", "2025-06-03 13:00"
+    )
+    last_measured = pd.Timestamp("2025-06-02 11:45", tz="Europe/Amsterdam")
+
+    limited = _limit_to_measured(lag_datetimes, last_measured)
+
+    pd.testing.assert_series_equal(
+        limited,
+        _amsterdam(
+            "2025-06-02 10:00",
+            "2025-06-02 11:45",
+            "2025-06-01 13:00",
+            "2025-06-01 13:00",
+        ),
+    )
+
+
+def test_lags_moved_into_dst_gap_are_missing() -> None:
+    lag_datetimes = _amsterdam("2025-03-31 02:30")
+    last_measured = pd.Timestamp("2025-03-30 12:00", tz="Europe/Amsterdam")
+
+    limited = _limit_to_measured(lag_datetimes, last_measured)
+
+    # 02:30 does not exist on the day the clocks move forward.
+    assert limited.isna().all()
+
+
+def test_standard_profile_weights_per_asset() -> None:
+    weights = "871001=E1A:120,E1B:35; 871002=E1A:80 ;E3A:10"
+
+    assert _parse_standard_profile_weights(weights, "871001") == {
+        "E1A": 120.0,
+        "E1B": 35.0,
+    }
+    assert _parse_standard_profile_weights(weights, "871002") == {"E1A": 80.0}
+    # Assets without weights of their own use the weights without EAN number.
+    assert _parse_standard_profile_weights(weights, "871003") == {"E3A": 10.0}
+    assert _parse_standard_profile_weights("871001=E1A:120", "871003") == {}
+
+
+def test_chunks_assemble_the_lag_arrays_of_the_horizon(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    horizon_lag_arrays = {
+        "timestamps": np.empty(0, np.int64),
+        "WAARDE": np.empty(0, np.float64),
+    }
+    assembled_from: list[dict[str, np.ndarray]] = []
+
+    async def get_lag_arrays(query_api, start_date_inclusive, end_date_inclusive):
+        raise AssertionError("The dalidata of the lag windows is retrieved per chunk")
+
+    async def write_standard_profile_features(query_api, grid, asset_id):
+        pass
+
+    async def run_cpu_bound(function, lag_arrays, grid, weather_features):
+        assembled_from.append(lag_arrays)
+        return pd.DataFrame()
+
+    monkeypatch.setattr(feature_generation, "_get_lag_arrays", get_lag_arrays)
+    monkeypatch.setattr(
+        feature_generation,
+        "_write_standard_profile_features",
+        write_standard_profile_features,
+    )
+    monkeypatch.setattr(feature_generation, "run_cpu_bound", run_cpu_bound)
+    sources = HorizonSources(pd.DataFrame(), None, horizon_lag_arrays)
+
+    for chunk_start in (HORIZON_START, HORIZON_START + timedelta(hours=12)):
+        asyncio.run(
+            feature_generation.get_features_between_dates(
+                cast(QueryApiAsync, None),
+                chunk_start,
+                chunk_start + timedelta(hours=12),
+                sources=sources,
+            )
+        )
+
+    assert len(assembled_from) == 2
+    assert all(lag_arrays is horizon_lag_arrays for lag_arrays in assembled_from)
@@ -0,0 +1,157 @@
+"""Conformance tests of the inference backends.
+
+Every backend scores the same feature frame with the same reference model, a linear model over the
+model input columns, and must return the same predictions.
+"""
+
+import pickle
+from pathlib import Path
+from typing import cast
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.infrastructure._auth.http.authenticated_session import (
+    _BearerAuthenticatedSession,
+)
+from src.infrastructure.azureml.endpoint_resilience import (
+    CircuitBreaker,
+    HedgedEndpointCaller,
+)
+from src.infrastructure.azureml.forecast_grid import MODEL_INPUT_COLUMNS
+from src.infrastructure.azureml.inference_backends import (
+    AzureMLEndpointBackend,
+    InferenceBackend,
+    LocalModelBackend,
+)
+from src.infrastructure.azureml.predictions import _prepare_model_input
+
+WEIGHTS = np.linspace(0.1, 2.5, len(MODEL_INPUT_COLUMNS))
+
+
+class LinearModel:
+    """The reference model, as an artifact which is scored through its predict method."""
+
+    def predict(self, model_input: pd.DataFrame) -> np.ndarray:
+        return model_input.to_numpy(dtype=np.float64) @ WEIGHTS
+
+
+class _FakeResponse:
+    def __init__(self, predictions: list[float]) -> None:
+        self.predictions = predictions
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self) -> list[float]:
+        return self.predictions
+
+
+class _FakeEndpointSession:
+    """Session to an Azure ML endpoint serving the reference model."""
+
+    def post(
+        self, url: str, headers: dict, json: dict, timeout: float
+    ) -> _FakeResponse:
+        assert json["input_data"]["columns"] == MODEL_INPUT_COLUMNS
+        model_input = np.asarray(json["input_data"]["data"], dtype=np.float64)
+        return _FakeResponse((model_input @ WEIGHTS).tolist())
+
+
+def _azureml_backend(tmp_path: Path) -> InferenceBackend:
+    backend = AzureMLEndpointBackend(
+        endpoint_caller=HedgedEndpointCaller(
+            request_timeout_seconds=10.0,
+            hedge_percentile=95.0,
+            hedge_delay_seconds=5.0,
+            breaker=CircuitBreaker(failure_threshold=3, cooldown_seconds=60.0),
+        )
+    )
+    backend._session = cast(_BearerAuthenticatedSession, _FakeEndpointSession())
+    return backend
+
+
+def _pickle_backend(tmp_path: Path) -> InferenceBackend:
+    model_path = tmp_path / "model.pkl"
+    model_path.write_bytes(pickle.dumps(LinearModel()))
+    return LocalModelBackend(model_path=model_path, num_threads=1)
+
+
+def _onnx_backend(tmp_path: Path) -> InferenceBackend:
+    pytest.importorskip("onnxruntime")
+    onnx = pytest.importorskip("onnx")
+    from onnx import TensorProto, helper, numpy_helper
+
+    graph = helper.make_graph(
+        nodes=[helper.make_node("MatMul", ["model_input", "weights"], ["load"])],
+        name="linear_model",
+        inputs=[
+            helper.make_tensor_value_info(
+                "model_input", TensorProto.FLOAT, [None, len(MODEL_INPUT_COLUMNS)]
+            )
+        ],
+        outputs=[helper.make_tensor_value_info("load", TensorProto.FLOAT, [None, 1])],
+        initializer=[
+            numpy_helper.from_array(
+                WEIGHTS.astype(np.float32).reshape(-1, 1), name="weights"
+            )
+        ],
+    )
+    model_path = tmp_path / "model.onnx"
+    onnx.save(helper.make_model(graph), model_path)
+    return LocalModelBackend(model_path=model_path, num_threads=1)
+
+
+@pytest.fixture
+def features() -> pd.DataFrame:
+    slots = pd.date_range(
+        "2025-06-02 12:00", periods=8, freq="15min", tz="Europe/Amsterdam"
+    )
+    values = np.random.default_rng(42).uniform(
+        0, 50, (len(slots), len(MODEL_INPUT_COLUMNS))
+    )
+    features = pd.DataFrame(values, columns=MODEL_INPUT_COLUMNS)
+    # Lags which are not available are missing, the model input sets them to 0.
+    features.loc[4:, "lag_1_days"] = np.nan
+    features.insert(0, "datetime", slots)
+    return features
+
+
+@pytest.mark.parametrize(
+    "create_backend", [_azureml_backend, _pickle_backend, _onnx_backend]
+)
+def test_backend_scores_the_reference_model(
+    create_backend, features: pd.DataFrame, tmp_path: Path
+) -> None:
+    backend = create_backend(tmp_path)
+    model_input = _prepare_model_input(features)
+
+    predictions = backend.predict(model_input)
+
+    assert len(predictions) == len(features)
+    assert all(isinstance(prediction, float) for prediction in predictions)
+    np.testing.assert_allclose(predictions, model_input.to_numpy() @ WEIGHTS, rtol=1e-5)
+
+
+class _TruncatingBackend(InferenceBackend):
+    """Backend which drops the prediction of the last row."""
+
+    name = "truncating"
+
+    def _score(self, model_input: pd.DataFrame) -> np.ndarray:
+        return LinearModel().predict(model_input)[:-1]
+
+
+def test_backend_rejects_predictions_of_another_shape(features: pd.DataFrame) -> None:
+    with pytest.raises(ValueError, match="returned predictions of shape"):
+        _TruncatingBackend().predict(_prepare_model_input(features))
+
+
+def test_local_backend_requires_the_model_artifact(
+    features: pd.DataFrame, tmp_path: Path
+) -> None:
+    backend = LocalModelBackend(tmp_path / "missing.pkl", num_threads=1)
+
+    with pytest.raises(ValueError, match="does not exist"):
+        backend.predict(_prepare_model_input(features))
@@ -0,0 +1,41 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+from influxdb_client.client.query_api_async import QueryApiAsync
+
+from src.infrastructure.influxdb._streaming import stream_time_series
+
+_RESULT = """,result,table,_start,_stop,_time,_measurement,WAARDE
+,_result,0,2025-06-01T00:00:00Z,2025-06-02T00:00:00Z,2025-06-01T00:00:00Z,WAARDE,1.5
+,_result,0,2025-06-01T00:00:00Z,2025-06-02T00:00:00Z,2025-06-01T00:15:00Z,WAARDE,
+
+,result,table,_start,_stop,_time,_measurement,WAARDE,count
+,_result,1,2025-06-01T00:00:00Z,2025-06-02T00:00:00Z,2025-06-01T00:30:00Z,WAARDE,3,96
+"""
+
+
+class _FakeQueryApi(QueryApiAsync):
+    """Query API returning a fixed raw query result."""
+
+    def __init__(self) -> None:
+        pass
+
+    async def query_raw(self, query, org=None, dialect=None, params=None) -> str:
+        return _RESULT.replace("\n", "\r\n")
+
+
+def test_raw_result_is_decoded_into_columns() -> None:
+    decoded = asyncio.run(stream_time_series(_FakeQueryApi(), "query", chunk_size=16))
+
+    np.testing.assert_array_equal(
+        decoded.timestamps,
+        pd.date_range("2025-06-01", periods=3, freq="15min")
+        .as_unit("ns")
+        .to_numpy(dtype=np.int64),
+    )
+    np.testing.assert_array_equal(decoded.values["WAARDE"], [1.5, np.nan, 3.0])
+    # The column missing from the first table has no values for its rows.
+    np.testing.assert_array_equal(decoded.values["count"], [np.nan, np.nan, 96.0])
+    assert decoded.stats.rows == 3
+    assert decoded.stats.chunks > 1
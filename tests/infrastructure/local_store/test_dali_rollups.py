@@ -0,0 +1,52 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.infrastructure.local_store.dali_rollups import (
+    DaliRollupStore,
+    _contiguous_ranges,
+)
+
+DAYS = pd.date_range("2025-06-01", periods=4, freq="1D", tz="UTC")
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> DaliRollupStore:
+    return DaliRollupStore(root_directory=tmp_path, history_days=400)
+
+
+def _daily(sums: list[float], counts: list[int]) -> pd.DataFrame:
+    return pd.DataFrame({"time": DAYS[: len(sums)], "sum": sums, "count": counts})
+
+
+def test_contiguous_ranges() -> None:
+    days = DAYS[[0, 1, 3]]
+
+    assert _contiguous_ranges(days) == [
+        (DAYS[0], DAYS[2]),
+        (DAYS[3], DAYS[3] + pd.Timedelta(days=1)),
+    ]
+    assert _contiguous_ranges(pd.DatetimeIndex([], tz="UTC")) == []
+
+
+def test_all_days_are_stale_without_stored_rollup(store: DaliRollupStore) -> None:
+    server_daily = _daily([1.0, 2.0], [96, 96])
+
+    assert store._find_stale_days(None, server_daily).equals(DAYS[:2])
+
+
+def test_changed_and_new_days_are_stale(store: DaliRollupStore) -> None:
+    stored_daily = _daily([1.0, 2.0, 3.0], [96, 96, 90])
+    server_daily = _daily([1.0, 2.5, 3.0, 4.0], [96, 96, 96, 96])
+
+    stale_days = store._find_stale_days(stored_daily, server_daily)
+
+    # The sum of the second day was corrected, the third day was completed and the fourth day is new.
+    assert stale_days.equals(DAYS[1:])
+
+
+def test_unchanged_days_are_not_stale(store: DaliRollupStore) -> None:
+    daily = _daily([1.0, 2.0], [96, 96])
+
+    assert store._find_stale_days(daily, daily.copy()).empty
@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+
+from src.infrastructure.local_store.feature_store import FeatureStore
+
+START = datetime(2025, 6, 2, 12, tzinfo=ZoneInfo("Europe/Amsterdam"))
+END = START + timedelta(days=2)
+
+
+def _features() -> pd.DataFrame:
+    slots = pd.date_range(START, END, freq="15min", inclusive="left")
+    return pd.DataFrame(
+        {"datetime": slots, "lag_7_days": np.arange(len(slots), dtype=np.float64)}
+    )
+
+
+def _store_features(store: FeatureStore) -> None:
+    store.write("asset-a", "1", START, END, _features(), source_fingerprint="abc")
+
+
+def test_read_serves_the_stored_window(tmp_path) -> None:
+    store = FeatureStore(tmp_path)
+    _store_features(store)
+
+    features = store.read("asset-a", "1", START, END, source_fingerprint="abc")
+
+    assert features is not None
+    pd.testing.assert_frame_equal(features, _features(), check_dtype=False)
+
+
+def test_read_misses_other_windows_and_assets(tmp_path) -> None:
+    store = FeatureStore(tmp_path)
+    _store_features(store)
+
+    # The fingerprint covers the stored window only, so windows within it are not served from it.
+    assert store.read("asset-a", "1", START, END - timedelta(days=1), "abc") is None
+    assert store.read("asset-b", "1", START, END, "abc") is None
+    assert store.read("asset-a", "2", START, END, "abc") is None
+
+
+def test_read_misses_changed_upstream_sources(tmp_path) -> None:
+    store = FeatureStore(tmp_path)
+    _store_features(store)
+
+    assert store.read("asset-a", "1", START, END, source_fingerprint="def") is None
+
+
+def test_read_misses_features_not_matching_their_content_hash(tmp_path) -> None:
+    store = FeatureStore(tmp_path)
+    _store_features(store)
+    entry_directory = next(tmp_path.glob("asset-a/v1/*"))
+    lag_file = entry_directory / "col_001.npy"
+    np.save(lag_file, np.load(lag_file) + 1.0, allow_pickle=False)
+
+    assert store.read("asset-a", "1", START, END, source_fingerprint="abc") is None
@@ -0,0 +1,85 @@
+import asyncio
+from datetime import UTC, datetime
+from typing import cast
+
+import numpy as np
+import pandas as pd
+import pytest
+from influxdb_client.client.query_api_async import QueryApiAsync
+
+from src.infrastructure.influxdb._streaming import TimeSeriesColumns
+from src.infrastructure.local_store import profile_store
+from src.infrastructure.local_store.profile_store import StandardProfileStore
+
+YEAR = 2025
+# The profiles are retrieved through the patched query, which does not use the connection.
+QUERY_API = cast(QueryApiAsync, None)
+
+
+def _profiles(categories: list[str]) -> TimeSeriesColumns:
+    slots = pd.date_range(datetime(YEAR, 1, 1, tzinfo=UTC), periods=4, freq="15min")
+    return TimeSeriesColumns(
+        timestamps=slots.as_unit("ns").to_numpy(dtype=np.int64),
+        values={category: np.full(len(slots), 0.25) for category in categories},
+    )
+
+
+@pytest.fixture
+def retrieved_profiles(monkeypatch) -> list[TimeSeriesColumns]:
+    """The standard profiles returned by the successive queries of the store."""
+    responses: list[TimeSeriesColumns] = []
+
+    async def retrieve_standard_profiles_between_dates(**kwargs) -> TimeSeriesColumns:
+        return responses.pop(0)
+
+    monkeypatch.setattr(
+        profile_store,
+        "retrieve_standard_profiles_between_dates",
+        retrieve_standard_profiles_between_dates,
+    )
+    return responses
+
+
+def test_complete_year_is_stored(tmp_path, retrieved_profiles) -> None:
+    retrieved_profiles.append(_profiles(["E1A", "E1B"]))
+    store = StandardProfileStore(tmp_path)
+
+    asyncio.run(store.ensure_years(QUERY_API, {YEAR}, ["E1A"]))
+
+    assert (tmp_path / str(YEAR) / "categories.json").exists()
+    timestamps = pd.DatetimeIndex([datetime(YEAR, 1, 1, tzinfo=UTC)])
+    assert store.lookup(timestamps, {"E1A": 2.0}).tolist() == [0.5]
+
+
+@pytest.mark.parametrize("categories", [[], ["E1B"]])
+def test_incomplete_year_is_retrieved_again(
+    tmp_path, retrieved_profiles, categories
+) -> None:
+    retrieved_profiles.extend([_profiles(categories), _profiles(["E1A"])])
+    store = StandardProfileStore(tmp_path)
+
+    asyncio.run(store.ensure_years(QUERY_API, {YEAR}, ["E1A"]))
+
+    assert not (tmp_path / str(YEAR) / "categories.json").exists()
+
+    asyncio.run(store.ensure_years(QUERY_API, {YEAR}, ["E1A"]))
+
+    assert (tmp_path / str(YEAR) / "categories.json").exists()
+    assert retrieved_profiles == []
+
+
+def test_year_lacking_a_configured_category_is_rebuilt(
+    tmp_path, retrieved_profiles
+) -> None:
+    retrieved_profiles.extend([_profiles(["E1A"]), _profiles(["E1A", "E1B"])])
+    store = StandardProfileStore(tmp_path)
+    timestamps = pd.DatetimeIndex([datetime(YEAR, 1, 1, tzinfo=UTC)])
+
+    asyncio.run(store.ensure_years(QUERY_API, {YEAR}, ["E1A"]))
+    assert store.lookup(timestamps, {"E1A": 2.0}).tolist() == [0.5]
+
+    # E1B is configured after the year was stored.
+    asyncio.run(store.ensure_years(QUERY_API, {YEAR}, ["E1A", "E1B"]))
+
+    assert store.lookup(timestamps, {"E1A": 2.0, "E1B": 4.0}).tolist() == [1.5]
+    assert retrieved_profiles == []
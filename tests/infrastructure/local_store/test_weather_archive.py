@@ -0,0 +1,113 @@
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.infrastructure.local_store.weather_archive import WeatherForecastArchive
+
+GRID_CELL = "knmi_seamless_52.7482_6.5663"
+WINDOW_START = datetime(2025, 6, 2, 12, tzinfo=UTC)
+WINDOW_END = WINDOW_START + timedelta(days=1)
+MODEL_RUN = datetime(2025, 6, 2, 6, tzinfo=UTC)
+
+
+def _forecast(start: datetime, end: datetime, temperature: float) -> pd.DataFrame:
+    slots = pd.date_range(start, end, freq="15min", inclusive="left")
+    return pd.DataFrame({"datetime": slots, "temperature": [temperature] * len(slots)})
+
+
+@pytest.fixture
+def archive(tmp_path: Path) -> WeatherForecastArchive:
+    return WeatherForecastArchive(root_directory=tmp_path, retention_days=7)
+
+
+def test_read_missing_window(archive: WeatherForecastArchive) -> None:
+    assert archive.read(GRID_CELL, WINDOW_START, WINDOW_END) is None
+
+
+def test_read_latest_model_run(archive: WeatherForecastArchive) -> None:
+    for hours, temperature in [(0, 15.0), (1, 16.0)]:
+        archive.put(
+            GRID_CELL,
+            MODEL_RUN + timedelta(hours=hours),
+            WINDOW_START,
+            WINDOW_END,
+            _forecast(WINDOW_START, WINDOW_END, temperature),
+        )
+
+    forecast = archive.read(GRID_CELL, WINDOW_START, WINDOW_END)
+
+    assert forecast is not None
+    assert len(forecast) == 96
+    assert (forecast["temperature"] == 16.0).all()
+
+    earlier_forecast = archive.read(
+        GRID_CELL, WINDOW_START, WINDOW_END, as_of=MODEL_RUN
+    )
+    assert earlier_forecast is not None
+    assert (earlier_forecast["temperature"] == 15.0).all()
+
+    assert (
+        archive.read(
+            GRID_CELL,
+            WINDOW_START,
+            WINDOW_END,
+            model_run=MODEL_RUN + timedelta(hours=2),
+        )
+        is None
+    )
+
+
+def test_read_from_covering_window(archive: WeatherForecastArchive) -> None:
+    archive.put(
+        GRID_CELL,
+        MODEL_RUN,
+        WINDOW_START - timedelta(hours=12),
+        WINDOW_END + timedelta(hours=12),
+        _forecast(
+            WINDOW_START - timedelta(hours=12), WINDOW_END + timedelta(hours=12), 15.0
+        ),
+    )
+
+    forecast = archive.read(GRID_CELL, WINDOW_START, WINDOW_END)
+
+    assert forecast is not None
+    assert forecast["datetime"].iloc[0] == WINDOW_START
+    assert forecast["datetime"].iloc[-1] == WINDOW_END - timedelta(minutes=15)
+    assert archive.read(GRID_CELL, WINDOW_START, WINDOW_END + timedelta(days=1)) is None
+
+
+def test_put_deduplicates_known_content(archive: WeatherForecastArchive) -> None:
+    forecast = _forecast(WINDOW_START, WINDOW_END, 15.0)
+
+    assert archive.put(GRID_CELL, MODEL_RUN, WINDOW_START, WINDOW_END, forecast)
+    assert not archive.put(
+        GRID_CELL, MODEL_RUN + timedelta(hours=1), WINDOW_START, WINDOW_END, forecast
+    )
+
+
+def test_put_prunes_snapshots_past_retention(archive: WeatherForecastArchive) -> None:
+    archive.put(
+        GRID_CELL,
+        MODEL_RUN,
+        WINDOW_START,
+        WINDOW_END,
+        _forecast(WINDOW_START, WINDOW_END, 15.0),
+    )
+
+    later_start = WINDOW_START + timedelta(days=8)
+    archive.put(
+        GRID_CELL,
+        MODEL_RUN + timedelta(days=8),
+        later_start,
+        later_start + timedelta(days=1),
+        _forecast(later_start, later_start + timedelta(days=1), 16.0),
+    )
+
+    assert archive.read(GRID_CELL, WINDOW_START, WINDOW_END) is None
+    assert (
+        archive.read(GRID_CELL, later_start, later_start + timedelta(days=1))
+        is not None
+    )
+    assert len(list((archive.root_directory / "frames").iterdir())) == 1
@@ -0,0 +1,115 @@
+import asyncio
+from datetime import UTC, datetime
+from typing import cast
+
+import numpy as np
+import pytest
+from influxdb_client.client.influxdb_client_async import InfluxDBClientAsync
+
+from src.infrastructure import accuracy_monitor
+from src.infrastructure.accuracy_monitor import (
+    compute_forecast_accuracy,
+    monitor_forecast_accuracy,
+)
+from src.infrastructure.influxdb._streaming import TimeSeriesColumns
+
+
+def test_forecast_accuracy() -> None:
+    predicted_loads = np.array([10.0, 50.0, 120.0, 90.0])
+    measured_loads = np.array([20.0, 40.0, 90.0, 110.0])
+
+    accuracy = compute_forecast_accuracy(
+        predicted_loads, measured_loads, max_capacity=100.0
+    )
+
+    assert accuracy == {
+        "count": 4,
+        "mae_kw": pytest.approx(17.5),
+        "mape_pct": pytest.approx((50 + 25 + 100 / 3 + 200 / 11) / 4),
+        "peak_error_kw": pytest.approx(10.0),
+        "violations": 1,
+        "missed_violations": 1,
+        "false_alarms": 1,
+    }
+
+
+def test_forecast_accuracy_leaves_out_mape_without_measured_load() -> None:
+    accuracy = compute_forecast_accuracy(
+        np.array([1.0, 2.0]), np.array([0.0, 0.0]), max_capacity=100.0
+    )
+
+    assert "mape_pct" not in accuracy
+    assert accuracy["mae_kw"] == pytest.approx(1.5)
+
+
+def test_forecast_accuracy_skips_zero_measured_load_in_mape() -> None:
+    accuracy = compute_forecast_accuracy(
+        np.array([5.0, 12.0]), np.array([0.0, 10.0]), max_capacity=100.0
+    )
+
+    assert accuracy["mape_pct"] == pytest.approx(20.0)
+
+
+class _FakeClient:
+    def query_api(self) -> object:
+        return object()
+
+    def write_api(self) -> object:
+        return object()
+
+
+def test_day_without_predictions_is_stored_as_empty_summary(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    stored: list[tuple[str, datetime, dict[str, float]]] = []
+
+    async def retrieve_last_accuracy_day(query_api, asset_id, since):
+        return None
+
+    async def retrieve_dali_daily_aggregates_between(
+        query_api, start_date_inclusive, end_date_inclusive
+    ):
+        # The complete day of June 2nd, timestamped with the end of the day.
+        return TimeSeriesColumns(
+            timestamps=np.array(["2025-06-03"], dtype="datetime64[ns]").view(np.int64),
+            values={"count": np.array([96.0])},
+        )
+
+    async def retrieve_predicted_and_measured_load(
+        query_api, measurement_name, from_date, to_date
+    ):
+        return TimeSeriesColumns(
+            timestamps=np.empty(0, np.int64),
+            values={
+                "_value_predicted": np.empty(0, np.float64),
+                "_value_measured": np.empty(0, np.float64),
+            },
+        )
+
+    async def store_forecast_accuracy(
+        write_api, asset_id, forecaster, day_start, accuracy
+    ):
+        stored.append((forecaster, day_start, accuracy))
+
+    for function in (
+        retrieve_last_accuracy_day,
+        retrieve_dali_daily_aggregates_between,
+        retrieve_predicted_and_measured_load,
+        store_forecast_accuracy,
+    ):
+        monkeypatch.setattr(accuracy_monitor, function.__name__, function)
+    monkeypatch.setattr(accuracy_monitor, "ACCURACY_BACKFILL_DAYS", 1)
+
+    summarized_days = asyncio.run(
+        monitor_forecast_accuracy(
+            cast(InfluxDBClientAsync, _FakeClient()),
+            "871234567890123456",
+            until=datetime(2025, 6, 3, 6, tzinfo=UTC),
+        )
+    )
+
+    assert summarized_days == 1
+    assert stored == [
+        (forecaster, datetime(2025, 6, 2, tzinfo=UTC), {"count": 0})
+        for forecaster in accuracy_monitor.AUDITED_FORECASTERS
+    ]
@@ -0,0 +1,41 @@
+import pytest
+
+from src.infrastructure import _memory
+from src.infrastructure._memory import MemoryBudget, StageMetrics
+
+
+@pytest.fixture(autouse=True)
+def current_rss(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_memory, "_current_rss_bytes", lambda: 100 * _memory._MB)
+
+
+def test_horizon_fits_from_seeded_estimate() -> None:
+    budget = MemoryBudget(limit_mb=200, mb_per_slot_estimate=0.5)
+
+    # No horizon has been recorded yet, so 0.5 MiB per quarter-hour slot on top of the current 100 MiB.
+    assert budget.fits(slot_count=200)
+    assert not budget.fits(slot_count=201)
+
+
+def test_horizon_fits_from_estimate_of_previous_horizon() -> None:
+    budget = MemoryBudget(limit_mb=200, mb_per_slot_estimate=10.0)
+    budget.record_horizon(
+        slot_count=96,
+        stages=[
+            StageMetrics("features", rss_start_mb=100, rss_peak_mb=148),
+            StageMetrics("inference", rss_start_mb=100, rss_peak_mb=124),
+        ],
+    )
+
+    # 0.5 MiB per quarter-hour slot on top of the current 100 MiB.
+    assert budget.fits(slot_count=200)
+    assert not budget.fits(slot_count=201)
+
+
+def test_horizon_always_fits_disabled_budget() -> None:
+    budget = MemoryBudget(limit_mb=0, mb_per_slot_estimate=0.5)
+    budget.record_horizon(
+        slot_count=1, stages=[StageMetrics("features", rss_peak_mb=1000)]
+    )
+
+    assert budget.fits(slot_count=96)
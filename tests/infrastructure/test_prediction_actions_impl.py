@@ -0,0 +1,98 @@
+import asyncio
+from typing import cast
+
+import pandas as pd
+import pytest
+from influxdb_client.client.influxdb_client_async import InfluxDBClientAsync
+from influxdb_client.client.query_api_async import QueryApiAsync
+
+from src.infrastructure import prediction_actions_impl
+from src.infrastructure.prediction_actions_impl import PredictionActionsInfluxDB
+from src.models.predicted_load import PredictedGridAssetLoad
+
+
+class _FakeInferenceCache:
+    def __init__(self) -> None:
+        self.stored: list[list[PredictedGridAssetLoad]] = []
+
+    async def get(self, query_api, features: pd.DataFrame) -> None:
+        return None
+
+    async def put(self, write_api, features: pd.DataFrame, predictions) -> None:
+        self.stored.append(predictions)
+
+
+class _FakeClient:
+    def write_api(self) -> object:
+        return object()
+
+
+@pytest.fixture
+def features() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "datetime": pd.date_range(
+                "2025-06-02 12:00", periods=4, freq="15min", tz="Europe/Amsterdam"
+            )
+        }
+    )
+
+
+@pytest.fixture
+def inference_cache(monkeypatch: pytest.MonkeyPatch) -> _FakeInferenceCache:
+    inference_cache = _FakeInferenceCache()
+    monkeypatch.setattr(prediction_actions_impl, "inference_cache", inference_cache)
+    return inference_cache
+
+
+@pytest.fixture
+def audited(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    audited: list[str] = []
+
+    async def store_predictions_for_audit(write_api, predicted_loads, measurement_name):
+        audited.append(measurement_name)
+
+    monkeypatch.setattr(
+        prediction_actions_impl,
+        "store_predictions_for_audit",
+        store_predictions_for_audit,
+    )
+    return audited
+
+
+@pytest.fixture(autouse=True)
+def model(monkeypatch: pytest.MonkeyPatch) -> None:
+    def get_predictions(features: pd.DataFrame, forecaster: str = "model"):
+        return [
+            PredictedGridAssetLoad(time=time, load=1.0, forecaster=forecaster)
+            for time in features["datetime"]
+        ]
+
+    monkeypatch.setattr(
+        prediction_actions_impl, "get_predictions_for_features", get_predictions
+    )
+    monkeypatch.setattr(
+        prediction_actions_impl,
+        "get_baseline_predictions_for_features",
+        lambda features: get_predictions(features, "baseline"),
+    )
+    monkeypatch.setattr(prediction_actions_impl, "BASELINE_FORECASTER_MODE", "shadow")
+
+
+@pytest.mark.parametrize(("read_only", "written"), [(False, True), (True, False)])
+def test_read_only_predictions_are_not_written(
+    read_only: bool,
+    written: bool,
+    features: pd.DataFrame,
+    inference_cache: _FakeInferenceCache,
+    audited: list[str],
+) -> None:
+    actions = PredictionActionsInfluxDB(
+        client=cast(InfluxDBClientAsync, _FakeClient()), read_only=read_only
+    )
+
+    predictions = asyncio.run(actions._predict(cast(QueryApiAsync, None), features))
+
+    assert len(predictions) == len(features)
+    assert bool(inference_cache.stored) == written
+    assert audited == (["baseline_predictions"] if written else [])
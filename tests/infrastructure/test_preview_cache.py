@@ -0,0 +1,96 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.infrastructure import preview_cache as preview_cache_module
+from src.infrastructure.preview_cache import PreviewCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    clock = _Clock()
+    monkeypatch.setattr(
+        preview_cache_module, "time", SimpleNamespace(monotonic=clock.monotonic)
+    )
+    return clock
+
+
+class _Preview:
+    """Computes a preview, counting the computations."""
+
+    def __init__(self, body: bytes = b"{}") -> None:
+        self.body = body
+        self.computations = 0
+
+    async def compute(self) -> bytes:
+        self.computations += 1
+        await asyncio.sleep(0)
+        return self.body
+
+
+def test_concurrent_requests_compute_the_preview_once(clock: _Clock) -> None:
+    cache = PreviewCache(ttl_seconds=60)
+    preview = _Preview()
+
+    async def request_concurrently():
+        return await asyncio.gather(
+            *(cache.get_or_compute("key", preview.compute) for _ in range(5))
+        )
+
+    previews = asyncio.run(request_concurrently())
+
+    assert preview.computations == 1
+    assert len({cached.etag for cached in previews}) == 1
+
+
+def test_preview_is_computed_again_once_expired(clock: _Clock) -> None:
+    cache = PreviewCache(ttl_seconds=60)
+    preview = _Preview()
+
+    cached = asyncio.run(cache.get_or_compute("key", preview.compute))
+    clock.now += 30
+    asyncio.run(cache.get_or_compute("key", preview.compute))
+
+    assert preview.computations == 1
+    assert PreviewCache.remaining_seconds(cached) == 30
+
+    clock.now += 30
+    asyncio.run(cache.get_or_compute("key", preview.compute))
+
+    assert preview.computations == 2
+
+
+def test_etag_follows_the_body(clock: _Clock) -> None:
+    cache = PreviewCache(ttl_seconds=60)
+
+    first = asyncio.run(cache.get_or_compute("first", _Preview(b"[1]").compute))
+    same = asyncio.run(cache.get_or_compute("same", _Preview(b"[1]").compute))
+    other = asyncio.run(cache.get_or_compute("other", _Preview(b"[2]").compute))
+
+    assert first.etag == same.etag
+    assert first.etag != other.etag
+
+
+def test_failed_computation_is_not_cached(clock: _Clock) -> None:
+    cache = PreviewCache(ttl_seconds=60)
+
+    async def fail() -> bytes:
+        msg = "Prediction failed"
+        raise RuntimeError(msg)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(cache.get_or_compute("key", fail))
+
+    preview = _Preview()
+    asyncio.run(cache.get_or_compute("key", preview.compute))
+
+    assert preview.computations == 1